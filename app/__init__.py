@@ -1,4 +1,5 @@
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, List, Optional
 from flask import Flask
 from flask_cors import CORS
 from app.config import Config, get_settings
@@ -9,13 +10,28 @@ from app.repositories.partner_profile_repository import PartnerProfileRepository
 from app.repositories.location_repository import LocationRepository
 from app.services.auth_service import AuthService
 from app.services.partner_profile_service import PartnerProfileService
-from app.services.location_service import LocationService
+from app.services.location_service import LocationService, SearchPage
 from app.services.nominatim_service import NominatimService
+from app.services.location_writer import LocationWriter
 from app.utils.storage import get_storage_service
+from app.utils.location_search_index import LocationSearchIndex
+from app.utils.ttl_cache import TTLCache
+from app.utils.response_cache import SQLiteResponseCache
+from app.utils.single_flight import SingleFlight
+from app.utils.rate_limiter import RateLimiter
+from app.utils.pincode_table import PincodeTable
+from app.utils.fuzzy_index import FuzzyLocationIndex
+from app.utils.spatial_index import SpatialIndex
+from app.utils.partner_index import PartnerCoverageIndex
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.password_hasher import PasswordHasher
+from app.utils.background_loader import BackgroundLoader
+from app.utils.revocation_cache import RevocationCache
 from app.routes.auth_routes import create_auth_routes
 from app.routes.partner_profile_routes import create_partner_profile_routes
 from app.routes.location_routes import create_location_routes
 from app.utils.errors import register_error_handlers
+from app.cli import register_cli_commands
 from app.utils.logging import setup_request_logging
 from flask_migrate import Migrate
 
@@ -43,11 +59,43 @@ def create_app(config: Optional[Config] = None) -> Flask:
     )
 
     register_error_handlers(app)
+    register_cli_commands(app)
     setup_request_logging(app)
 
     rental_partner_repo = RentalPartnerRepository()
     blacklist_repo = BlacklistedTokenRepository()
-    profile_repo = PartnerProfileRepository()
+    revocation_cache = RevocationCache(
+        repository=blacklist_repo,
+        refresh_interval=config.REVOCATION_REFRESH_SECONDS,
+        capacity=config.REVOCATION_FILTER_CAPACITY,
+        error_rate=config.REVOCATION_FILTER_ERROR_RATE,
+    )
+    # Read by has_permission on every authenticated request
+    app.config["REVOCATION_CACHE"] = revocation_cache
+    location_repo = LocationRepository(
+        search_index=(
+            LocationSearchIndex()
+            if config.LOCATION_SEARCH_BACKEND == "memory"
+            else None
+        ),
+        # Built after the fork on a thread, never inside a request
+        index_loader=BackgroundLoader(app, "location search index"),
+        # File-backed mmap: every worker reads the same page-cache pages
+        pincode_table=(
+            PincodeTable.open(config.PINCODE_TABLE_PATH)
+            if config.PINCODE_TABLE_PATH
+            else None
+        ),
+        spatial_index=(
+            SpatialIndex() if config.LOCATION_SPATIAL_INDEX_ENABLED else None
+        ),
+        spatial_loader=BackgroundLoader(app, "spatial index"),
+    )
+    profile_repo = PartnerProfileRepository(
+        coverage_index=PartnerCoverageIndex(),
+        location_repository=location_repo,
+        refresh_interval=config.PARTNER_DISCOVERY_REFRESH_SECONDS,
+    )
 
     auth_service = AuthService(
         repository=rental_partner_repo,
@@ -58,25 +106,96 @@ def create_app(config: Optional[Config] = None) -> Flask:
         refresh_expiration=config.REFRESH_TOKEN_EXPIRATION_HOURS,
         min_password_length=config.MIN_PASSWORD_LENGTH,
         remember_me_multiplier=config.REMEMBER_ME_MULTIPLIER,
+        password_hasher=PasswordHasher(
+            workers=config.PASSWORD_HASH_WORKERS,
+            max_pending=config.PASSWORD_HASH_MAX_PENDING,
+            timeout=config.PASSWORD_HASH_TIMEOUT_SECONDS,
+            rounds=config.BCRYPT_ROUNDS,
+        ),
+        revocation_cache=revocation_cache,
     )
 
     auth_bp = create_auth_routes(auth_service)
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
 
     profile_service = PartnerProfileService(
-        repository=profile_repo, partner_repository=rental_partner_repo
+        repository=profile_repo,
+        partner_repository=rental_partner_repo,
+        location_repository=location_repo,
     )
     profile_bp = create_partner_profile_routes(profile_service)
     app.register_blueprint(profile_bp, url_prefix="/api/partner")
 
-    location_repo = LocationRepository()
     nominatim_service = NominatimService(
         country=config.GEOCODING_COUNTRY,
         country_code=config.GEOCODING_COUNTRY_CODE,
         result_limit=config.GEOCODING_RESULT_LIMIT,
+        response_cache=(
+            SQLiteResponseCache(
+                path=config.GEOCODING_CACHE_PATH,
+                ttl=config.GEOCODING_CACHE_TTL_SECONDS,
+                max_entries=config.GEOCODING_CACHE_MAX_ENTRIES,
+            )
+            if config.GEOCODING_CACHE_PATH
+            else None
+        ),
+        # Misses expire as quickly as in the in-process result cache
+        empty_response_ttl=config.LOCATION_CACHE_NEGATIVE_TTL_SECONDS,
+        rate_limiter=RateLimiter(
+            rate=config.GEOCODING_RATE_LIMIT_PER_SECOND,
+            burst=config.GEOCODING_RATE_LIMIT_BURST,
+            max_queue=config.GEOCODING_RATE_LIMIT_QUEUE_SIZE,
+            state_path=config.GEOCODING_RATE_LIMIT_STATE_PATH or None,
+        ),
+        rate_limit_wait=config.GEOCODING_RATE_LIMIT_MAX_WAIT_SECONDS,
+        connect_timeout=config.GEOCODING_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=config.GEOCODING_READ_TIMEOUT_SECONDS,
+        pool_size=config.GEOCODING_POOL_SIZE,
+        max_retries=config.GEOCODING_MAX_RETRIES,
+        retry_backoff=config.GEOCODING_RETRY_BACKOFF_SECONDS,
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=config.GEOCODING_BREAKER_FAILURE_THRESHOLD,
+            slow_call_seconds=config.GEOCODING_BREAKER_SLOW_CALL_MS / 1000,
+            cooldown=config.GEOCODING_BREAKER_COOLDOWN_SECONDS,
+        ),
+    )
+    location_cache: Optional[TTLCache[SearchPage]] = (
+        TTLCache(
+            max_size=config.LOCATION_CACHE_SIZE,
+            ttl=config.LOCATION_CACHE_TTL_SECONDS,
+            negative_ttl=config.LOCATION_CACHE_NEGATIVE_TTL_SECONDS,
+        )
+        if config.LOCATION_CACHE_SIZE > 0
+        else None
     )
     location_service = LocationService(
-        repository=location_repo, geocoding_service=nominatim_service
+        repository=location_repo,
+        geocoding_service=nominatim_service,
+        cache=location_cache,
+        single_flight=SingleFlight(lock_dir=config.GEOCODING_LOCK_DIR or None),
+        writer=(
+            LocationWriter(
+                app=app,
+                repository=location_repo,
+                max_queue=config.LOCATION_WRITE_QUEUE_SIZE,
+                batch_size=config.LOCATION_WRITE_BATCH_SIZE,
+                flush_interval=config.LOCATION_WRITE_FLUSH_INTERVAL_MS / 1000,
+            )
+            if config.LOCATION_WRITE_BEHIND_ENABLED
+            else None
+        ),
+        fuzzy_index=(
+            FuzzyLocationIndex(max_distance=config.LOCATION_FUZZY_MAX_DISTANCE)
+            if config.LOCATION_FUZZY_ENABLED
+            else None
+        ),
+        fuzzy_loader=BackgroundLoader(app, "fuzzy location index"),
+        batch_geocode_limit=config.LOCATION_BATCH_GEOCODE_LIMIT,
+        fallback_budget=(
+            config.GEOCODING_FALLBACK_BUDGET_MS / 1000
+            if config.GEOCODING_FALLBACK_BUDGET_MS > 0
+            else None
+        ),
     )
     location_bp = create_location_routes(location_service)
     app.register_blueprint(location_bp, url_prefix="/api/location")
@@ -89,12 +208,28 @@ def create_app(config: Optional[Config] = None) -> Flask:
     def index() -> Dict[str, Any]:
         return {"message": "Welcome to Ceremo Services", "status": "running"}
 
+    # Counters are per worker process; scrape each worker (see "pid")
+    stats_sources: Dict[str, Any] = {
+        "geocoding_rate_limiter": nominatim_service.rate_limiter,
+        "geocoding_circuit_breaker": nominatim_service.circuit_breaker,
+        "location_cache": location_cache,
+        "location_writer": location_service.writer,
+        "password_hasher": auth_service.password_hasher,
+        "revocation_cache": revocation_cache,
+    }
+
     @app.route("/health")
     def health_check() -> Dict[str, Any]:
         return {
             "status": "healthy",
             "environment": config.ENVIRONMENT,
             "database": "ceremo_db",
+            "pid": os.getpid(),
+            "stats": {
+                name: source.stats()
+                for name, source in stats_sources.items()
+                if source is not None
+            },
         }
 
     return app
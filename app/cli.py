@@ -0,0 +1,55 @@
+"""Flask CLI commands."""
+
+import click
+from flask import Flask
+from app.models.base import db
+from app.repositories.blacklisted_token_repository import BlacklistedTokenRepository
+from app.repositories.location_repository import LocationRepository
+from app.utils.pincode_loader import PincodeLoader
+from app.utils.pincode_table import PincodeTable
+from app.utils.security import calibrate_rounds
+
+
+def register_cli_commands(app: Flask) -> None:
+    """Register custom CLI commands with the Flask app."""
+
+    @app.cli.command("load-pincodes")
+    @click.argument("source", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--batch-size", default=10000, show_default=True)
+    @click.option(
+        "--checkpoint",
+        default="instance/pincode_load.checkpoint.json",
+        show_default=True,
+        help="Progress file used to resume an interrupted load.",
+    )
+    def load_pincodes(source: str, batch_size: int, checkpoint: str) -> None:
+        """Load the India Post pincode directory CSV into locations."""
+        connection = db.engine.raw_connection()
+        try:
+            loader = PincodeLoader(
+                connection, batch_size=batch_size, checkpoint_path=checkpoint
+            )
+            inserted = loader.load(source)
+        finally:
+            connection.close()
+        click.echo(f"Loaded {inserted} new locations")
+
+    @app.cli.command("build-pincode-table")
+    @click.argument("output", type=click.Path(dir_okay=False))
+    def build_pincode_table(output: str) -> None:
+        """Write the packed pincode lookup file from the locations table."""
+        written = PincodeTable.build(output, LocationRepository().iter_locations())
+        click.echo(f"Wrote {written} pincode records to {output}")
+
+    @app.cli.command("purge-blacklisted-tokens")
+    @click.option("--batch-size", default=1000, show_default=True)
+    def purge_blacklisted_tokens(batch_size: int) -> None:
+        """Delete expired tokens from the blacklist; run it from cron."""
+        removed = BlacklistedTokenRepository().purge_expired(batch_size)
+        click.echo(f"Purged {removed} expired blacklisted tokens")
+
+    @app.cli.command("calibrate-bcrypt")
+    @click.option("--target-ms", default=250, show_default=True)
+    def calibrate_bcrypt(target_ms: int) -> None:
+        """Print the bcrypt cost that hashes in about target-ms on this host."""
+        click.echo(f"BCRYPT_ROUNDS={calibrate_rounds(target_ms)}")
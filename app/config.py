@@ -1,5 +1,6 @@
 import os
 import secrets
+import tempfile
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
@@ -41,10 +42,126 @@ class Config:
 
     MIN_PASSWORD_LENGTH: int = int(os.getenv("MIN_PASSWORD_LENGTH", "8"))
     REMEMBER_ME_MULTIPLIER: int = int(os.getenv("REMEMBER_ME_MULTIPLIER", "24"))
+    # bcrypt processes per server worker; 0 hashes in the request thread
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    # Hashes queued or running before sign-ins are turned away with a 503
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "8"))
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = float(
+        os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5.0")
+    )
+    # Pick it once per machine type with `flask calibrate-bcrypt`
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
     GEOCODING_COUNTRY: str = os.getenv("GEOCODING_COUNTRY", "India")
     GEOCODING_COUNTRY_CODE: str = os.getenv("GEOCODING_COUNTRY_CODE", "in")
     GEOCODING_RESULT_LIMIT: int = int(os.getenv("GEOCODING_RESULT_LIMIT", "10"))
+    # Raw Nominatim responses shared by all workers; empty path disables it
+    GEOCODING_CACHE_PATH: str = os.getenv(
+        "GEOCODING_CACHE_PATH",
+        os.path.join(tempfile.gettempdir(), "ceremo_geocoding_cache.sqlite3"),
+    )
+    GEOCODING_CACHE_TTL_SECONDS: int = int(
+        os.getenv("GEOCODING_CACHE_TTL_SECONDS", "604800")
+    )
+    GEOCODING_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("GEOCODING_CACHE_MAX_ENTRIES", "50000")
+    )
+    GEOCODING_CONNECT_TIMEOUT_SECONDS: float = float(
+        os.getenv("GEOCODING_CONNECT_TIMEOUT_SECONDS", "2.0")
+    )
+    GEOCODING_READ_TIMEOUT_SECONDS: float = float(
+        os.getenv("GEOCODING_READ_TIMEOUT_SECONDS", "3.0")
+    )
+    GEOCODING_POOL_SIZE: int = int(os.getenv("GEOCODING_POOL_SIZE", "4"))
+    GEOCODING_MAX_RETRIES: int = int(os.getenv("GEOCODING_MAX_RETRIES", "2"))
+    GEOCODING_RETRY_BACKOFF_SECONDS: float = float(
+        os.getenv("GEOCODING_RETRY_BACKOFF_SECONDS", "0.3")
+    )
+    # Nominatim usage policy allows ~1 request/second per application
+    GEOCODING_RATE_LIMIT_PER_SECOND: float = float(
+        os.getenv("GEOCODING_RATE_LIMIT_PER_SECOND", "1.0")
+    )
+    GEOCODING_RATE_LIMIT_BURST: int = int(os.getenv("GEOCODING_RATE_LIMIT_BURST", "1"))
+    GEOCODING_RATE_LIMIT_QUEUE_SIZE: int = int(
+        os.getenv("GEOCODING_RATE_LIMIT_QUEUE_SIZE", "10")
+    )
+    GEOCODING_RATE_LIMIT_MAX_WAIT_SECONDS: float = float(
+        os.getenv("GEOCODING_RATE_LIMIT_MAX_WAIT_SECONDS", "2.0")
+    )
+    # Bucket state shared by all workers; empty keeps one bucket per worker
+    GEOCODING_RATE_LIMIT_STATE_PATH: str = os.getenv(
+        "GEOCODING_RATE_LIMIT_STATE_PATH",
+        os.path.join(tempfile.gettempdir(), "ceremo_geocoding_rate_limit"),
+    )
+    # flock directory coalescing geocoding across workers; empty = per worker
+    GEOCODING_LOCK_DIR: str = os.getenv(
+        "GEOCODING_LOCK_DIR",
+        os.path.join(tempfile.gettempdir(), "ceremo_geocoding_locks"),
+    )
+    # Consecutive failed or slow Nominatim calls that open the circuit
+    GEOCODING_BREAKER_FAILURE_THRESHOLD: int = int(
+        os.getenv("GEOCODING_BREAKER_FAILURE_THRESHOLD", "5")
+    )
+    GEOCODING_BREAKER_SLOW_CALL_MS: int = int(
+        os.getenv("GEOCODING_BREAKER_SLOW_CALL_MS", "2000")
+    )
+    GEOCODING_BREAKER_COOLDOWN_SECONDS: float = float(
+        os.getenv("GEOCODING_BREAKER_COOLDOWN_SECONDS", "30")
+    )
+    # Longest a search request waits on the geocoding fallback; 0 = no limit
+    GEOCODING_FALLBACK_BUDGET_MS: int = int(
+        os.getenv("GEOCODING_FALLBACK_BUDGET_MS", "2500")
+    )
+
+    # "sql" queries Postgres; "memory" serves search from an in-process index
+    LOCATION_SEARCH_BACKEND: str = os.getenv("LOCATION_SEARCH_BACKEND", "sql")
+    # Persist geocoding results from a background thread instead of inline
+    LOCATION_WRITE_BEHIND_ENABLED: bool = (
+        os.getenv("LOCATION_WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    )
+    LOCATION_WRITE_QUEUE_SIZE: int = int(os.getenv("LOCATION_WRITE_QUEUE_SIZE", "1000"))
+    LOCATION_WRITE_BATCH_SIZE: int = int(os.getenv("LOCATION_WRITE_BATCH_SIZE", "100"))
+    LOCATION_WRITE_FLUSH_INTERVAL_MS: int = int(
+        os.getenv("LOCATION_WRITE_FLUSH_INTERVAL_MS", "500")
+    )
+    # Prebuilt file from `flask build-pincode-table`; empty disables it
+    PINCODE_TABLE_PATH: str = os.getenv("PINCODE_TABLE_PATH", "")
+    LOCATION_SPATIAL_INDEX_ENABLED: bool = (
+        os.getenv("LOCATION_SPATIAL_INDEX_ENABLED", "true").lower() == "true"
+    )
+    LOCATION_FUZZY_ENABLED: bool = (
+        os.getenv("LOCATION_FUZZY_ENABLED", "true").lower() == "true"
+    )
+    LOCATION_FUZZY_MAX_DISTANCE: int = int(
+        os.getenv("LOCATION_FUZZY_MAX_DISTANCE", "2")
+    )
+    # Misses geocoded per /api/location/batch request; the rest return empty
+    LOCATION_BATCH_GEOCODE_LIMIT: int = int(
+        os.getenv("LOCATION_BATCH_GEOCODE_LIMIT", "5")
+    )
+    LOCATION_CACHE_SIZE: int = int(os.getenv("LOCATION_CACHE_SIZE", "10000"))
+    LOCATION_CACHE_TTL_SECONDS: int = int(
+        os.getenv("LOCATION_CACHE_TTL_SECONDS", "3600")
+    )
+    LOCATION_CACHE_NEGATIVE_TTL_SECONDS: int = int(
+        os.getenv("LOCATION_CACHE_NEGATIVE_TTL_SECONDS", "300")
+    )
+
+    # How often each worker picks up profile edits made by other workers
+    PARTNER_DISCOVERY_REFRESH_SECONDS: float = float(
+        os.getenv("PARTNER_DISCOVERY_REFRESH_SECONDS", "30")
+    )
+
+    # Each worker keeps revoked tokens in a Bloom filter polled from the table
+    REVOCATION_REFRESH_SECONDS: float = float(
+        os.getenv("REVOCATION_REFRESH_SECONDS", "5")
+    )
+    REVOCATION_FILTER_CAPACITY: int = int(
+        os.getenv("REVOCATION_FILTER_CAPACITY", "100000")
+    )
+    REVOCATION_FILTER_ERROR_RATE: float = float(
+        os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001")
+    )
 
     R2_ACCESS_KEY: str = os.getenv("R2_ACCESS_KEY", "")
     R2_SECRET_KEY: str = os.getenv("R2_SECRET_KEY", "")
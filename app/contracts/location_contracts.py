@@ -1,13 +1,18 @@
 """Location contracts."""
 
-from typing import List
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
+MAX_SEARCH_LIMIT = 50
+MAX_BATCH_SIZE = 200
+
 
 class LocationSearchRequest(BaseModel):
     """Location search request schema."""
 
     q: str = Field(..., min_length=2, description="Search query")
+    limit: int = Field(20, ge=1, le=MAX_SEARCH_LIMIT, description="Page size")
+    cursor: Optional[str] = Field(None, description="next_cursor of the previous page")
 
 
 class LocationData(BaseModel):
@@ -18,6 +23,8 @@ class LocationData(BaseModel):
     state: str
     district: str
     area: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
 
 class LocationSearchResponse(BaseModel):
@@ -26,3 +33,45 @@ class LocationSearchResponse(BaseModel):
     success: bool = True
     message: str
     data: List[LocationData]
+    next_cursor: Optional[str] = None
+
+
+class NearestLocationRequest(BaseModel):
+    """Nearest location request schema."""
+
+    lat: float = Field(..., ge=-90, le=90, description="Latitude")
+    lon: float = Field(..., ge=-180, le=180, description="Longitude")
+    k: int = Field(10, ge=1, le=50, description="Number of locations to return")
+
+
+class NearestLocationData(LocationData):
+    """Location data with distance from the requested point."""
+
+    distance_km: float
+
+
+class NearestLocationResponse(BaseModel):
+    """Nearest location response schema."""
+
+    success: bool = True
+    message: str
+    data: List[NearestLocationData]
+
+
+class LocationBatchRequest(BaseModel):
+    """Batch location lookup request schema."""
+
+    queries: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="Pincodes or place names to resolve",
+    )
+
+
+class LocationBatchResponse(BaseModel):
+    """Batch location lookup response schema, keyed by input."""
+
+    success: bool = True
+    message: str
+    data: Dict[str, List[LocationData]]
@@ -1,7 +1,7 @@
 """Partner Profile contracts."""
 
 from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UpdatePartnerProfileRequest(BaseModel):
@@ -48,3 +48,33 @@ class PartnerProfileResponse(BaseModel):
     success: bool = True
     message: str
     data: PartnerProfileData
+
+
+class DiscoverPartnersRequest(BaseModel):
+    """Partner discovery request schema."""
+
+    pincode: str = Field(..., pattern=r"^\d{6}$", description="Pincode to serve")
+    limit: int = Field(20, ge=1, le=100, description="Maximum partners to return")
+
+
+class DiscoveredPartnerData(BaseModel):
+    """Partner summary returned by discovery."""
+
+    partnerId: str
+    businessName: str
+    city: str
+    state: str
+    pincode: str
+    businessType: str
+    categories: List[str]
+    serviceAreas: List[str]
+    deliveryRadius: str
+    distanceKm: Optional[float] = None
+
+
+class DiscoverPartnersResponse(BaseModel):
+    """Partner discovery response schema."""
+
+    success: bool = True
+    message: str
+    data: List[DiscoveredPartnerData]
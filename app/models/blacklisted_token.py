@@ -8,10 +8,14 @@ class BlacklistedToken(BaseModel):
     __tablename__ = "blacklisted_tokens"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    token = db.Column(db.String(500), unique=True, nullable=False, index=True)
+    # SHA-256 of the revoked JWT (see security.token_hash)
+    token_hash = db.Column(db.LargeBinary(32), nullable=False)
     blacklisted_at = db.Column(
         db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
     )
-    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
 
-    __table_args__ = (db.Index("idx_blacklisted_tokens_expires_at", "expires_at"),)
+    __table_args__ = (
+        db.UniqueConstraint("token_hash", name="uq_blacklisted_tokens_token_hash"),
+        db.Index("idx_blacklisted_tokens_expires_at", "expires_at"),
+    )
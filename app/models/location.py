@@ -3,6 +3,8 @@
 import uuid
 from app.models.base import db, BaseModel
 
+UNIQUE_LOCATION_CONSTRAINT = "uq_locations_pincode_city_area"
+
 
 class Location(BaseModel):
     __tablename__ = "locations"
@@ -13,9 +15,52 @@ class Location(BaseModel):
     state = db.Column(db.String(100), nullable=False)
     district = db.Column(db.String(100), nullable=False)
     area = db.Column(db.String(255), nullable=False, index=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
 
     __table_args__ = (
+        db.UniqueConstraint("pincode", "city", "area", name=UNIQUE_LOCATION_CONSTRAINT),
         db.Index("idx_locations_city", "city"),
         db.Index("idx_locations_pincode", "pincode"),
         db.Index("idx_locations_area", "area"),
+        db.Index(
+            "idx_locations_pincode_prefix",
+            "pincode",
+            postgresql_ops={"pincode": "varchar_pattern_ops"},
+            postgresql_include=["id", "city", "state", "district", "area"],
+        ),
+        db.Index(
+            "idx_locations_area_lower",
+            db.func.lower(area).label("area_lower"),
+            postgresql_ops={"area_lower": "text_pattern_ops"},
+        ),
+        db.Index(
+            "idx_locations_city_lower",
+            db.func.lower(city).label("city_lower"),
+            postgresql_ops={"city_lower": "text_pattern_ops"},
+        ),
+        db.Index(
+            "idx_locations_city_trgm",
+            "city",
+            postgresql_using="gin",
+            postgresql_ops={"city": "gin_trgm_ops"},
+        ),
+        db.Index(
+            "idx_locations_area_trgm",
+            "area",
+            postgresql_using="gin",
+            postgresql_ops={"area": "gin_trgm_ops"},
+        ),
+        db.Index(
+            "idx_locations_district_trgm",
+            "district",
+            postgresql_using="gin",
+            postgresql_ops={"district": "gin_trgm_ops"},
+        ),
+        db.Index(
+            "idx_locations_pincode_trgm",
+            "pincode",
+            postgresql_using="gin",
+            postgresql_ops={"pincode": "gin_trgm_ops"},
+        ),
     )
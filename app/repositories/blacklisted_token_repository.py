@@ -1,8 +1,10 @@
 """Blacklisted Token repository."""
 
 from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 from app.models.blacklisted_token import BlacklistedToken
 from app.models.base import db
+from app.utils.security import token_hash
 
 
 class BlacklistedTokenRepository:
@@ -12,7 +14,7 @@ class BlacklistedTokenRepository:
         """Check if token is blacklisted."""
         return (
             db.session.query(BlacklistedToken)
-            .filter_by(token=token)
+            .filter_by(token_hash=token_hash(token))
             .filter(BlacklistedToken.expires_at > datetime.now(timezone.utc))
             .first()
             is not None
@@ -20,7 +22,50 @@ class BlacklistedTokenRepository:
 
     def blacklist(self, token: str, expires_at: datetime) -> BlacklistedToken:
         """Add token to blacklist."""
-        blacklisted = BlacklistedToken(token=token, expires_at=expires_at)
+        blacklisted = BlacklistedToken(
+            token_hash=token_hash(token), expires_at=expires_at
+        )
         db.session.add(blacklisted)
         db.session.commit()
         return blacklisted
+
+    def revoked_since(self, since: Optional[datetime]) -> List[Tuple[bytes, datetime]]:
+        """Return (token hash, blacklisted_at) for tokens revoked since a time.
+
+        Expired tokens are left out; with no ``since`` every unexpired token
+        is returned.
+        """
+        query = db.session.query(
+            BlacklistedToken.token_hash, BlacklistedToken.blacklisted_at
+        ).filter(BlacklistedToken.expires_at > datetime.now(timezone.utc))
+        if since is not None:
+            query = query.filter(BlacklistedToken.blacklisted_at >= since)
+        return [
+            (bytes(digest), blacklisted_at) for digest, blacklisted_at in query.all()
+        ]
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Delete expired tokens, one committed batch at a time.
+
+        Small batches keep each transaction's row locks and WAL short so
+        sign-outs are not held up; returns how many rows were removed.
+        """
+        cutoff = datetime.now(timezone.utc)
+        removed = 0
+        while True:
+            batch = (
+                db.session.query(BlacklistedToken.id)
+                .filter(BlacklistedToken.expires_at <= cutoff)
+                .order_by(BlacklistedToken.expires_at)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            deleted = (
+                db.session.query(BlacklistedToken)
+                .filter(BlacklistedToken.id.in_(batch))
+                .delete(synchronize_session=False)
+            )
+            db.session.commit()
+            removed += deleted
+            if deleted < batch_size:
+                return removed
@@ -1,50 +1,419 @@
 """Location repository."""
 
-from typing import List, Dict, Any
-from sqlalchemy import or_
-from app.models.location import Location
+import math
+import threading
+import uuid
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+from sqlalchemy import and_, cast, or_, func
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, insert
+from app.models.location import Location, UNIQUE_LOCATION_CONSTRAINT
 from app.models.base import db
+from app.utils.location_search_index import (
+    EXACT,
+    PREFIX,
+    SUBSTRING,
+    IndexedLocation,
+    LocationSearchIndex,
+)
+from app.utils.pincode_table import PincodeTable
+from app.utils.background_loader import BackgroundLoader
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.errors import ValidationError
+from app.utils.spatial_index import NearbyLocation, SpatialIndex, distance_km
+from app.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class LocationPage(NamedTuple):
+    """One page of search results."""
+
+    locations: List[Location]
+    next_cursor: Optional[str]
 
 
 class LocationRepository:
     """Repository for location data access."""
 
-    def search_locations(self, query: str, limit: int = 20) -> List[Location]:
-        """Search locations by query string."""
-        search_pattern = f"%{query}%"
+    def __init__(
+        self,
+        search_index: Optional[LocationSearchIndex] = None,
+        pincode_table: Optional[PincodeTable] = None,
+        spatial_index: Optional[SpatialIndex] = None,
+        index_loader: Optional[BackgroundLoader] = None,
+        spatial_loader: Optional[BackgroundLoader] = None,
+    ):
+        self.search_index = search_index
+        self.index_loader = index_loader
+        self.pincode_table = pincode_table
+        self.spatial_index = spatial_index
+        self.spatial_loader = spatial_loader
+        self._index_loaded = False
+        self._index_lock = threading.Lock()
+        self._spatial_loaded = False
+        self._spatial_lock = threading.Lock()
+
+    def search_tier(
+        self, tier: str, query: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> LocationPage:
+        """Return one page of a ranking tier's matches and the next page's cursor.
+
+        Database pages are keyset-paginated on (similarity, id), so deep
+        pages cost the same as the first. In-memory index pages slice the
+        index's deterministic ranking.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        index = self._get_search_index()
+        if index is not None:
+            try:
+                offset = int(position[1]) if position and position[0] == "o" else 0
+            except (IndexError, TypeError, ValueError):
+                raise ValidationError("Invalid cursor", "cursor")
+            entries = index.search_tier(tier, query, limit + 1, offset)
+            next_cursor = (
+                encode_cursor(["o", offset + limit]) if len(entries) > limit else None
+            )
+            return LocationPage(self._to_locations(entries[:limit]), next_cursor)
+
+        # similarity() is real; as double precision the score survives the
+        # round trip through the cursor's Python float and compares exactly
+        score = cast(
+            func.greatest(
+                func.similarity(Location.area, query),
+                func.similarity(Location.city, query),
+                func.similarity(Location.district, query),
+            ),
+            DOUBLE_PRECISION,
+        )
+        statement = db.session.query(Location, score).filter(
+            self._tier_filter(tier, query)
+        )
+        if position and position[0] == "s":
+            try:
+                last_score, last_id = float(position[1]), str(position[2])
+            except (IndexError, TypeError, ValueError):
+                raise ValidationError("Invalid cursor", "cursor")
+            statement = statement.filter(
+                or_(
+                    score < last_score,
+                    and_(score == last_score, Location.id > last_id),
+                )
+            )
+        rows = statement.order_by(score.desc(), Location.id).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            last_location, last_score = rows[limit - 1]
+            next_cursor = encode_cursor(["s", float(last_score), last_location.id])
+        return LocationPage([row[0] for row in rows[:limit]], next_cursor)
+
+    def find_by_pincode(self, pincode: str, limit: int = 20) -> List[Location]:
+        """Find locations with exactly this pincode."""
+        if self.pincode_table is not None:
+            entries = self.pincode_table.find_by_pincode(pincode, limit)
+            if entries:
+                return self._to_locations(entries)
+
+        index = self._get_search_index()
+        if index is not None:
+            return self._to_locations(index.find_by_pincode(pincode, limit))
+
         return (
             db.session.query(Location)
+            .filter(Location.pincode == pincode)
+            .order_by(Location.area, Location.id)
+            .limit(limit)
+            .all()
+        )
+
+    def find_by_pincodes(
+        self, pincodes: Iterable[str], limit: int = 20
+    ) -> Dict[str, List[Location]]:
+        """Find locations for many exact pincodes with a single query."""
+        results: Dict[str, List[Location]] = {}
+        remaining: List[str] = []
+        for pincode in dict.fromkeys(pincodes):
+            entries = (
+                self.pincode_table.find_by_pincode(pincode, limit)
+                if self.pincode_table is not None
+                else []
+            )
+            if entries:
+                results[pincode] = self._to_locations(entries)
+            else:
+                remaining.append(pincode)
+
+        index = self._get_search_index()
+        if index is not None:
+            for pincode in remaining:
+                entries = index.find_by_pincode(pincode, limit)
+                if entries:
+                    results[pincode] = self._to_locations(entries)
+            return results
+
+        if remaining:
+            locations = (
+                db.session.query(Location)
+                .filter(Location.pincode.in_(remaining))
+                .order_by(Location.pincode, Location.area, Location.id)
+                .all()
+            )
+            for location in locations:
+                matches = results.setdefault(location.pincode, [])
+                if len(matches) < limit:
+                    matches.append(location)
+        return results
+
+    def search_by_pincode_prefix(self, prefix: str, limit: int = 20) -> List[Location]:
+        """Find locations whose pincode starts with the given digits."""
+        if self.pincode_table is not None:
+            entries = self.pincode_table.search_by_pincode_prefix(prefix, limit)
+            if entries:
+                return self._to_locations(entries)
+
+        index = self._get_search_index()
+        if index is not None:
+            return self._to_locations(index.search_by_pincode_prefix(prefix, limit))
+
+        return (
+            db.session.query(Location)
+            .filter(Location.pincode.like(f"{prefix}%"))
+            .order_by(Location.pincode, Location.area, Location.id)
+            .limit(limit)
+            .all()
+        )
+
+    def is_valid_pincode(self, pincode: str) -> bool:
+        """Return True if any known location has this pincode."""
+        if self.pincode_table is not None and self.pincode_table.is_valid_pincode(
+            pincode
+        ):
+            return True
+        return bool(
+            db.session.query(
+                db.session.query(Location).filter(Location.pincode == pincode).exists()
+            ).scalar()
+        )
+
+    def iter_locations(self) -> Iterator[IndexedLocation]:
+        """Stream every location row as a lightweight tuple."""
+        rows = db.session.query(
+            Location.pincode,
+            Location.city,
+            Location.state,
+            Location.district,
+            Location.area,
+        ).yield_per(10000)
+        return (IndexedLocation(*row) for row in rows)
+
+    def iter_coordinates(self) -> Iterator[Tuple[IndexedLocation, float, float]]:
+        """Stream every location that has coordinates."""
+        rows = (
+            db.session.query(
+                Location.pincode,
+                Location.city,
+                Location.state,
+                Location.district,
+                Location.area,
+                Location.latitude,
+                Location.longitude,
+            )
+            .filter(Location.latitude.isnot(None), Location.longitude.isnot(None))
+            .yield_per(10000)
+        )
+        return ((IndexedLocation(*row[:5]), row[5], row[6]) for row in rows)
+
+    def get_pincode_centroids(
+        self, pincodes: Iterable[str]
+    ) -> Dict[str, Tuple[float, float]]:
+        """Average coordinates of each pincode's locations, where known."""
+        codes = sorted(set(pincodes))
+        if not codes:
+            return {}
+        rows = (
+            db.session.query(
+                Location.pincode,
+                func.avg(Location.latitude),
+                func.avg(Location.longitude),
+            )
             .filter(
-                or_(
-                    Location.city.ilike(search_pattern),
-                    Location.area.ilike(search_pattern),
-                    Location.pincode.like(search_pattern),
-                    Location.district.ilike(search_pattern),
-                )
+                Location.pincode.in_(codes),
+                Location.latitude.isnot(None),
+                Location.longitude.isnot(None),
             )
+            .group_by(Location.pincode)
+            .all()
+        )
+        return {
+            pincode: (float(latitude), float(longitude))
+            for pincode, latitude, longitude in rows
+        }
+
+    def find_nearest(
+        self, latitude: float, longitude: float, limit: int = 10
+    ) -> List[NearbyLocation]:
+        """Find the locations closest to a point, nearest first."""
+        index = self._get_spatial_index()
+        if index is not None:
+            return index.nearest(latitude, longitude, limit)
+
+        # Equirectangular approximation; exact distances are computed below
+        scale = math.cos(math.radians(latitude)) ** 2
+        score = (Location.latitude - latitude) * (Location.latitude - latitude) + (
+            Location.longitude - longitude
+        ) * (Location.longitude - longitude) * scale
+        locations = (
+            db.session.query(Location)
+            .filter(Location.latitude.isnot(None), Location.longitude.isnot(None))
+            .order_by(score, Location.id)
             .limit(limit)
             .all()
         )
+        return [
+            NearbyLocation(
+                location=self._to_indexed(loc),
+                latitude=loc.latitude,
+                longitude=loc.longitude,
+                distance_km=distance_km(
+                    latitude, longitude, loc.latitude, loc.longitude
+                ),
+            )
+            for loc in locations
+        ]
 
     def bulk_create(self, locations_data: List[Dict[str, Any]]) -> List[Location]:
-        """Create multiple locations at once."""
-        locations = []
+        """Insert locations in one statement, skipping ones that already exist."""
+        rows: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
         for data in locations_data:
-            # Check if location already exists
-            existing = (
-                db.session.query(Location)
-                .filter_by(
-                    pincode=data["pincode"],
-                    city=data["city"],
-                    area=data["area"],
-                )
-                .first()
-            )
-            if not existing:
-                location = Location(**data)
-                db.session.add(location)
-                locations.append(location)
+            key = (data["pincode"], data["city"], data["area"])
+            if key not in rows:
+                rows[key] = {"id": str(uuid.uuid4()), **data}
+
+        if not rows:
+            return []
+
+        statement = (
+            insert(Location)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing(constraint=UNIQUE_LOCATION_CONSTRAINT)
+            .returning(Location)
+        )
+        locations = list(db.session.scalars(statement))
+        # Read the rows before commit expires them
+        indexed = [self._to_indexed(loc) for loc in locations]
+        coordinates = [
+            (entry, loc.latitude, loc.longitude)
+            for entry, loc in zip(indexed, locations)
+            if loc.latitude is not None and loc.longitude is not None
+        ]
+        db.session.commit()
 
-        if locations:
-            db.session.commit()
+        # While a background load runs, the index queues rows it may miss and
+        # merges them after the load, skipping the ones it already holds
+        if (
+            indexed
+            and self.search_index is not None
+            and (self._index_loaded or self.index_loader is not None)
+        ):
+            self.search_index.add(indexed)
+        if (
+            coordinates
+            and self.spatial_index is not None
+            and (self._spatial_loaded or self.spatial_loader is not None)
+        ):
+            self.spatial_index.add(coordinates)
         return locations
+
+    @staticmethod
+    def _tier_filter(tier: str, query: str) -> Any:
+        """Rows in a ranking tier; each tier excludes the ones before it.
+
+        Exact and prefix matches on area and city are served by the
+        lower(...) text_pattern_ops indexes, substring matches by the
+        trigram indexes.
+        """
+        area, city = func.lower(Location.area), func.lower(Location.city)
+        exact = or_(area == query, city == query)
+        if tier == EXACT:
+            return exact
+
+        prefix = or_(area.like(f"{query}%"), city.like(f"{query}%"))
+        if tier == PREFIX:
+            return and_(prefix, ~exact)
+
+        if tier == SUBSTRING:
+            search_pattern = f"%{query}%"
+            substring = or_(
+                Location.city.ilike(search_pattern),
+                Location.area.ilike(search_pattern),
+                Location.pincode.like(search_pattern),
+                Location.district.ilike(search_pattern),
+            )
+            return and_(substring, ~prefix)
+        raise ValueError(f"Unknown search tier: {tier}")
+
+    def _get_search_index(self) -> Optional[LocationSearchIndex]:
+        """Return the in-memory index once it is loaded in this worker.
+
+        With an ``index_loader`` the index is built on a background thread
+        and queries go to the database until it is ready; without one it is
+        loaded inline on first use.
+        """
+        if self.search_index is None or self._index_loaded:
+            return self.search_index
+
+        if self.index_loader is not None:
+            self.index_loader.ensure_running(self._load_search_index)
+            return None
+
+        with self._index_lock:
+            if not self._index_loaded:
+                self._load_search_index()
+        return self.search_index
+
+    def _load_search_index(self) -> None:
+        if self.search_index is None:
+            return
+        added = self.search_index.load(self.iter_locations())
+        self._index_loaded = True
+        logger.info(f"Loaded {added} locations into search index")
+
+    def _get_spatial_index(self) -> Optional[SpatialIndex]:
+        """Return the coordinate index once it is loaded in this worker.
+
+        With a ``spatial_loader`` the tree is built on a background thread
+        and queries go to the database until it is ready; without one it is
+        loaded inline on first use.
+        """
+        if self.spatial_index is None or self._spatial_loaded:
+            return self.spatial_index
+
+        if self.spatial_loader is not None:
+            self.spatial_loader.ensure_running(self._load_spatial_index)
+            return None
+
+        with self._spatial_lock:
+            if not self._spatial_loaded:
+                self._load_spatial_index()
+        return self.spatial_index
+
+    def _load_spatial_index(self) -> None:
+        if self.spatial_index is None:
+            return
+        added = self.spatial_index.load(self.iter_coordinates())
+        self._spatial_loaded = True
+        logger.info(f"Loaded {added} coordinates into spatial index")
+
+    @staticmethod
+    def _to_indexed(location: Location) -> IndexedLocation:
+        return IndexedLocation(
+            pincode=location.pincode,
+            city=location.city,
+            state=location.state,
+            district=location.district,
+            area=location.area,
+        )
+
+    @staticmethod
+    def _to_locations(entries: List[IndexedLocation]) -> List[Location]:
+        return [Location(**entry._asdict()) for entry in entries]
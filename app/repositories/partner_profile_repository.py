@@ -1,13 +1,50 @@
 """Partner Profile repository."""
 
-from typing import Optional, List
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Optional, List, Tuple
 from app.models.partner_profile import PartnerProfile
 from app.models.base import db
+from app.repositories.location_repository import LocationRepository
+from app.utils.partner_index import PartnerCoverageIndex, parse_radius_km
+from app.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+# Rows in the area lookup for a pincode; more than any real pincode has
+MAX_PINCODE_AREAS = 200
+
+# updated_at is stamped at flush, so a profile can commit after one with a
+# newer stamp; each sync looks this far behind the newest one seen
+SYNC_OVERLAP = timedelta(seconds=10)
 
 
 class PartnerProfileRepository:
     """Repository for partner profile data access."""
 
+    def __init__(
+        self,
+        coverage_index: Optional[PartnerCoverageIndex] = None,
+        location_repository: Optional[LocationRepository] = None,
+        refresh_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.coverage_index = (
+            coverage_index if coverage_index is not None else PartnerCoverageIndex()
+        )
+        self.location_repository = (
+            location_repository
+            if location_repository is not None
+            else LocationRepository()
+        )
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._index_loaded = False
+        self._index_lock = threading.Lock()
+        self._synced_at = 0.0
+        self._high_water: Optional[datetime] = None
+
     def get_by_partner_id(self, partner_id: str) -> Optional[PartnerProfile]:
         """Get partner profile by partner ID."""
         return db.session.query(PartnerProfile).filter_by(partner_id=partner_id).first()
@@ -49,7 +86,9 @@ class PartnerProfileRepository:
             delivery_radius=delivery_radius,
         )
         db.session.add(profile)
+        coverage = self._coverage_row(profile)
         db.session.commit()
+        self._index_rows([coverage])
         return profile
 
     def update(
@@ -89,5 +128,98 @@ class PartnerProfileRepository:
         profile.categories = categories
         profile.service_areas = service_areas
         profile.delivery_radius = delivery_radius
+        coverage = self._coverage_row(profile)
         db.session.commit()
+        self._index_rows([coverage])
         return profile
+
+    def find_covering_partners(
+        self, pincode: str, limit: int = 20
+    ) -> List[Tuple[PartnerProfile, Optional[float]]]:
+        """Profiles of partners serving a pincode, with distance in km if known."""
+        index = self._get_coverage_index()
+        names = {
+            name
+            for location in self.location_repository.find_by_pincode(
+                pincode, MAX_PINCODE_AREAS
+            )
+            for name in (location.area, location.city, location.district)
+        }
+        center = self.location_repository.get_pincode_centroids([pincode]).get(pincode)
+        matches = index.match(pincode, names, center)[:limit]
+        if not matches:
+            return []
+
+        profiles = {
+            profile.partner_id: profile
+            for profile in db.session.query(PartnerProfile)
+            .filter(PartnerProfile.partner_id.in_([m[0] for m in matches]))
+            .all()
+        }
+        return [
+            (profiles[partner_id], distance)
+            for partner_id, distance in matches
+            if partner_id in profiles
+        ]
+
+    def _get_coverage_index(self) -> PartnerCoverageIndex:
+        """Load the coverage index once, then pick up other workers' edits."""
+        if self._index_loaded and self._clock() - self._synced_at < (
+            self.refresh_interval
+        ):
+            return self.coverage_index
+
+        with self._index_lock:
+            if not self._index_loaded or self._clock() - self._synced_at >= (
+                self.refresh_interval
+            ):
+                since = self._high_water - SYNC_OVERLAP if self._high_water else None
+                rows = self._coverage_rows_since(since)
+                self._index_rows(rows, force=True)
+                if not self._index_loaded:
+                    logger.info(f"Loaded {len(rows)} partners into coverage index")
+                self._index_loaded = True
+                self._synced_at = self._clock()
+        return self.coverage_index
+
+    def _coverage_rows_since(self, since: Optional[datetime]) -> List[Tuple[Any, ...]]:
+        query = db.session.query(
+            PartnerProfile.partner_id,
+            PartnerProfile.pincode,
+            PartnerProfile.service_areas,
+            PartnerProfile.delivery_radius,
+            PartnerProfile.updated_at,
+        )
+        if since is not None:
+            query = query.filter(PartnerProfile.updated_at >= since)
+        return [tuple(row) for row in query.all()]
+
+    @staticmethod
+    def _coverage_row(profile: PartnerProfile) -> Tuple[Any, ...]:
+        return (
+            profile.partner_id,
+            profile.pincode,
+            profile.service_areas,
+            profile.delivery_radius,
+            None,
+        )
+
+    def _index_rows(self, rows: Iterable[Tuple[Any, ...]], force: bool = False) -> None:
+        """Add coverage rows to the index once it has been loaded."""
+        rows = list(rows)
+        if not rows or not (self._index_loaded or force):
+            return
+
+        centers = self.location_repository.get_pincode_centroids(row[1] for row in rows)
+        for partner_id, pincode, service_areas, delivery_radius, updated_at in rows:
+            self.coverage_index.upsert(
+                partner_id,
+                pincode,
+                service_areas or [],
+                centers.get(pincode),
+                parse_radius_km(delivery_radius),
+            )
+            if updated_at is not None and (
+                self._high_water is None or updated_at > self._high_water
+            ):
+                self._high_water = updated_at
@@ -36,3 +36,10 @@ class RentalPartnerRepository:
         db.session.add(partner)
         db.session.commit()
         return partner
+
+    def update_password_hash(self, partner_id: str, password_hash: str) -> None:
+        """Replace a partner's stored password hash."""
+        db.session.query(RentalPartner).filter_by(id=partner_id).update(
+            {"password_hash": password_hash}
+        )
+        db.session.commit()
@@ -3,8 +3,12 @@
 from typing import Any, Tuple
 from flask import Blueprint, jsonify, g
 from app.services.location_service import LocationService
-from app.contracts.location_contracts import LocationSearchRequest
-from app.utils.validators import validate_query_params
+from app.contracts.location_contracts import (
+    LocationSearchRequest,
+    LocationBatchRequest,
+    NearestLocationRequest,
+)
+from app.utils.validators import validate_json, validate_query_params
 from app.utils.errors import handle_controller_errors
 from app.utils.logging import setup_logger
 
@@ -22,10 +26,38 @@ def create_location_routes(location_service: LocationService) -> Blueprint:
         """Search locations by query."""
         logger.info("Received location search request")
 
-        query = g.validated_params["q"]
-        response = location_service.search_locations(query)
+        params = g.validated_params
+        response = location_service.search_locations(
+            params["q"], params["limit"], params["cursor"]
+        )
 
         logger.info(f"Location search completed: {len(response.data)} results")
         return jsonify(response.model_dump()), 200
 
+    @location_bp.route("/batch", methods=["POST"])
+    @validate_json(LocationBatchRequest)
+    @handle_controller_errors
+    def resolve_locations_batch() -> Tuple[Any, int]:
+        """Resolve many pincodes or queries in one request."""
+        queries = g.validated_json["queries"]
+        logger.info(f"Received batch location request for {len(queries)} queries")
+
+        response = location_service.resolve_batch(queries)
+
+        logger.info(f"Batch location lookup completed: {response.message}")
+        return jsonify(response.model_dump()), 200
+
+    @location_bp.route("/nearest", methods=["GET"])
+    @validate_query_params(NearestLocationRequest)
+    @handle_controller_errors
+    def find_nearest_locations() -> Tuple[Any, int]:
+        """Find the locations closest to a coordinate."""
+        params = g.validated_params
+        response = location_service.find_nearest(
+            params["lat"], params["lon"], params["k"]
+        )
+
+        logger.info(f"Nearest location lookup completed: {len(response.data)} results")
+        return jsonify(response.model_dump()), 200
+
     return location_bp
@@ -3,8 +3,11 @@
 from typing import Any, Tuple
 from flask import Blueprint, jsonify, g
 from app.services.partner_profile_service import PartnerProfileService
-from app.contracts.partner_profile_contracts import UpdatePartnerProfileRequest
-from app.utils.validators import validate_json, has_permission
+from app.contracts.partner_profile_contracts import (
+    UpdatePartnerProfileRequest,
+    DiscoverPartnersRequest,
+)
+from app.utils.validators import validate_json, validate_query_params, has_permission
 from app.utils.errors import handle_controller_errors
 from app.utils.logging import setup_logger
 
@@ -43,4 +46,15 @@ def create_partner_profile_routes(
         logger.info("Profile updated successfully")
         return jsonify(response.model_dump()), 200
 
+    @profile_bp.route("/discover", methods=["GET"])
+    @validate_query_params(DiscoverPartnersRequest)
+    @handle_controller_errors
+    def discover_partners() -> Tuple[Any, int]:
+        """Find partners serving a pincode."""
+        params = g.validated_params
+        response = profile_service.discover_partners(params["pincode"], params["limit"])
+
+        logger.info(f"Partner discovery completed: {len(response.data)} partners")
+        return jsonify(response.model_dump()), 200
+
     return profile_bp
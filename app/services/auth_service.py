@@ -1,6 +1,7 @@
 """Authentication service."""
 
 from datetime import datetime
+from typing import Optional
 import jwt
 from app.repositories.rental_partner_repository import RentalPartnerRepository
 from app.repositories.blacklisted_token_repository import BlacklistedTokenRepository
@@ -11,15 +12,20 @@ from app.contracts.auth_contracts import (
     UserData,
     SignOutResponse,
 )
-from app.utils.security import (
-    hash_password,
-    verify_password,
-    generate_token,
-    decode_token,
+from app.utils.security import generate_token, decode_token
+from app.utils.password_hasher import PasswordHasher
+from app.utils.revocation_cache import RevocationCache
+from app.utils.errors import (
+    ValidationError,
+    UnauthorizedError,
+    ConflictError,
+    ServiceUnavailableError,
 )
-from app.utils.errors import ValidationError, UnauthorizedError, ConflictError
+from app.utils.logging import setup_logger
 from app.models.rental_partner import RentalPartner
 
+logger = setup_logger(__name__)
+
 
 class AuthService:
     """Service for authentication operations."""
@@ -34,6 +40,8 @@ class AuthService:
         refresh_expiration: int,
         min_password_length: int,
         remember_me_multiplier: int,
+        password_hasher: Optional[PasswordHasher] = None,
+        revocation_cache: Optional[RevocationCache] = None,
     ):
         self.repository = repository
         self.blacklist_repo = blacklist_repo
@@ -43,6 +51,8 @@ class AuthService:
         self.refresh_expiration = refresh_expiration
         self.min_password_length = min_password_length
         self.remember_me_multiplier = remember_me_multiplier
+        self.password_hasher = password_hasher or PasswordHasher(workers=0)
+        self.revocation_cache = revocation_cache
 
     def sign_up(
         self,
@@ -70,7 +80,7 @@ class AuthService:
         if existing:
             raise ConflictError("Email already exists", "email")
 
-        password_hash = hash_password(password)
+        password_hash = self.password_hasher.hash(password)
         partner = self.repository.create(
             email=email,
             password_hash=password_hash,
@@ -108,9 +118,12 @@ class AuthService:
         if not partner:
             raise UnauthorizedError("Invalid email or password")
 
-        if not verify_password(password, partner.password_hash):
+        if not self.password_hasher.verify(password, partner.password_hash):
             raise UnauthorizedError("Invalid email or password")
 
+        if self.password_hasher.needs_rehash(partner.password_hash):
+            self._rehash_password(partner, password)
+
         expiration = (
             self.jwt_expiration * self.remember_me_multiplier
             if remember_me
@@ -124,12 +137,25 @@ class AuthService:
             payload = decode_token(token, self.jwt_secret)
             expires_at = datetime.fromtimestamp(payload["exp"])
             self.blacklist_repo.blacklist(token, expires_at)
+            if self.revocation_cache is not None:
+                self.revocation_cache.add(token)
             return SignOutResponse(message="Sign out successful")
         except jwt.ExpiredSignatureError:
             raise UnauthorizedError("Token has expired")
         except jwt.InvalidTokenError:
             raise UnauthorizedError("Invalid token")
 
+    def _rehash_password(self, partner: RentalPartner, password: str) -> None:
+        """Move a stored hash to the configured cost while the password is known."""
+        try:
+            password_hash = self.password_hasher.hash(password)
+        except ServiceUnavailableError:
+            # The sign-in already succeeded; upgrade on a later one
+            logger.warning(f"Skipped password rehash for partner {partner.id}")
+            return
+        self.repository.update_password_hash(partner.id, password_hash)
+        logger.info(f"Rehashed password for partner {partner.id}")
+
     def _create_user_data(self, partner: RentalPartner) -> UserData:
         """Create UserData from RentalPartner."""
         return UserData(
@@ -1,14 +1,50 @@
 """Location service."""
 
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from app.repositories.location_repository import LocationRepository
-from app.services.nominatim_service import NominatimService
-from app.contracts.location_contracts import LocationSearchResponse, LocationData
+from app.services.nominatim_service import (
+    NominatimService,
+    GeocodingUnavailableError,
+)
+from app.services.location_writer import LocationWriter
+from app.contracts.location_contracts import (
+    LocationSearchResponse,
+    LocationBatchResponse,
+    LocationData,
+    NearestLocationData,
+    NearestLocationResponse,
+)
+from app.models.location import Location
 from app.utils.errors import ValidationError
+from app.utils.fuzzy_index import FuzzyLocationIndex
+from app.utils.background_loader import BackgroundLoader
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.location_search_index import SEARCH_TIERS, IndexedLocation
+from app.utils.text_normalization import normalize_query
 from app.utils.logging import setup_logger
+from app.utils.ttl_cache import TTLCache
+from app.utils.single_flight import SingleFlight
 
 logger = setup_logger(__name__)
 
+PINCODE_LENGTH = 6
+DEFAULT_SEARCH_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    """One page of search results and the cursor for the next page."""
+
+    data: List[LocationData]
+    next_cursor: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        # Empty pages are misses, cached with the shorter negative TTL
+        return bool(self.data)
+
 
 class LocationService:
     """Service for location operations."""
@@ -17,56 +53,428 @@ class LocationService:
         self,
         repository: LocationRepository,
         geocoding_service: Optional[NominatimService] = None,
+        cache: Optional[TTLCache[SearchPage]] = None,
+        single_flight: Optional[SingleFlight[SearchPage]] = None,
+        writer: Optional[LocationWriter] = None,
+        fuzzy_index: Optional[FuzzyLocationIndex] = None,
+        fuzzy_loader: Optional[BackgroundLoader] = None,
+        batch_geocode_limit: int = 5,
+        fallback_budget: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
     ):
         self.repository = repository
         self.geocoding_service = geocoding_service
+        self.cache = cache
+        self.single_flight = single_flight
+        self.writer = writer
+        self.fuzzy_index = fuzzy_index
+        self.fuzzy_loader = fuzzy_loader
+        self.batch_geocode_limit = batch_geocode_limit
+        self.fallback_budget = fallback_budget
+        self._clock = clock
+        self._fuzzy_loaded = False
+        self._fuzzy_lock = threading.Lock()
+        if writer is not None:
+            writer.on_persisted = self._on_locations_saved
 
-    def search_locations(self, query: str) -> LocationSearchResponse:
+    def search_locations(
+        self,
+        query: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> LocationSearchResponse:
         """Search locations by query string (hybrid: DB first, then geocoding API)."""
-        if not query or len(query) < 2:
+        # Every layer below (cache, DB, fuzzy index, geocoding) sees one spelling
+        query = normalize_query(query or "")
+        if len(query) < 2:
             raise ValidationError("Search query must be at least 2 characters")
 
+        if cursor:
+            # Later pages continue the database ranking of the first one
+            return self._search_response(self._search_database(query, limit, cursor))
+
+        key = self._cache_key(query, limit)
+        page = self.cache.get(key) if self.cache is not None else None
+
+        if page is None:
+            try:
+                page = self._search(query, limit, key)
+            except GeocodingUnavailableError as e:
+                # Fall back to DB-only (empty) results; don't cache the miss
+                logger.warning(f"Geocoding unavailable for '{query}': {str(e)}")
+                page = SearchPage([])
+            else:
+                if self.cache is not None:
+                    self.cache.set(key, page)
+
+        return self._search_response(page)
+
+    def resolve_batch(self, queries: List[str]) -> LocationBatchResponse:
+        """Resolve many pincodes or place names at once, keyed by input."""
+        keys = {query: normalize_query(query) for query in queries}
+        # Whole pages, so cached ones keep the cursor /search would give them
+        results: Dict[str, SearchPage] = {}
+        pending: List[str] = []
+        for key in dict.fromkeys(keys.values()):
+            cached = (
+                self.cache.get(self._cache_key(key, DEFAULT_SEARCH_LIMIT))
+                if self.cache is not None
+                else None
+            )
+            if len(key) < 2:
+                results[key] = SearchPage([])
+            elif cached is not None:
+                results[key] = cached
+            else:
+                pending.append(key)
+
+        misses = self._resolve_batch_locally(pending, results)
+        unresolved = self._geocode_batch(misses, results)
+        if self.cache is not None:
+            for key in pending:
+                if key not in unresolved:
+                    self.cache.set(
+                        self._cache_key(key, DEFAULT_SEARCH_LIMIT), results[key]
+                    )
+
+        data = {query: results[key].data for query, key in keys.items()}
+        found = sum(1 for locations in data.values() if locations)
+        return LocationBatchResponse(
+            message=f"Resolved {found} of {len(data)} queries", data=data
+        )
+
+    def find_nearest(
+        self, latitude: float, longitude: float, k: int = 10
+    ) -> NearestLocationResponse:
+        """Return the k known locations closest to a coordinate."""
+        nearby = self.repository.find_nearest(latitude, longitude, k)
+        data = [
+            NearestLocationData(
+                **item.location._asdict(),
+                latitude=item.latitude,
+                longitude=item.longitude,
+                distance_km=round(item.distance_km, 3),
+            )
+            for item in nearby
+        ]
+        if data:
+            return NearestLocationResponse(message="Locations found", data=data)
+        return NearestLocationResponse(message="No locations found", data=[])
+
+    def _search(self, query: str, limit: int, key: str) -> SearchPage:
+        """Run the uncached DB-then-geocoding lookup."""
         # Step 1: Check database first
-        locations = self.repository.search_locations(query)
+        page = self._search_database(query, limit)
+        if page:
+            return page
 
-        if locations:
-            logger.info(f"Found {len(locations)} locations in database")
-            location_data = [
-                LocationData(
-                    pincode=loc.pincode,
-                    city=loc.city,
-                    state=loc.state,
-                    district=loc.district,
-                    area=loc.area,
-                )
-                for loc in locations
-            ]
-            return LocationSearchResponse(message="Locations found", data=location_data)
+        # Step 2: Misspelled names are usually one or two edits away
+        location_data = self._search_fuzzy(query, limit)
+        if location_data:
+            return SearchPage(location_data)
 
-        # Step 2: Not found in DB? Try geocoding API
+        # Step 3: Not found in DB? Try geocoding API
         if self.geocoding_service:
-            logger.info(f"No results in DB, querying geocoding API for: {query}")
-            api_results = self.geocoding_service.search_places(query)
-
-            if api_results:
-                # Step 3: Save to database for future searches
-                saved_locations = self.repository.bulk_create(api_results)
-                logger.info(f"Saved {len(saved_locations)} new locations to database")
-
-                location_data = [
-                    LocationData(
-                        pincode=loc["pincode"],
-                        city=loc["city"],
-                        state=loc["state"],
-                        district=loc["district"],
-                        area=loc["area"],
-                    )
-                    for loc in api_results
-                ]
-                return LocationSearchResponse(
-                    message="Locations found", data=location_data
+            deadline = self._fallback_deadline()
+            if self.single_flight is None:
+                return self._geocode(query, limit, deadline)
+            # One upstream call per query; concurrent callers share its result.
+            # Only a leader that queued behind another worker re-reads the DB,
+            # so under a cross-worker lock the rows are written before it is
+            # released rather than left in the write-behind queue.
+            persist_now = self.single_flight.lock_dir is not None
+            try:
+                return self.single_flight.do(
+                    key,
+                    lambda waited: self._geocode(
+                        query,
+                        limit,
+                        deadline,
+                        recheck_database=waited,
+                        persist_now=persist_now,
+                    ),
+                    self._remaining(deadline),
+                )
+            except TimeoutError:
+                raise GeocodingUnavailableError(
+                    "Timed out waiting for a concurrent geocoding call"
                 )
 
         # No results from DB or geocoding API
         logger.info(f"No locations found for query: {query}")
+        return SearchPage([])
+
+    def _search_database(
+        self,
+        query: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
+        """Search the locations table."""
+        next_cursor = None
+        if query.isascii() and query.isdigit():
+            locations = self._search_pincode(query, limit)
+        else:
+            locations, next_cursor = self._search_ranked(query, limit, cursor)
+
+        if locations:
+            logger.info(f"Found {len(locations)} locations in database")
+        return SearchPage([self._from_location(loc) for loc in locations], next_cursor)
+
+    def _search_ranked(
+        self, query: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Location], Optional[str]]:
+        """Fill a page from the exact, prefix and substring tiers in turn.
+
+        Each tier is its own indexed query and later tiers are only reached
+        while the page still has room, so most searches never run the
+        wildcard scan. The cursor records the tier a page stopped in.
+        """
+        tier, tier_cursor = SEARCH_TIERS[0], None
+        if cursor:
+            position = decode_cursor(cursor)
+            if (
+                len(position) != 2
+                or position[0] not in SEARCH_TIERS
+                or not isinstance(position[1], (str, type(None)))
+            ):
+                raise ValidationError("Invalid cursor", "cursor")
+            tier, tier_cursor = position
+
+        locations: List[Location] = []
+        for number in range(SEARCH_TIERS.index(tier), len(SEARCH_TIERS)):
+            tier = SEARCH_TIERS[number]
+            page = self.repository.search_tier(
+                tier, query, limit - len(locations), tier_cursor
+            )
+            locations.extend(page.locations)
+            if page.next_cursor:
+                return locations, encode_cursor([tier, page.next_cursor])
+            tier_cursor = None
+            if len(locations) >= limit:
+                if number + 1 < len(SEARCH_TIERS):
+                    # The page is full; the next tier only runs when asked for
+                    return locations, encode_cursor([SEARCH_TIERS[number + 1], None])
+                break
+        return locations, None
+
+    def _search_fuzzy(
+        self, query: str, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> List[LocationData]:
+        """Match the query against known names allowing for typos."""
+        index = self._get_fuzzy_index()
+        if index is None or query.isdigit():
+            return []
+
+        matches = index.search(query, limit)
+        if matches:
+            logger.info(f"Found {len(matches)} fuzzy matches for query: {query}")
+        return [LocationData(**match._asdict()) for match in matches]
+
+    def _get_fuzzy_index(self) -> Optional[FuzzyLocationIndex]:
+        """Return the fuzzy index once it is loaded in this worker.
+
+        With a ``fuzzy_loader`` the index is built on a background thread
+        and fuzzy matching is skipped until it is ready; without one it is
+        loaded inline on first use.
+        """
+        if self.fuzzy_index is None or self._fuzzy_loaded:
+            return self.fuzzy_index
+
+        if self.fuzzy_loader is not None:
+            self.fuzzy_loader.ensure_running(self._load_fuzzy_index)
+            return None
+
+        with self._fuzzy_lock:
+            if not self._fuzzy_loaded:
+                self._load_fuzzy_index()
+        return self.fuzzy_index
+
+    def _load_fuzzy_index(self) -> None:
+        if self.fuzzy_index is None:
+            return
+        added = self.fuzzy_index.load(self.repository.iter_locations())
+        self._fuzzy_loaded = True
+        logger.info(f"Loaded {added} locations into fuzzy index")
+
+    def _geocode(
+        self,
+        query: str,
+        limit: int,
+        deadline: Optional[float] = None,
+        recheck_database: bool = False,
+        persist_now: bool = False,
+    ) -> SearchPage:
+        """Query the geocoding API and save its results."""
+        if recheck_database:
+            # Another worker may have geocoded this query while we waited
+            page = self._search_database(query, limit)
+            if page:
+                return page
+
+        if not self.geocoding_service:
+            return SearchPage([])
+
+        logger.info(f"No results in DB, querying geocoding API for: {query}")
+        api_results = self.geocoding_service.search_places(
+            query, limit, self._remaining(deadline)
+        )
+
+        if not api_results:
+            logger.info(f"No locations found for query: {query}")
+            return SearchPage([])
+
+        self._save_geocoded(api_results, persist_now)
+        return SearchPage([self._from_geocoded(loc) for loc in api_results])
+
+    def _fallback_deadline(self) -> Optional[float]:
+        """When this request must stop waiting on the geocoding fallback."""
+        if self.fallback_budget is None:
+            return None
+        return self._clock() + self.fallback_budget
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else deadline - self._clock()
+
+    def _resolve_batch_locally(
+        self, queries: List[str], results: Dict[str, SearchPage]
+    ) -> List[str]:
+        """Answer queries from the database; returns the ones still missing."""
+        # Full pincodes are answered together with one IN query
+        pincodes = [
+            query
+            for query in queries
+            if query.isascii() and query.isdigit() and len(query) == PINCODE_LENGTH
+        ]
+        by_pincode = self.repository.find_by_pincodes(pincodes) if pincodes else {}
+
+        misses: List[str] = []
+        for query in queries:
+            if query in by_pincode:
+                page = SearchPage(
+                    [self._from_location(loc) for loc in by_pincode[query]]
+                )
+            elif query in pincodes:
+                page = SearchPage([])
+            else:
+                page = self._search_database(query) or SearchPage(
+                    self._search_fuzzy(query)
+                )
+
+            if page:
+                results[query] = page
+            else:
+                misses.append(query)
+        return misses
+
+    def _geocode_batch(
+        self, queries: List[str], results: Dict[str, SearchPage]
+    ) -> Set[str]:
+        """Geocode a bounded number of misses; returns queries left unresolved."""
+        unresolved: Set[str] = set()
+        api_rows: List[Dict[str, Any]] = []
+        # One budget for the whole batch, not one per query
+        deadline = self._fallback_deadline()
+        for position, query in enumerate(queries):
+            results[query] = SearchPage([])
+            if not self.geocoding_service:
+                continue
+            if position >= self.batch_geocode_limit:
+                unresolved.add(query)
+                continue
+            if unresolved:
+                # The API is unavailable; don't queue more calls behind it
+                unresolved.add(query)
+                continue
+            try:
+                api_results = self.geocoding_service.search_places(
+                    query, timeout=self._remaining(deadline)
+                )
+            except GeocodingUnavailableError as e:
+                logger.warning(f"Geocoding unavailable for '{query}': {str(e)}")
+                unresolved.add(query)
+                continue
+            results[query] = SearchPage(
+                [self._from_geocoded(loc) for loc in api_results]
+            )
+            api_rows.extend(api_results)
+
+        if api_rows:
+            self._save_geocoded(api_rows)
+        return unresolved
+
+    def _save_geocoded(
+        self, api_results: List[Dict[str, Any]], persist_now: bool = False
+    ) -> None:
+        """Index geocoded rows and persist them for future searches.
+
+        ``persist_now`` bypasses the write-behind queue, for callers whose
+        rows must be visible to other workers as soon as this returns.
+        """
+        # Also while a background load runs; the index queues them until then
+        if self.fuzzy_index is not None and (
+            self._fuzzy_loaded or self.fuzzy_loader is not None
+        ):
+            self.fuzzy_index.add(
+                IndexedLocation(
+                    pincode=loc["pincode"],
+                    city=loc["city"],
+                    state=loc["state"],
+                    district=loc["district"],
+                    area=loc["area"],
+                )
+                for loc in api_results
+            )
+
+        if self.writer is not None and not persist_now:
+            self.writer.submit(api_results)
+        else:
+            saved_locations = self.repository.bulk_create(api_results)
+            logger.info(f"Saved {len(saved_locations)} new locations to database")
+            self._on_locations_saved(saved_locations)
+
+    @staticmethod
+    def _from_location(location: Location) -> LocationData:
+        return LocationData(
+            pincode=location.pincode,
+            city=location.city,
+            state=location.state,
+            district=location.district,
+            area=location.area,
+        )
+
+    @staticmethod
+    def _from_geocoded(row: Dict[str, Any]) -> LocationData:
+        return LocationData(
+            pincode=row["pincode"],
+            city=row["city"],
+            state=row["state"],
+            district=row["district"],
+            area=row["area"],
+            latitude=row.get("latitude"),
+            longitude=row.get("longitude"),
+        )
+
+    def _on_locations_saved(self, saved_locations: List[Location]) -> None:
+        """Invalidate cached results once new rows are in the database."""
+        if saved_locations and self.cache is not None:
+            # Cached misses may now have matches in the database
+            self.cache.clear()
+
+    def _search_pincode(self, digits: str, limit: int) -> List[Location]:
+        """Look up a full pincode by equality, a partial one by prefix."""
+        if len(digits) == PINCODE_LENGTH:
+            return self.repository.find_by_pincode(digits, limit)
+        return self.repository.search_by_pincode_prefix(digits, limit)
+
+    @staticmethod
+    def _cache_key(query: str, limit: int) -> str:
+        return f"{limit}:{query}"
+
+    @staticmethod
+    def _search_response(page: SearchPage) -> LocationSearchResponse:
+        if page.data:
+            return LocationSearchResponse(
+                message="Locations found", data=page.data, next_cursor=page.next_cursor
+            )
         return LocationSearchResponse(message="No locations found", data=[])
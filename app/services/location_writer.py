@@ -0,0 +1,146 @@
+"""Background write-behind persistence for geocoded locations."""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from flask import Flask
+from app.models.base import db
+from app.models.location import Location
+from app.repositories.location_repository import LocationRepository
+from app.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class LocationWriter:
+    """Batch geocoding results and insert them off the request path.
+
+    Rows go into a bounded queue; a daemon thread flushes them through
+    ``LocationRepository.bulk_create`` once ``batch_size`` rows are pending
+    or ``flush_interval`` seconds have passed since the first one. The thread
+    is started on first use in each process so it survives gunicorn's fork,
+    and pending rows are drained at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        repository: LocationRepository,
+        max_queue: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        on_persisted: Optional[Callable[[List[Location]], None]] = None,
+    ):
+        self.app = app
+        self.repository = repository
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_persisted = on_persisted
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = threading.Event()
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+        self.batches = 0
+
+    def submit(self, locations_data: List[Dict[str, Any]]) -> int:
+        """Queue rows for insertion; returns how many were accepted."""
+        self._ensure_started()
+        accepted = 0
+        for data in locations_data:
+            try:
+                self._queue.put_nowait(data)
+                accepted += 1
+            except queue.Full:
+                break
+
+        with self._lock:
+            self.enqueued += accepted
+            self.dropped += len(locations_data) - accepted
+        if accepted < len(locations_data):
+            logger.warning(
+                f"Location write queue full, dropped {len(locations_data) - accepted} rows"
+            )
+        return accepted
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread after flushing everything queued."""
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue and persistence counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "flushed": self.flushed,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="location-writer", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+            atexit.register(self.shutdown)
+
+    def _run(self) -> None:
+        while not (self._stopping.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Block for the first row, then gather more until size or deadline."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 and not self._stopping.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=max(remaining, 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        with self.app.app_context():
+            try:
+                saved = self.repository.bulk_create(batch)
+            except Exception as e:
+                db.session.rollback()
+                with self._lock:
+                    self.failed += len(batch)
+                logger.error(f"Failed to persist {len(batch)} locations: {str(e)}")
+                return
+
+        with self._lock:
+            self.flushed += len(saved)
+            self.batches += 1
+        logger.info(f"Persisted {len(saved)} of {len(batch)} queued locations")
+        if saved and self.on_persisted is not None:
+            self.on_persisted(saved)
@@ -1,39 +1,85 @@
 """Nominatim (OpenStreetMap) geocoding service - Free alternative to Google Maps."""
 
+import json
+import threading
+import time
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from app.utils.circuit_breaker import CircuitBreaker
 from app.utils.logging import setup_logger
+from app.utils.response_cache import SQLiteResponseCache
+from app.utils.rate_limiter import RateLimiter
 
 logger = setup_logger(__name__)
 
+# Upstream statuses worth another attempt; 429 means back off, not retry
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class GeocodingUnavailableError(Exception):
+    """Raised when the geocoding API cannot be called within our limits."""
+
 
 class NominatimService:
     """Free geocoding service using OpenStreetMap Nominatim."""
 
     def __init__(
-        self, country: str = "India", country_code: str = "in", result_limit: int = 10
+        self,
+        country: str = "India",
+        country_code: str = "in",
+        result_limit: int = 10,
+        response_cache: Optional[SQLiteResponseCache] = None,
+        empty_response_ttl: float = 300.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_wait: float = 2.0,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 3.0,
+        pool_size: int = 4,
+        max_retries: int = 2,
+        retry_backoff: float = 0.3,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
     ):
         self.base_url = "https://nominatim.openstreetmap.org"
         self.headers = {"User-Agent": "CeremoServices/1.0"}
         self.country = country
         self.country_code = country_code
         self.result_limit = result_limit
+        self.response_cache = response_cache
+        self.empty_response_ttl = empty_response_ttl
+        self.rate_limiter = rate_limiter
+        self.rate_limit_wait = rate_limit_wait
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.circuit_breaker = circuit_breaker
+        self._clock = clock
+        self._sleep = sleep
+        # Callers wait here, bounded by their deadline, instead of in the pool
+        self._connections = threading.BoundedSemaphore(pool_size)
+        self.session = self._create_session(pool_size)
 
-    def search_places(self, query: str) -> List[Dict[str, Any]]:
-        """Search places using Nominatim geocoding."""
-        try:
-            url = f"{self.base_url}/search"
-            params: Dict[str, Any] = {
-                "q": f"{query}, {self.country}",
-                "format": "json",
-                "addressdetails": 1,
-                "limit": self.result_limit,
-                "countrycodes": self.country_code,
-            }
+    def search_places(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search places using Nominatim geocoding.
 
-            response = requests.get(url, params=params, headers=self.headers, timeout=5)
-            response.raise_for_status()
-            results = response.json()
+        ``limit`` can lower, but not raise, the configured result limit.
+        ``timeout`` caps the whole call: the rate limit and connection pool
+        waits, every HTTP attempt and the backoff between retries. Raises
+        GeocodingUnavailableError when the circuit is open, the time budget
+        is spent, no rate limit slot or connection frees up in time, or
+        Nominatim times out or answers 5xx or 429, so callers can serve what
+        they have without caching a miss.
+        """
+        try:
+            result_limit = min(limit or self.result_limit, self.result_limit)
+            results = self._fetch_results(query, result_limit, timeout)
 
             logger.info(f"Nominatim API returned {len(results)} results")
 
@@ -46,13 +92,214 @@ class NominatimService:
             logger.info(f"Found {len(locations)} valid locations")
             return locations
 
+        except GeocodingUnavailableError:
+            raise
         except requests.RequestException as e:
+            if self._is_upstream_failure(e):
+                logger.warning(f"Nominatim API unavailable: {str(e)}")
+                raise GeocodingUnavailableError(f"Geocoding failed: {str(e)}") from e
             logger.error(f"Nominatim API request failed: {str(e)}")
             return []
         except Exception as e:
             logger.error(f"Error processing Nominatim response: {str(e)}")
             return []
 
+    def _create_session(self, pool_size: int) -> requests.Session:
+        """Create a keep-alive session with a bounded pool.
+
+        Retries are done by ``_get_with_retries`` so they fit the caller's
+        deadline; urllib3's own would multiply it.
+        """
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            max_retries=0,
+        )
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount("https://", adapter)
+        return session
+
+    def _fetch_results(
+        self, query: str, result_limit: int, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Return raw Nominatim results, from the response cache when possible."""
+        cache_key = json.dumps([query, self.country_code, result_limit])
+        if self.response_cache is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Nominatim response cache hit for: {query}")
+                return list(json.loads(cached))
+
+        deadline = self._acquire(query, timeout)
+
+        url = f"{self.base_url}/search"
+        params: Dict[str, Any] = {
+            "q": f"{query}, {self.country}",
+            "format": "json",
+            "addressdetails": 1,
+            "limit": result_limit,
+            "countrycodes": self.country_code,
+        }
+        results = self._request(url, params, deadline)
+
+        if self.response_cache is not None:
+            if results:
+                self.response_cache.set(cache_key, json.dumps(results))
+            elif self.empty_response_ttl > 0:
+                # A place Nominatim does not know yet may be added any day
+                self.response_cache.set(
+                    cache_key, json.dumps(results), self.empty_response_ttl
+                )
+        return results
+
+    def _acquire(self, query: str, timeout: Optional[float]) -> Optional[float]:
+        """Pass the circuit breaker and rate limiter; returns the call deadline."""
+        if timeout is not None and timeout <= 0:
+            raise GeocodingUnavailableError("Geocoding time budget exhausted")
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            logger.warning(f"Nominatim circuit open, skipping: {query}")
+            raise GeocodingUnavailableError("Geocoding circuit open")
+
+        deadline = None if timeout is None else self._clock() + timeout
+        wait = (
+            self.rate_limit_wait
+            if timeout is None
+            else min(self.rate_limit_wait, timeout)
+        )
+        if self.rate_limiter is not None and not self.rate_limiter.acquire(wait):
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release()
+            logger.warning(f"Nominatim rate limit reached, skipping: {query}")
+            raise GeocodingUnavailableError("Geocoding rate limit reached")
+        return deadline
+
+    def _request(
+        self, url: str, params: Dict[str, Any], deadline: Optional[float]
+    ) -> List[Dict[str, Any]]:
+        """GET from Nominatim, reporting the outcome to the circuit breaker."""
+        started = self._clock()
+        try:
+            results = self._get_with_retries(url, params, deadline)
+        except GeocodingUnavailableError as e:
+            if isinstance(e.__cause__, requests.RequestException):
+                # Nominatim did fail; only the retry after it was cut short
+                self._record_outcome(started, e.__cause__)
+            elif self.circuit_breaker is not None:
+                # Our own limits ran out; says nothing about Nominatim's health
+                self.circuit_breaker.release()
+            raise
+        except Exception as e:
+            self._record_outcome(started, e)
+            raise
+        self._record_outcome(started)
+        return results
+
+    def _get_with_retries(
+        self, url: str, params: Dict[str, Any], deadline: Optional[float]
+    ) -> List[Dict[str, Any]]:
+        """Retry transient failures while the deadline leaves room for them.
+
+        Every retry is another request under the usage policy, so it takes
+        its own rate limit slot first.
+        """
+        attempt = 0
+        error: Optional[requests.RequestException] = None
+        while True:
+            try:
+                return self._get(url, params, deadline)
+            except requests.RequestException as e:
+                delay = self.retry_backoff * 2**attempt
+                if not self._can_retry(e, attempt, delay, deadline):
+                    raise
+                logger.info(f"Retrying Nominatim request in {delay:.2f}s: {str(e)}")
+                self._sleep(delay)
+                attempt += 1
+                error = e
+                self._acquire_retry_slot(deadline, e)
+            except GeocodingUnavailableError as e:
+                if error is None:
+                    raise
+                # The budget ran out between attempts, after a real failure
+                raise e from error
+
+    def _acquire_retry_slot(
+        self, deadline: Optional[float], error: requests.RequestException
+    ) -> None:
+        if self.rate_limiter is None:
+            return
+        wait = self.rate_limit_wait
+        if deadline is not None:
+            wait = max(min(wait, deadline - self._clock()), 0.0)
+        if not self.rate_limiter.acquire(wait):
+            logger.warning("Nominatim rate limit reached, not retrying")
+            raise GeocodingUnavailableError(
+                "Geocoding rate limit reached before retry"
+            ) from error
+
+    def _can_retry(
+        self,
+        error: requests.RequestException,
+        attempt: int,
+        delay: float,
+        deadline: Optional[float],
+    ) -> bool:
+        if attempt >= self.max_retries or not self._is_transient(error):
+            return False
+        return deadline is None or self._clock() + delay < deadline
+
+    def _get(
+        self, url: str, params: Dict[str, Any], deadline: Optional[float]
+    ) -> List[Dict[str, Any]]:
+        """One GET, waiting for a free pooled connection until the deadline."""
+        wait = None if deadline is None else max(deadline - self._clock(), 0.0)
+        if not self._connections.acquire(timeout=wait):
+            raise GeocodingUnavailableError("No geocoding connection free in time")
+        try:
+            timeout = self._request_timeout(deadline)
+            response = self.session.get(url, params=params, timeout=timeout)
+        finally:
+            self._connections.release()
+        response.raise_for_status()
+        return list(response.json())
+
+    def _record_outcome(
+        self, started: float, error: Optional[Exception] = None
+    ) -> None:
+        if self.circuit_breaker is None:
+            return
+        if error is not None and self._is_upstream_failure(error):
+            self.circuit_breaker.record_failure()
+        else:
+            # A fast 4xx still shows the upstream is responsive
+            self.circuit_breaker.record_success(self._clock() - started)
+
+    def _request_timeout(self, deadline: Optional[float]) -> Tuple[float, float]:
+        """Connect and read timeouts, shortened to fit the remaining budget."""
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - self._clock()
+        if remaining <= 0:
+            raise GeocodingUnavailableError("Geocoding time budget exhausted")
+        connect_timeout, read_timeout = self.timeout
+        return (min(connect_timeout, remaining), min(read_timeout, remaining))
+
+    @staticmethod
+    def _is_transient(error: requests.RequestException) -> bool:
+        """Failures that another attempt may not hit."""
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in RETRY_STATUSES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    @staticmethod
+    def _is_upstream_failure(error: Exception) -> bool:
+        """Errors that say Nominatim is unhealthy, as opposed to a bad request."""
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            return status >= 500 or status == 429
+        return True
+
     def _parse_result(self, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse Nominatim result into location data."""
         try:
@@ -92,6 +339,8 @@ class NominatimService:
                 "state": state,
                 "district": district or city or town or village,
                 "area": place_name,
+                "latitude": self._coordinate(result.get("lat")),
+                "longitude": self._coordinate(result.get("lon")),
             }
 
             # Use placeholder pincode if not available
@@ -103,3 +352,11 @@ class NominatimService:
         except Exception as e:
             logger.error(f"Error parsing Nominatim result: {str(e)}")
             return None
+
+    @staticmethod
+    def _coordinate(value: Any) -> Optional[float]:
+        """Nominatim returns coordinates as strings; None if absent or invalid."""
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
@@ -1,13 +1,16 @@
 """Partner Profile service."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.repositories.location_repository import LocationRepository
 from app.repositories.partner_profile_repository import PartnerProfileRepository
 from app.repositories.rental_partner_repository import RentalPartnerRepository
 from app.contracts.partner_profile_contracts import (
     PartnerProfileResponse,
     PartnerProfileData,
+    DiscoverPartnersResponse,
+    DiscoveredPartnerData,
 )
-from app.utils.errors import NotFoundError
+from app.utils.errors import NotFoundError, ValidationError
 from app.models.rental_partner import RentalPartner
 
 
@@ -18,9 +21,11 @@ class PartnerProfileService:
         self,
         repository: PartnerProfileRepository,
         partner_repository: RentalPartnerRepository,
+        location_repository: Optional[LocationRepository] = None,
     ):
         self.repository = repository
         self.partner_repository = partner_repository
+        self.location_repository = location_repository
 
     def _create_empty_profile_data(self, partner: RentalPartner) -> PartnerProfileData:
         """Create empty profile data from partner."""
@@ -85,6 +90,13 @@ class PartnerProfileService:
             raise NotFoundError("Partner", partner_id)
 
         profile = self.repository.get_by_partner_id(partner_id)
+        # Discovery is keyed by pincode, so a new one must be a real pincode
+        if (
+            self.location_repository is not None
+            and (profile is None or profile.pincode != data["pincode"])
+            and not self.location_repository.is_valid_pincode(data["pincode"])
+        ):
+            raise ValidationError("Unknown pincode", "pincode")
 
         if profile:
             updated_profile = self.repository.update(
@@ -143,3 +155,27 @@ class PartnerProfileService:
         return PartnerProfileResponse(
             message="Profile updated successfully", data=response_data
         )
+
+    def discover_partners(
+        self, pincode: str, limit: int = 20
+    ) -> DiscoverPartnersResponse:
+        """Find partners that serve a pincode."""
+        matches = self.repository.find_covering_partners(pincode, limit)
+        data = [
+            DiscoveredPartnerData(
+                partnerId=profile.partner_id,
+                businessName=profile.business_name,
+                city=profile.city,
+                state=profile.state,
+                pincode=profile.pincode,
+                businessType=profile.business_type,
+                categories=profile.categories,
+                serviceAreas=profile.service_areas,
+                deliveryRadius=profile.delivery_radius,
+                distanceKm=round(distance, 3) if distance is not None else None,
+            )
+            for profile, distance in matches
+        ]
+        if data:
+            return DiscoverPartnersResponse(message="Partners found", data=data)
+        return DiscoverPartnersResponse(message="No partners found", data=[])
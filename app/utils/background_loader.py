@@ -0,0 +1,89 @@
+"""Build in-memory indexes on a background thread."""
+
+import os
+import threading
+import time
+from typing import Callable, Optional
+from flask import Flask
+from app.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BackgroundLoader:
+    """Run a slow one-off load on a daemon thread instead of in a request.
+
+    ``ensure_running(load)`` starts ``load`` inside an app context unless it
+    has already finished or is running in this process. The thread is
+    started on first use, so it runs in each gunicorn worker after the fork;
+    a load that was in flight when the process forked is restarted in the
+    child, and a failed one is retried after ``retry_interval`` seconds.
+    Callers keep serving from their fallback until ``load`` has flipped
+    their own "loaded" flag.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        name: str,
+        retry_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.app = app
+        self.name = name
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._done = False
+        self._failed_at: Optional[float] = None
+        self.attempts = 0
+
+    def ensure_running(self, load: Callable[[], None]) -> None:
+        """Start the load in this process unless it is running or done."""
+        with self._lock:
+            if self._done or self._running():
+                return
+            if (
+                self._failed_at is not None
+                and self._clock() - self._failed_at < self.retry_interval
+            ):
+                return
+
+            self._failed_at = None
+            self.attempts += 1
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, args=(load,), name=f"load-{self.name}", daemon=True
+            )
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the current load ends; True if it succeeded."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self._done
+
+    def _running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._pid == os.getpid()
+            and self._thread.is_alive()
+        )
+
+    def _run(self, load: Callable[[], None]) -> None:
+        started = self._clock()
+        try:
+            with self.app.app_context():
+                load()
+        except Exception as e:
+            with self._lock:
+                self._failed_at = self._clock()
+            logger.error(f"Loading {self.name} failed: {str(e)}")
+            return
+
+        with self._lock:
+            self._done = True
+        logger.info(f"Loaded {self.name} in {self._clock() - started:.1f}s")
@@ -0,0 +1,113 @@
+"""Circuit breaker for calls to an unreliable upstream."""
+
+import threading
+import time
+from typing import Callable, Dict, Union
+from app.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling an upstream after repeated failures or slow responses.
+
+    ``failure_threshold`` consecutive failures open the circuit; a call that
+    succeeds but takes ``slow_call_seconds`` or longer counts as a failure,
+    so a brownout trips the breaker as well as an outage. While open every
+    call is refused. After ``cooldown`` seconds one probe is let through
+    (half-open): a fast success closes the circuit, anything else reopens it
+    for another cooldown.
+
+    Callers ask ``allow()`` before calling, then report the outcome with
+    ``record_success(duration)`` or ``record_failure()``; a permitted call
+    that is never made must be handed back with ``release()``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_seconds: float = 2.0,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.slow_call_seconds = slow_call_seconds
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now."""
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.cooldown:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("Circuit half-open, probing upstream")
+
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        """Report a completed call and how long it took."""
+        if duration >= self.slow_call_seconds:
+            logger.warning(f"Slow upstream call: {duration:.2f}s")
+            self.record_failure()
+            return
+
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit closed, upstream recovered")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Report a failed call."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened += 1
+                    logger.warning(
+                        f"Circuit open after {self._failures} failures, "
+                        f"refusing calls for {self.cooldown:.0f}s"
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Hand back a permitted call that was never made."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        """Return the current state and trip counters."""
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
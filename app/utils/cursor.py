@@ -0,0 +1,25 @@
+"""Opaque pagination cursors."""
+
+import base64
+import binascii
+import json
+from typing import Any, List
+from app.utils.errors import ValidationError
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Pack keyset values into a URL-safe token."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    """Unpack a token made by ``encode_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValidationError("Invalid cursor", "cursor")
+    if not isinstance(values, list) or not values:
+        raise ValidationError("Invalid cursor", "cursor")
+    return values
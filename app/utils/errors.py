@@ -49,6 +49,11 @@ class ForbiddenError(AppError):
         super().__init__(message, 403)
 
 
+class ServiceUnavailableError(AppError):
+    def __init__(self, message: str = "Service temporarily unavailable"):
+        super().__init__(message, 503)
+
+
 def error_response(error: AppError) -> Tuple[Response, int]:
     response: Dict[str, Any] = {
         "success": False,
@@ -76,6 +81,7 @@ def handle_controller_errors(func: Callable[..., Any]) -> Callable[..., Any]:
             ConflictError,
             UnauthorizedError,
             ForbiddenError,
+            ServiceUnavailableError,
         ):
             raise
         except IntegrityError as e:
@@ -131,6 +137,12 @@ def register_error_handlers(app: Flask) -> None:
     def handle_forbidden_error(error: ForbiddenError) -> Tuple[Response, int]:
         return error_response(error)
 
+    @app.errorhandler(ServiceUnavailableError)
+    def handle_service_unavailable_error(
+        error: ServiceUnavailableError,
+    ) -> Tuple[Response, int]:
+        return error_response(error)
+
     @app.errorhandler(404)
     def handle_404(e: Any) -> Tuple[Response, int]:
         return jsonify({"error": {"message": "Resource not found"}}), 404
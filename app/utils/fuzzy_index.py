@@ -0,0 +1,198 @@
+"""Typo-tolerant location lookup using a SymSpell deletion index."""
+
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.utils.location_search_index import IndexedLocation
+from app.utils.text_normalization import normalize_name
+
+# Words shorter than this are only indexed as part of a full name
+MIN_WORD_LENGTH = 4
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Damerau-Levenshtein (optimal string alignment) distance, or None if above max."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return None
+        previous_previous, previous = previous, current
+
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """Every string reachable from term by removing up to max_distance characters."""
+    variants = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        # One more deletion from each variant found so far, by slicing
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+class FuzzyLocationIndex:
+    """Edit-distance search over normalized area, city and district names.
+
+    Each indexed term (full names plus their longer words) is expanded into
+    every variant with up to ``max_distance`` characters deleted from its
+    first ``prefix_length`` characters. A query is expanded the same way;
+    terms sharing a variant are the only candidates, and each is verified
+    with a bounded edit distance. Lookup cost therefore depends on the query
+    length, not on how many locations are indexed.
+    """
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._entries: List[IndexedLocation] = []
+        self._keys: Set[Tuple[str, str, str]] = set()
+        self._terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._term_postings: List["array[int]"] = []
+        self._deletes: Dict[str, "array[int]"] = {}
+        # Rows added while a load runs; None when no load is running
+        self._pending: Optional[List[IndexedLocation]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, locations: Iterable[IndexedLocation]) -> int:
+        """Index new locations, skipping (pincode, city, area) already held.
+
+        While ``load`` runs the rows are queued instead, and merged once the
+        loaded index is swapped in; the count returned is then the queued one.
+        """
+        with self._lock:
+            if self._pending is not None:
+                queued = list(locations)
+                self._pending.extend(queued)
+                return len(queued)
+            return self._add_locations(locations)
+
+    def load(self, locations: Iterable[IndexedLocation]) -> int:
+        """Build the index from a full scan, then swap it in.
+
+        The scan is indexed into a fresh structure without holding the lock,
+        so ``add`` and ``search`` never wait for it; ``search`` keeps
+        answering from the current entries until the swap.
+        """
+        with self._lock:
+            self._pending = list(self._entries)
+        fresh = FuzzyLocationIndex(self.max_distance, self.prefix_length)
+        try:
+            loaded = fresh.add(locations)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._entries = fresh._entries
+            self._keys = fresh._keys
+            self._terms = fresh._terms
+            self._term_ids = fresh._term_ids
+            self._term_postings = fresh._term_postings
+            self._deletes = fresh._deletes
+            self._add_locations(pending)
+        return loaded
+
+    def search(self, query: str, limit: int = 20) -> List[IndexedLocation]:
+        """Return locations whose names are closest to the query, nearest first."""
+        needle = normalize_name(query)
+        allowed = self._allowed_distance(needle)
+
+        with self._lock:
+            matches: List[Tuple[int, int, int]] = []
+            candidates: Set[int] = set()
+            for variant in _deletes(needle[: self.prefix_length], allowed):
+                candidates.update(self._deletes.get(variant, ()))
+
+            for term_id in candidates:
+                distance = edit_distance(needle, self._terms[term_id], allowed)
+                if distance is not None:
+                    # Nearest first, then the most common spelling
+                    matches.append(
+                        (distance, -len(self._term_postings[term_id]), term_id)
+                    )
+            matches.sort()
+
+            results: List[IndexedLocation] = []
+            seen: Set[int] = set()
+            for _, _, term_id in matches:
+                for entry_id in self._term_postings[term_id]:
+                    if entry_id not in seen:
+                        seen.add(entry_id)
+                        results.append(self._entries[entry_id])
+                        if len(results) >= limit:
+                            return results
+            return results
+
+    def _allowed_distance(self, needle: str) -> int:
+        """Allow fewer edits on short queries so they don't match everything."""
+        if len(needle) < MIN_WORD_LENGTH:
+            return 0
+        if len(needle) < 8:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def _add_locations(self, locations: Iterable[IndexedLocation]) -> int:
+        added = 0
+        for location in locations:
+            key = (location.pincode, location.city, location.area)
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            self._add_entry(location)
+            added += 1
+        return added
+
+    def _add_entry(self, location: IndexedLocation) -> None:
+        entry_id = len(self._entries)
+        self._entries.append(location)
+
+        terms: Set[str] = set()
+        for name in (location.area, location.city, location.district):
+            normalized = normalize_name(name)
+            if not normalized:
+                continue
+            terms.add(normalized)
+            terms.update(w for w in normalized.split(" ") if len(w) >= MIN_WORD_LENGTH)
+
+        for term in terms:
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._add_term(term)
+            self._term_postings[term_id].append(entry_id)
+
+    def _add_term(self, term: str) -> int:
+        term_id = len(self._terms)
+        self._terms.append(term)
+        self._term_ids[term] = term_id
+        self._term_postings.append(array("I"))
+        for variant in _deletes(term[: self.prefix_length], self.max_distance):
+            # get() first: setdefault would build a throwaway array per variant
+            postings = self._deletes.get(variant)
+            if postings is None:
+                postings = self._deletes[variant] = array("I")
+            postings.append(term_id)
+        return term_id
@@ -0,0 +1,268 @@
+"""In-process search index for location autocomplete."""
+
+import threading
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from app.utils.text_normalization import normalize_name
+
+NGRAM_SIZE = 3
+
+# Up to this many new terms per add() are inserted in place; a bigger batch
+# is appended and the term list sorted once, so a bulk load stays n log n
+INSORT_LIMIT = 64
+
+# Ranking tiers, best first; a location belongs only to the best one it reaches
+EXACT = "exact"
+PREFIX = "prefix"
+SUBSTRING = "substring"
+SEARCH_TIERS = (EXACT, PREFIX, SUBSTRING)
+
+
+class IndexedLocation(NamedTuple):
+    """Location row as held by the search index."""
+
+    pincode: str
+    city: str
+    state: str
+    district: str
+    area: str
+
+
+def _ngrams(value: str) -> Set[str]:
+    return {value[i : i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}
+
+
+def _starts_word(text: str, needle: str) -> bool:
+    """Whether needle occurs at the start of a word (so an earlier tier has it)."""
+    position = text.find(needle)
+    while position != -1:
+        if position == 0 or text[position - 1] in " \x00":
+            return True
+        position = text.find(needle, position + 1)
+    return False
+
+
+class LocationSearchIndex:
+    """Prefix and n-gram index over area, city and district names.
+
+    Prefix lookups run against a sorted array of normalized terms (a flattened
+    trie: every term sharing a prefix sits in one contiguous run found by
+    binary search). Substring lookups use a trigram inverted index and verify
+    candidates from the rarest trigram's posting list.
+
+    Every word boundary of a name is a term, so the exact tier matches a
+    whole name or its trailing words ("road" for "MG Road"), the prefix tier
+    matches the start of any word and the substring tier matches the rest.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[IndexedLocation] = []
+        self._search_text: List[str] = []
+        self._keys: Set[Tuple[str, str, str]] = set()
+        self._terms: List[str] = []
+        self._term_postings: Dict[str, "array[int]"] = {}
+        self._pincodes: List[str] = []
+        self._pincode_postings: Dict[str, "array[int]"] = {}
+        self._ngram_postings: Dict[str, "array[int]"] = {}
+        # Rows added while a load runs; None when no load is running
+        self._pending: Optional[List[IndexedLocation]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, locations: Iterable[IndexedLocation]) -> int:
+        """Index new locations, skipping (pincode, city, area) already held.
+
+        While ``load`` runs the rows are queued instead, and merged once the
+        loaded index is swapped in; the count returned is then the queued one.
+        """
+        with self._lock:
+            if self._pending is not None:
+                queued = list(locations)
+                self._pending.extend(queued)
+                return len(queued)
+            return self._add_locations(locations)
+
+    def load(self, locations: Iterable[IndexedLocation]) -> int:
+        """Build the index from a full scan, then swap it in.
+
+        The scan is indexed into a fresh structure without holding the lock,
+        so ``add`` and lookups never wait for it.
+        """
+        with self._lock:
+            self._pending = list(self._entries)
+        fresh = LocationSearchIndex()
+        try:
+            loaded = fresh.add(locations)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._entries = fresh._entries
+            self._search_text = fresh._search_text
+            self._keys = fresh._keys
+            self._terms = fresh._terms
+            self._term_postings = fresh._term_postings
+            self._pincodes = fresh._pincodes
+            self._pincode_postings = fresh._pincode_postings
+            self._ngram_postings = fresh._ngram_postings
+            self._add_locations(pending)
+        return loaded
+
+    def search(self, query: str, limit: int = 20) -> List[IndexedLocation]:
+        """Return exact, then prefix, then substring matches for a query."""
+        results: List[IndexedLocation] = []
+        for tier in SEARCH_TIERS:
+            results.extend(self.search_tier(tier, query, limit - len(results)))
+            if len(results) >= limit:
+                break
+        return results
+
+    def search_tier(
+        self, tier: str, query: str, limit: int = 20, offset: int = 0
+    ) -> List[IndexedLocation]:
+        """Return one tier's matches, skipping the first ``offset`` of them."""
+        needle = normalize_name(query)
+        if not needle or limit <= 0:
+            return []
+
+        wanted = offset + limit
+        with self._lock:
+            exact = self._term_postings.get(needle, array("I"))
+            if tier == EXACT:
+                ids = list(exact[:wanted])
+            elif tier == PREFIX:
+                ids = []
+                self._collect_prefix(
+                    self._terms, self._term_postings, needle, ids, set(exact), wanted
+                )
+            elif tier == SUBSTRING:
+                ids = []
+                if len(needle) >= NGRAM_SIZE:
+                    self._collect_substring(needle, ids, wanted)
+            else:
+                raise ValueError(f"Unknown search tier: {tier}")
+
+            return [self._entries[i] for i in ids[offset:wanted]]
+
+    def find_by_pincode(self, pincode: str, limit: int = 20) -> List[IndexedLocation]:
+        """Return locations with exactly this pincode."""
+        with self._lock:
+            ids = self._pincode_postings.get(pincode, array("I"))
+            return [self._entries[i] for i in ids[:limit]]
+
+    def search_by_pincode_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> List[IndexedLocation]:
+        """Return locations whose pincode starts with the given digits."""
+        ids: List[int] = []
+        with self._lock:
+            self._collect_prefix(
+                self._pincodes, self._pincode_postings, prefix, ids, set(), limit
+            )
+            return [self._entries[i] for i in ids[:limit]]
+
+    def _add_locations(self, locations: Iterable[IndexedLocation]) -> int:
+        added = 0
+        new_terms: List[str] = []
+        new_pincodes: List[str] = []
+        for location in locations:
+            key = (location.pincode, location.city, location.area)
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            self._add_entry(location, new_terms, new_pincodes)
+            added += 1
+        self._merge_terms(self._terms, new_terms)
+        self._merge_terms(self._pincodes, new_pincodes)
+        return added
+
+    def _add_entry(
+        self,
+        location: IndexedLocation,
+        new_terms: List[str],
+        new_pincodes: List[str],
+    ) -> None:
+        entry_id = len(self._entries)
+        self._entries.append(location)
+
+        names = {
+            normalize_name(name)
+            for name in (location.area, location.city, location.district)
+            if name
+        }
+        self._search_text.append("\x00".join(sorted(names)))
+
+        terms: Set[str] = set()
+        for name in names:
+            words = name.split(" ")
+            # Index every word boundary so "road" finds "mg road" by prefix
+            terms.update(" ".join(words[i:]) for i in range(len(words)))
+        for term in terms:
+            self._post(new_terms, self._term_postings, term, entry_id)
+
+        self._post(new_pincodes, self._pincode_postings, location.pincode, entry_id)
+
+        for gram in set().union(*(_ngrams(name) for name in names)):
+            self._ngram_postings.setdefault(gram, array("I")).append(entry_id)
+
+    @staticmethod
+    def _post(
+        new_terms: List[str],
+        postings: Dict[str, "array[int]"],
+        term: str,
+        entry_id: int,
+    ) -> None:
+        if term not in postings:
+            postings[term] = array("I")
+            new_terms.append(term)
+        postings[term].append(entry_id)
+
+    @staticmethod
+    def _merge_terms(terms: List[str], new_terms: List[str]) -> None:
+        """Add an add() call's new terms to a sorted term list."""
+        if len(new_terms) <= INSORT_LIMIT:
+            for term in new_terms:
+                insort(terms, term)
+        else:
+            terms.extend(new_terms)
+            terms.sort()
+
+    @staticmethod
+    def _collect_prefix(
+        terms: List[str],
+        postings: Dict[str, "array[int]"],
+        prefix: str,
+        ids: List[int],
+        seen: Set[int],
+        limit: int,
+    ) -> None:
+        position = bisect_left(terms, prefix)
+        while position < len(terms) and terms[position].startswith(prefix):
+            for entry_id in postings[terms[position]]:
+                if entry_id not in seen:
+                    seen.add(entry_id)
+                    ids.append(entry_id)
+                    if len(ids) >= limit:
+                        return
+            position += 1
+
+    def _collect_substring(self, needle: str, ids: List[int], limit: int) -> None:
+        postings = []
+        for gram in _ngrams(needle):
+            posting = self._ngram_postings.get(gram)
+            if posting is None:
+                return
+            postings.append(posting)
+
+        for entry_id in min(postings, key=len):
+            text = self._search_text[entry_id]
+            if needle in text and not _starts_word(text, needle):
+                ids.append(entry_id)
+                if len(ids) >= limit:
+                    return
@@ -0,0 +1,181 @@
+"""In-process coverage index for partner discovery."""
+
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.utils.spatial_index import distance_km
+from app.utils.text_normalization import normalize_name
+
+KM_PER_DEGREE_LATITUDE = 111.195
+PINCODE_PATTERN = re.compile(r"^\d{6}$")
+_RADIUS_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_radius_km(value: Optional[str]) -> float:
+    """Read a delivery radius like "10", "10 km" or "7.5km"; 0 if unreadable."""
+    match = _RADIUS_PATTERN.search(value or "")
+    return float(match.group()) if match else 0.0
+
+
+class PartnerCoverageIndex:
+    """Answer "which partners serve this pincode" without scanning profiles.
+
+    ``service_areas`` entries that look like pincodes go into a pincode
+    inverted index, everything else into an area-name index keyed by the
+    normalized name; a partner always covers its own pincode. Partners with
+    a known location and a delivery radius are also kept in flat coordinate
+    arrays with a latitude-sorted list, so a radius lookup only measures the
+    partners inside the latitude band the largest radius could reach.
+    """
+
+    def __init__(self) -> None:
+        self._by_pincode: Dict[str, Set[str]] = {}
+        self._by_area: Dict[str, Set[str]] = {}
+        self._keys: Dict[str, Tuple[List[str], List[str]]] = {}
+        self._slots: Dict[str, int] = {}
+        self._slot_partners: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self._latitudes = array("d")
+        self._longitudes = array("d")
+        self._radii = array("d")
+        self._by_latitude: List[Tuple[float, int]] = []
+        self._max_radius = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def upsert(
+        self,
+        partner_id: str,
+        pincode: str,
+        service_areas: Iterable[str],
+        center: Optional[Tuple[float, float]],
+        radius_km: float,
+    ) -> None:
+        """Replace everything indexed for a partner."""
+        pincodes = {pincode} if pincode else set()
+        areas: Set[str] = set()
+        for area in service_areas:
+            value = area.strip()
+            if PINCODE_PATTERN.match(value):
+                pincodes.add(value)
+            elif normalize_name(value):
+                areas.add(normalize_name(value))
+
+        with self._lock:
+            self._remove(partner_id)
+            self._keys[partner_id] = (sorted(pincodes), sorted(areas))
+            for code in pincodes:
+                self._by_pincode.setdefault(code, set()).add(partner_id)
+            for name in areas:
+                self._by_area.setdefault(name, set()).add(partner_id)
+            if center is not None and radius_km > 0:
+                self._add_radius(partner_id, center, radius_km)
+
+    def remove(self, partner_id: str) -> None:
+        """Drop a partner from the index."""
+        with self._lock:
+            self._remove(partner_id)
+
+    def match(
+        self,
+        pincode: str,
+        area_names: Iterable[str],
+        center: Optional[Tuple[float, float]],
+    ) -> List[Tuple[str, Optional[float]]]:
+        """Return (partner id, distance km) for partners covering a pincode.
+
+        Partners naming the pincode or one of its areas come first, then
+        partners whose delivery radius reaches it, nearest first.
+        """
+        with self._lock:
+            explicit = set(self._by_pincode.get(pincode, ()))
+            for name in area_names:
+                explicit.update(self._by_area.get(normalize_name(name), ()))
+
+            distances: Dict[str, float] = {}
+            if center is not None:
+                distances = self._within_radius(center, explicit)
+
+        ranked: List[Tuple[str, Optional[float]]] = sorted(
+            ((partner_id, distances.get(partner_id)) for partner_id in explicit),
+            key=lambda item: (item[1] is None, item[1] or 0.0, item[0]),
+        )
+        ranked.extend(
+            sorted(
+                (
+                    (partner_id, distance)
+                    for partner_id, distance in distances.items()
+                    if partner_id not in explicit
+                ),
+                key=lambda item: (item[1], item[0]),
+            )
+        )
+        return ranked
+
+    def _within_radius(
+        self, center: Tuple[float, float], explicit: Set[str]
+    ) -> Dict[str, float]:
+        """Distances to partners that reach ``center`` or are listed in explicit."""
+        latitude, longitude = center
+        band = self._max_radius / KM_PER_DEGREE_LATITUDE
+        low = bisect_left(self._by_latitude, (latitude - band, -1))
+        high = bisect_right(self._by_latitude, (latitude + band, len(self._radii)))
+
+        distances: Dict[str, float] = {}
+        for _, slot in self._by_latitude[low:high]:
+            partner_id = self._slot_partners[slot]
+            if partner_id is None:
+                continue
+            distance = distance_km(
+                latitude, longitude, self._latitudes[slot], self._longitudes[slot]
+            )
+            if distance <= self._radii[slot] or partner_id in explicit:
+                distances[partner_id] = distance
+        return distances
+
+    def _add_radius(
+        self, partner_id: str, center: Tuple[float, float], radius_km: float
+    ) -> None:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._latitudes[slot], self._longitudes[slot] = center
+            self._radii[slot] = radius_km
+            self._slot_partners[slot] = partner_id
+        else:
+            slot = len(self._radii)
+            self._latitudes.append(center[0])
+            self._longitudes.append(center[1])
+            self._radii.append(radius_km)
+            self._slot_partners.append(partner_id)
+
+        self._slots[partner_id] = slot
+        insort(self._by_latitude, (center[0], slot))
+        self._max_radius = max(self._max_radius, radius_km)
+
+    def _remove(self, partner_id: str) -> None:
+        keys = self._keys.pop(partner_id, None)
+        if keys is not None:
+            pincodes, areas = keys
+            for code in pincodes:
+                self._discard(self._by_pincode, code, partner_id)
+            for name in areas:
+                self._discard(self._by_area, name, partner_id)
+
+        slot = self._slots.pop(partner_id, None)
+        if slot is not None:
+            position = bisect_left(self._by_latitude, (self._latitudes[slot], slot))
+            del self._by_latitude[position]
+            self._slot_partners[slot] = None
+            self._free_slots.append(slot)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], key: str, partner_id: str) -> None:
+        partners = postings.get(key)
+        if partners is not None:
+            partners.discard(partner_id)
+            if not partners:
+                del postings[key]
@@ -0,0 +1,159 @@
+"""Bounded process pool for bcrypt hashing and verification."""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.utils.errors import ServiceUnavailableError
+from app.utils.logging import setup_logger
+from app.utils.security import (
+    DEFAULT_BCRYPT_ROUNDS,
+    hash_password,
+    password_rounds,
+    verify_password,
+)
+
+logger = setup_logger(__name__)
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Run fn and return its result with the seconds it took."""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """Run bcrypt on a small process pool instead of the request thread.
+
+    Each bcrypt call burns ~250 ms of CPU. Sending it to ``workers``
+    processes caps how many cores sign-ins can take, and at most
+    ``max_pending`` operations may be queued or running at once: callers
+    beyond that, or whose operation does not finish within ``timeout``
+    seconds, get ServiceUnavailableError (503) straight away rather than
+    queueing behind the burst. With ``workers=0`` bcrypt runs inline.
+
+    The pool is started on first use with the spawn method, so it is
+    created inside each server worker and never forks a threaded process.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        timeout: float = 5.0,
+        rounds: int = DEFAULT_BCRYPT_ROUNDS,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.rounds = rounds
+        self._clock = clock
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_hash_time = 0.0
+        self.max_hash_time = 0.0
+
+    def hash(self, password: str) -> str:
+        """Hash a password with bcrypt at the configured cost."""
+        return str(self._run(hash_password, password, self.rounds))
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a bcrypt hash."""
+        return bool(self._run(verify_password, password, password_hash))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether a stored hash was made at a lower cost than configured.
+
+        Only upgrades: a hash made at a higher cost is kept, so workers that
+        disagree on the cost cannot rewrite the same hash back and forth.
+        """
+        rounds = password_rounds(password_hash)
+        return rounds is None or rounds < self.rounds
+
+    def stats(self) -> Dict[str, float]:
+        """Return pending depth, queue wait and hash time metrics."""
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "total_queue_wait_seconds": self.total_queue_wait,
+                "max_queue_wait_seconds": self.max_queue_wait,
+                "total_hash_seconds": self.total_hash_time,
+                "max_hash_seconds": self.max_hash_time,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            logger.warning("Password hashing queue full, rejecting request")
+            raise ServiceUnavailableError("Too many sign-in attempts, retry shortly")
+
+        with self._lock:
+            self._pending += 1
+        try:
+            started = self._clock()
+            result, hash_time = self._execute(fn, *args)
+            self._record(self._clock() - started - hash_time, hash_time)
+            return result
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def _execute(self, fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+        if self.workers <= 0:
+            return _timed(fn, *args)
+
+        future = self._get_executor().submit(_timed, fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            logger.warning(f"Password hashing took over {self.timeout}s, giving up")
+            raise ServiceUnavailableError("Sign-in is busy, retry shortly")
+        except BrokenProcessPool:
+            logger.error("Password hashing pool died, restarting it")
+            self.shutdown()
+            raise ServiceUnavailableError("Sign-in is busy, retry shortly")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _record(self, queue_wait: float, hash_time: float) -> None:
+        queue_wait = max(queue_wait, 0.0)
+        with self._lock:
+            self.completed += 1
+            self.total_queue_wait += queue_wait
+            self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+            self.total_hash_time += hash_time
+            self.max_hash_time = max(self.max_hash_time, hash_time)
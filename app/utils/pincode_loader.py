@@ -0,0 +1,243 @@
+"""Streaming COPY loader for the India Post pincode directory."""
+
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import time
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+from app.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+STAGING_TABLE = "locations_staging"
+COLUMNS = ["pincode", "city", "state", "district", "area", "latitude", "longitude"]
+
+# "Koramangala VI Bk S.O" -> "Koramangala VI Bk"
+_OFFICE_SUFFIX = re.compile(r"\s+(?:[BSH]\.?O|G\.?P\.?O|P\.?O)\.?$", re.IGNORECASE)
+
+
+def parse_row(row: Dict[str, str]) -> Optional[Tuple[str, ...]]:
+    """Map an India Post directory row to location columns, or None if unusable."""
+    fields = {key.strip().lower(): (value or "").strip() for key, value in row.items()}
+    pincode = fields.get("pincode", "")
+    office = _OFFICE_SUFFIX.sub("", fields.get("officename", ""))
+    district = fields.get("district", "") or fields.get("districtname", "")
+    state = fields.get("statename", "")
+
+    if not (pincode.isdigit() and len(pincode) == 6 and office and district and state):
+        return None
+    latitude = _coordinate(fields.get("latitude", ""), 90)
+    longitude = _coordinate(fields.get("longitude", ""), 180)
+    if not (latitude and longitude):
+        latitude = longitude = ""
+    return (pincode, district, state, district, office, latitude, longitude)
+
+
+def _coordinate(value: str, bound: float) -> str:
+    """Return a valid coordinate as text, or "" (NULL in COPY) for "NA" and junk."""
+    try:
+        number = float(value)
+    except ValueError:
+        return ""
+    return value if abs(number) <= bound else ""
+
+
+class PincodeLoader:
+    """Load the pincode directory into ``locations`` with COPY.
+
+    The source CSV (optionally gzipped) is parsed incrementally and copied
+    into an unlogged staging table in ``batch_size`` chunks, each committed
+    separately and recorded in a checkpoint file so an interrupted load
+    resumes where it stopped. Once staging is complete the rows are merged
+    into ``locations`` in one transaction. On the first load into an empty
+    table its secondary indexes are dropped and rebuilt after the insert; a
+    refresh of a live table merges with the indexes in place, so reads are
+    never locked out. Rows already present are left alone except that
+    missing coordinates are filled in from the directory.
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        batch_size: int = 10000,
+        checkpoint_path: Optional[str] = None,
+    ):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path
+
+    def load(self, source_path: str) -> int:
+        """Stage and publish the source file; returns rows inserted or backfilled."""
+        checkpoint = self._read_checkpoint(source_path)
+        self._ensure_staging()
+        if checkpoint is None:
+            checkpoint = self._new_checkpoint(source_path)
+            self._truncate_staging()
+        elif checkpoint["rows"]:
+            logger.info(f"Resuming pincode load after {checkpoint['rows']} rows")
+
+        started = time.monotonic()
+        processed = checkpoint["rows"]
+        for consumed, batch in self._batches(source_path, skip=processed):
+            self._copy(batch)
+            processed += consumed
+            checkpoint["rows"] = processed
+            self._write_checkpoint(checkpoint)
+            rate = (processed - checkpoint["start_rows"]) / max(
+                time.monotonic() - started, 1e-6
+            )
+            logger.info(f"Staged {processed} pincode rows ({rate:.0f} rows/s)")
+
+        inserted = self._publish()
+        self._remove_checkpoint()
+        logger.info(
+            f"Pincode load complete: {inserted} locations inserted or backfilled"
+        )
+        return inserted
+
+    def _batches(
+        self, source_path: str, skip: int
+    ) -> Iterator[Tuple[int, List[Tuple[str, ...]]]]:
+        """Yield (source rows consumed, parsed rows) per batch."""
+        with self._open(source_path) as source:
+            reader = csv.DictReader(source)
+            consumed = 0
+            batch: List[Tuple[str, ...]] = []
+            for position, row in enumerate(reader):
+                if position < skip:
+                    continue
+                consumed += 1
+                parsed = parse_row(row)
+                if parsed is not None:
+                    batch.append(parsed)
+                if consumed >= self.batch_size:
+                    yield consumed, batch
+                    consumed, batch = 0, []
+            if consumed:
+                yield consumed, batch
+
+    @staticmethod
+    def _open(source_path: str) -> IO[str]:
+        if source_path.endswith(".gz"):
+            return gzip.open(source_path, "rt", newline="", encoding="utf-8-sig")
+        return open(source_path, newline="", encoding="utf-8-sig")
+
+    def _ensure_staging(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE UNLOGGED TABLE IF NOT EXISTS {STAGING_TABLE} ("
+                "pincode VARCHAR(10) NOT NULL, city VARCHAR(100) NOT NULL, "
+                "state VARCHAR(100) NOT NULL, district VARCHAR(100) NOT NULL, "
+                "area VARCHAR(255) NOT NULL, "
+                "latitude DOUBLE PRECISION, longitude DOUBLE PRECISION)"
+            )
+        self.connection.commit()
+
+    def _truncate_staging(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+        self.connection.commit()
+
+    def _copy(self, rows: List[Tuple[str, ...]]) -> None:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({', '.join(COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        self.connection.commit()
+
+    def _publish(self) -> int:
+        """Merge staging into locations, building indexes afterwards if empty."""
+        columns = ", ".join(COLUMNS)
+        with self.connection.cursor() as cursor:
+            # Dropping indexes takes an ACCESS EXCLUSIVE lock until commit;
+            # only worth it when there is nothing to read yet
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM locations)")
+            indexes = [] if cursor.fetchone()[0] else self._drop_indexes(cursor)
+
+            # Rows staged twice by a resumed batch collapse in DISTINCT ON;
+            # existing rows only gain coordinates they were missing
+            cursor.execute(  # nosec B608
+                f"INSERT INTO locations (id, {columns}) "
+                f"SELECT DISTINCT ON (pincode, city, area) "
+                f"gen_random_uuid()::text, {columns} FROM {STAGING_TABLE} "
+                "ORDER BY pincode, city, area, latitude NULLS LAST "
+                "ON CONFLICT ON CONSTRAINT uq_locations_pincode_city_area "
+                "DO UPDATE SET latitude = EXCLUDED.latitude, "
+                "longitude = EXCLUDED.longitude "
+                "WHERE locations.latitude IS NULL AND EXCLUDED.latitude IS NOT NULL"
+            )
+            inserted = int(cursor.rowcount)
+
+            for name, definition in indexes:
+                logger.info(f"Rebuilding index {name}")
+                cursor.execute(definition)
+            cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        self.connection.commit()
+
+        with self.connection.cursor() as cursor:
+            cursor.execute("ANALYZE locations")
+        self.connection.commit()
+        return inserted
+
+    @staticmethod
+    def _drop_indexes(cursor: Any) -> List[Tuple[str, str]]:
+        """Drop the non-constraint indexes on locations; returns their DDL."""
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = 'locations' AND indexname NOT IN ("
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = 'locations'::regclass)"
+        )
+        indexes: List[Tuple[str, str]] = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+        return indexes
+
+    def _new_checkpoint(self, source_path: str) -> Dict[str, Any]:
+        stat = os.stat(source_path)
+        return {
+            "source": os.path.abspath(source_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "rows": 0,
+            "start_rows": 0,
+        }
+
+    def _read_checkpoint(self, source_path: str) -> Optional[Dict[str, Any]]:
+        """Return the checkpoint if it belongs to this exact source file."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            checkpoint: Dict[str, Any] = json.load(f)
+
+        current = self._new_checkpoint(source_path)
+        if any(
+            checkpoint.get(key) != current[key] for key in ("source", "size", "mtime")
+        ):
+            logger.info("Pincode source changed since last checkpoint, starting over")
+            return None
+        checkpoint["start_rows"] = checkpoint["rows"]
+        return checkpoint
+
+    def _write_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, self.checkpoint_path)
+
+    def _remove_checkpoint(self) -> None:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
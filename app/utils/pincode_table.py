@@ -0,0 +1,146 @@
+"""Memory-mapped, dictionary-encoded pincode lookup table."""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple, Union
+from app.utils.location_search_index import IndexedLocation
+
+MAGIC = b"PINTBL01"
+# magic, record count, string count
+_HEADER = struct.Struct("<8sII")
+PINCODE_DIGITS = 6
+_FIELDS = 4  # state, district, city, area
+
+
+class PincodeTable:
+    """Read-only pincode table backed by a prebuilt file.
+
+    Layout after the header (all uint32, native order)::
+
+        pincodes[records]            sorted numeric pincodes
+        fields[records * 4]          state/district/city/area string ids
+        string_offsets[strings + 1]  byte offsets into the string blob
+        string blob                  UTF-8, concatenated
+
+    The file is memory-mapped, so workers forked after it is opened share
+    the same physical pages and nothing is materialized per row.
+    """
+
+    def __init__(self, buffer: Union[mmap.mmap, bytes]):
+        magic, records, strings = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a pincode table file")
+
+        view = memoryview(buffer)
+        offset = _HEADER.size
+        self._pincodes = view[offset : offset + records * 4].cast("I")
+        offset += records * 4
+        self._fields = view[offset : offset + records * 4 * _FIELDS].cast("I")
+        offset += records * 4 * _FIELDS
+        self._string_offsets = view[offset : offset + (strings + 1) * 4].cast("I")
+        offset += (strings + 1) * 4
+        self._blob = view[offset:]
+        self._buffer = buffer
+
+    @classmethod
+    def open(cls, path: str) -> "PincodeTable":
+        """Memory-map a table file built with ``build``."""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def build(path: str, locations: Iterable[IndexedLocation]) -> int:
+        """Write a table file from location rows; returns records written."""
+        strings: Dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            if value not in strings:
+                strings[value] = len(strings)
+            return strings[value]
+
+        records: List[Tuple[int, int, int, int, int]] = []
+        for location in locations:
+            if not (
+                location.pincode.isdigit() and len(location.pincode) == PINCODE_DIGITS
+            ):
+                continue
+            records.append(
+                (
+                    int(location.pincode),
+                    intern(location.state),
+                    intern(location.district),
+                    intern(location.city),
+                    intern(location.area),
+                )
+            )
+        records.sort()
+
+        blob = bytearray()
+        string_offsets = array("I", [0])
+        for value in strings:
+            blob += value.encode()
+            string_offsets.append(len(blob))
+
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(records), len(strings)))
+            f.write(array("I", (r[0] for r in records)).tobytes())
+            f.write(array("I", (v for r in records for v in r[1:])).tobytes())
+            f.write(string_offsets.tobytes())
+            f.write(blob)
+        os.replace(temporary, path)
+        return len(records)
+
+    def __len__(self) -> int:
+        return len(self._pincodes)
+
+    def is_valid_pincode(self, pincode: str) -> bool:
+        """Return True if the pincode exists in the table."""
+        if not (pincode.isdigit() and len(pincode) == PINCODE_DIGITS):
+            return False
+        number = int(pincode)
+        position = bisect_left(self._pincodes, number)
+        return position < len(self._pincodes) and self._pincodes[position] == number
+
+    def find_by_pincode(self, pincode: str, limit: int = 20) -> List[IndexedLocation]:
+        """Return locations with exactly this pincode."""
+        if not (pincode.isdigit() and len(pincode) == PINCODE_DIGITS):
+            return []
+        number = int(pincode)
+        return self._range(number, number + 1, limit)
+
+    def search_by_pincode_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> List[IndexedLocation]:
+        """Return locations whose pincode starts with the given digits."""
+        if not prefix.isdigit() or len(prefix) > PINCODE_DIGITS:
+            return []
+        scale = 10 ** (PINCODE_DIGITS - len(prefix))
+        low = int(prefix) * scale
+        return self._range(low, low + scale, limit)
+
+    def _range(self, low: int, high: int, limit: int) -> List[IndexedLocation]:
+        start = bisect_left(self._pincodes, low)
+        end = min(bisect_left(self._pincodes, high), start + limit)
+        return [self._record(i) for i in range(start, end)]
+
+    def _record(self, position: int) -> IndexedLocation:
+        base = position * _FIELDS
+        state, district, city, area = (
+            self._string(self._fields[base + i]) for i in range(_FIELDS)
+        )
+        return IndexedLocation(
+            pincode=f"{self._pincodes[position]:06d}",
+            city=city,
+            state=state,
+            district=district,
+            area=area,
+        )
+
+    def _string(self, string_id: int) -> str:
+        start = self._string_offsets[string_id]
+        end = self._string_offsets[string_id + 1]
+        return bytes(self._blob[start:end]).decode()
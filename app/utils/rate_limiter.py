@@ -0,0 +1,130 @@
+"""Token bucket rate limiter shared across threads and processes."""
+
+import fcntl
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+_STATE_FORMAT = "d"
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+
+class RateLimiter:
+    """Token bucket with a bounded wait queue and a per-call deadline.
+
+    Implemented as GCRA: the bucket is a single "theoretical arrival time"
+    that every granted call pushes forward by ``1 / rate``. When
+    ``state_path`` is set that timestamp lives in a small file guarded by
+    ``flock``, so every worker on the host draws from one bucket.
+
+    Callers that would have to wait longer than their deadline, or that find
+    ``max_queue`` threads already waiting in this process, are rejected
+    immediately instead of queueing.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        max_queue: int = 10,
+        state_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.interval = 1.0 / rate
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self.max_queue = max_queue
+        self.state_path = state_path
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._arrival = 0.0
+        self._waiting = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+
+    def acquire(self, timeout: float) -> bool:
+        """Wait for a slot for at most ``timeout`` seconds; False if none."""
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+            self._waiting += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._waiting)
+
+        try:
+            wait = self._reserve(timeout)
+            if wait is None:
+                with self._lock:
+                    self.rejected += 1
+                return False
+
+            if wait > 0:
+                self._sleep(wait)
+            with self._lock:
+                self.acquired += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return True
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth and wait time metrics."""
+        with self._lock:
+            return {
+                "queue_depth": self._waiting,
+                "max_queue_depth": self.max_queue_depth,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "total_wait_seconds": self.total_wait,
+                "max_wait_seconds": self.max_wait,
+            }
+
+    def _reserve(self, timeout: float) -> Optional[float]:
+        """Claim the next slot and return how long to wait for it."""
+        with self._lock, self._shared_state() as state:
+            now = self._clock()
+            arrival = max(state.value, now)
+            wait = max(0.0, arrival - self.tolerance - now)
+            if wait > timeout:
+                return None
+            state.value = arrival + self.interval
+            return wait
+
+    @contextmanager
+    def _shared_state(self) -> Iterator["_State"]:
+        if not self.state_path:
+            state = _State(self._arrival)
+            yield state
+            self._arrival = state.value
+            return
+
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, _STATE_SIZE, 0)
+            stored = (
+                struct.unpack(_STATE_FORMAT, raw)[0] if len(raw) == _STATE_SIZE else 0.0
+            )
+            state = _State(stored)
+            yield state
+            if state.value != stored:
+                os.pwrite(fd, struct.pack(_STATE_FORMAT, state.value), 0)
+        finally:
+            os.close(fd)
+
+
+class _State:
+    def __init__(self, value: float):
+        self.value = value
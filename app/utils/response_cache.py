@@ -0,0 +1,100 @@
+"""File-backed response cache shared between worker processes."""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+from app.utils.logging import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class SQLiteResponseCache:
+    """Persistent key/value cache with a TTL and a bounded entry count.
+
+    Backed by a single SQLite file in WAL mode, so every gunicorn worker on
+    the host reads and writes the same cache and it survives restarts.
+    Storage errors are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._local = threading.local()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if absent or expired."""
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, self._clock()),
+            ).fetchone()
+            return None if row is None else str(row[0])
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed: {str(e)}")
+            return None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value and evict the oldest entries beyond max_entries.
+
+        ``ttl`` overrides the cache's default lifetime for this entry.
+        """
+        now = self._clock()
+        lifetime = self.ttl if ttl is None else ttl
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, value, now + lifetime),
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE expires_at <= ?", (now,)
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY expires_at "
+                    "LIMIT max(0, (SELECT COUNT(*) FROM responses) - ?))",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {str(e)}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open one connection per thread, reopening after a fork."""
+        connection: Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_expires_at "
+                "ON responses (expires_at)"
+            )
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
@@ -0,0 +1,208 @@
+"""Per-worker cache of revoked tokens."""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from app.repositories.blacklisted_token_repository import BlacklistedTokenRepository
+from app.utils.logging import setup_logger
+from app.utils.security import token_hash
+
+logger = setup_logger(__name__)
+
+# Another worker can commit a row whose blacklisted_at is older than rows
+# already seen; each poll looks this far behind the newest one
+SYNC_OVERLAP = timedelta(seconds=10)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over digest keys.
+
+    Sized for ``capacity`` keys at a false positive rate of ``error_rate``.
+    Keys must already be uniformly distributed (e.g. SHA-256 digests): the
+    bit positions are taken straight from their first 16 bytes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.size = max(
+            math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self.hash_count = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: bytes) -> bool:
+        """Add a key; False if it was (probably) already present."""
+        added = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def _positions(self, key: bytes) -> List[int]:
+        first = int.from_bytes(key[:8], "big")
+        step = int.from_bytes(key[8:16], "big") | 1
+        return [(first + i * step) % self.size for i in range(self.hash_count)]
+
+
+class RevocationCache:
+    """Answer "is this token revoked" without a query on the common path.
+
+    Every unexpired token hash in blacklisted_tokens is added to a Bloom
+    filter, so a token the filter has never seen is not revoked and costs no
+    database round trip. A filter hit (a revoked token, or about
+    ``error_rate`` of the others) is checked against the database once and
+    the answer kept in a small exact map of the last ``max_confirmed`` tokens.
+
+    Every ``refresh_interval`` seconds the cache polls for rows revoked since
+    the newest it has seen, so a sign-out on another worker takes effect
+    within that interval; tokens revoked by this worker are added straight
+    away. Once more tokens have been added than the filter was sized for, it
+    is rebuilt from the table, which also drops expired tokens.
+    """
+
+    def __init__(
+        self,
+        repository: BlacklistedTokenRepository,
+        refresh_interval: float = 5.0,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        max_confirmed: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.repository = repository
+        self.refresh_interval = refresh_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_confirmed = max_confirmed
+        self._clock = clock
+        self._filter = BloomFilter(capacity, error_rate)
+        self._confirmed: "OrderedDict[bytes, bool]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._loaded = False
+        self._synced_at = 0.0
+        self._high_water: Optional[datetime] = None
+        self.filter_hits = 0
+        self.database_checks = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+
+    def is_revoked(self, token: str) -> bool:
+        """Whether a token has been revoked."""
+        self._sync()
+        digest = token_hash(token)
+        with self._lock:
+            if digest not in self._filter:
+                return False
+            self.filter_hits += 1
+            confirmed = self._confirmed.get(digest)
+            if confirmed is not None:
+                self._confirmed.move_to_end(digest)
+                return confirmed
+            generation = self._generation
+
+        revoked = self.repository.is_blacklisted(token)
+        with self._lock:
+            self.database_checks += 1
+            if not revoked:
+                self.false_positives += 1
+            # A poll that landed meanwhile may have revoked it after our query
+            if revoked or generation == self._generation:
+                self._remember(digest, revoked)
+        return revoked
+
+    def add(self, token: str) -> None:
+        """Record a token this worker has just revoked."""
+        digest = token_hash(token)
+        with self._lock:
+            self._filter.add(digest)
+            self._remember(digest, True)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Return filter size and how often lookups reached the database."""
+        with self._lock:
+            return {
+                "entries": self._filter.count,
+                "capacity": self._filter.capacity,
+                "confirmed": len(self._confirmed),
+                "filter_hits": self.filter_hits,
+                "database_checks": self.database_checks,
+                "false_positives": self.false_positives,
+                "rebuilds": self.rebuilds,
+            }
+
+    def _sync(self) -> None:
+        """Load the filter once, then poll for tokens revoked by other workers."""
+        if self._loaded and self._clock() - self._synced_at < self.refresh_interval:
+            return
+
+        with self._sync_lock:
+            if self._loaded and self._clock() - self._synced_at < (
+                self.refresh_interval
+            ):
+                return
+            if not self._loaded or self._filter.count > self._filter.capacity:
+                self._rebuild()
+            else:
+                since = self._high_water - SYNC_OVERLAP if self._high_water else None
+                self._apply(self.repository.revoked_since(since))
+            self._loaded = True
+            self._synced_at = self._clock()
+
+    def _rebuild(self) -> None:
+        rows = self.repository.revoked_since(None)
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for digest, _ in rows:
+            bloom.add(digest)
+
+        with self._lock:
+            if self._loaded:
+                self.rebuilds += 1
+            self._filter = bloom
+            self._confirmed.clear()
+            self._generation += 1
+            self._high_water = self._newest(rows, None)
+        logger.info(
+            f"Loaded {len(rows)} revoked tokens into a filter for {bloom.capacity}"
+        )
+
+    def _apply(self, rows: List[Tuple[bytes, datetime]]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            for digest, _ in rows:
+                self._filter.add(digest)
+                if digest in self._confirmed:
+                    self._confirmed[digest] = True
+            self._generation += 1
+            self._high_water = self._newest(rows, self._high_water)
+
+    def _remember(self, digest: bytes, revoked: bool) -> None:
+        self._confirmed[digest] = revoked
+        self._confirmed.move_to_end(digest)
+        while len(self._confirmed) > self.max_confirmed:
+            self._confirmed.popitem(last=False)
+
+    @staticmethod
+    def _newest(
+        rows: Iterable[Tuple[bytes, datetime]], current: Optional[datetime]
+    ) -> Optional[datetime]:
+        for _, blacklisted_at in rows:
+            if current is None or blacklisted_at > current:
+                current = blacklisted_at
+        return current
@@ -1,14 +1,57 @@
 """Security utilities for authentication."""
 
+import hashlib
+import statistics
+import time
+import uuid
 import bcrypt
 import jwt
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.utils.logging import setup_logger
 
+logger = setup_logger(__name__)
 
-def hash_password(password: str) -> str:
-    """Hash password using bcrypt."""
-    return str(bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode())
+DEFAULT_BCRYPT_ROUNDS = 12
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 16
+
+
+def hash_password(password: str, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> str:
+    """Hash password using bcrypt at the given cost factor."""
+    return str(bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode())
+
+
+def password_rounds(password_hash: str) -> Optional[int]:
+    """Cost factor a bcrypt hash was made with ("$2b$12$..." -> 12)."""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def calibrate_rounds(
+    target_ms: float,
+    min_rounds: int = MIN_BCRYPT_ROUNDS,
+    max_rounds: int = MAX_BCRYPT_ROUNDS,
+) -> int:
+    """Highest cost whose hash time on this machine stays within target_ms.
+
+    Each extra round doubles the work, so one cost is timed (median of three)
+    and the rest are extrapolated from it. Never goes below ``min_rounds``.
+    """
+    samples = []
+    for _ in range(3):
+        started = time.perf_counter()
+        hash_password("calibration", min_rounds)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    rounds, estimate = min_rounds, statistics.median(samples)
+    while rounds < max_rounds and estimate * 2 <= target_ms:
+        rounds += 1
+        estimate *= 2
+    logger.info(f"Calibrated bcrypt cost {rounds} (~{estimate:.0f} ms per hash)")
+    return rounds
 
 
 def verify_password(password: str, password_hash: str) -> bool:
@@ -17,15 +60,21 @@ def verify_password(password: str, password_hash: str) -> bool:
 
 
 def generate_token(partner_id: str, secret_key: str, expiration_hours: int) -> str:
-    """Generate JWT token."""
+    """Generate JWT token with a unique jti."""
     payload = {
         "partner_id": partner_id,
+        "jti": uuid.uuid4().hex,
         "exp": datetime.now(timezone.utc) + timedelta(hours=expiration_hours),
         "iat": datetime.now(timezone.utc),
     }
     return str(jwt.encode(payload, secret_key, algorithm="HS256"))
 
 
+def token_hash(token: str) -> bytes:
+    """SHA-256 of a token; the fixed-size key revocations are stored under."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 def decode_token(token: str, secret_key: str) -> Dict[str, Any]:
     """Decode and verify JWT token."""
     return dict(jwt.decode(token, secret_key, algorithms=["HS256"]))
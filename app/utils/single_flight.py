@@ -0,0 +1,119 @@
+"""Request coalescing for duplicate concurrent calls."""
+
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Callable, Dict, Generic, Iterator, Optional, TypeVar
+
+V = TypeVar("V")
+
+LOCK_STRIPES = 64
+
+# flock cannot time out, so a bounded wait polls it at this interval
+LOCK_POLL_INTERVAL = 0.01
+
+
+class _Call(Generic[V]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[V] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[V]):
+    """Run at most one call per key at a time and share its result.
+
+    Threads in the same process asking for a key that is already in flight
+    wait for the leader and receive its result (or exception). When
+    ``lock_dir`` is set, leaders in different processes additionally
+    serialize on a striped ``flock`` so only one worker runs the call for a
+    key at a time. The callable is passed ``waited``: True when another
+    process held the lock first, in which case it should re-check shared
+    state (e.g. the database) to pick up what that holder produced.
+
+    With a ``timeout``, waiting for the in-flight call or for the lock gives
+    up after that many seconds with TimeoutError; ``fn`` itself is not
+    interrupted.
+    """
+
+    def __init__(
+        self,
+        lock_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.lock_dir = lock_dir
+        self._clock = clock
+        self._calls: Dict[str, _Call[V]] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self, key: str, fn: Callable[[bool], V], timeout: Optional[float] = None
+    ) -> V:
+        """Call ``fn(waited)`` unless a call for ``key`` is in flight, then share it."""
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight call: {key}")
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            with self._process_lock(key, deadline) as waited:
+                call.result = fn(waited)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @contextmanager
+    def _process_lock(self, key: str, deadline: Optional[float]) -> Iterator[bool]:
+        """Hold the key's cross-process lock; yields whether it had to wait."""
+        if not self.lock_dir:
+            yield False
+            return
+
+        digest = hashlib.sha256(key.encode()).digest()
+        stripe = int.from_bytes(digest[:4], "big") % LOCK_STRIPES
+        os.makedirs(self.lock_dir, exist_ok=True)
+        path = os.path.join(self.lock_dir, f"single-flight-{stripe}.lock")
+        with open(path, "a") as lock_file:
+            waited = self._flock(lock_file, deadline)
+            try:
+                yield waited
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _flock(self, lock_file: IO[str], deadline: Optional[float]) -> bool:
+        """Take an exclusive flock by the deadline; True if it was contended."""
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return False
+        except BlockingIOError:
+            if deadline is None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                return True
+
+        while True:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                raise TimeoutError("Timed out waiting for another process's call")
+            time.sleep(min(LOCK_POLL_INTERVAL, remaining))
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                continue
@@ -0,0 +1,221 @@
+"""In-process nearest-neighbour index over location coordinates."""
+
+import heapq
+import math
+import threading
+from array import array
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+from app.utils.location_search_index import IndexedLocation
+
+EARTH_RADIUS_KM = 6371.0088
+# Points added after the last build are scanned linearly until this many pile up
+REBUILD_THRESHOLD = 1024
+
+
+class NearbyLocation(NamedTuple):
+    """Location with its coordinates and distance from the query point."""
+
+    location: IndexedLocation
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+def to_unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Project a coordinate onto the unit sphere."""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(squared_chord: float) -> float:
+    """Convert a squared chord length on the unit sphere to great-circle km."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(squared_chord) / 2))
+
+
+def distance_km(
+    latitude: float, longitude: float, other_latitude: float, other_longitude: float
+) -> float:
+    """Great-circle distance between two coordinates."""
+    a = to_unit_vector(latitude, longitude)
+    b = to_unit_vector(other_latitude, other_longitude)
+    return chord_to_km(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+class SpatialIndex:
+    """k-nearest lookup with a KD-tree over 3D unit vectors.
+
+    Coordinates are stored as points on the unit sphere, so straight-line
+    (chord) distance orders results exactly like great-circle distance with
+    no special cases at the poles or the antimeridian. The tree is implicit:
+    ``_order`` is arranged so the median of every subrange is its node, with
+    the split axis cycling by depth. Rows added later sit in a small
+    unsorted tail that is scanned linearly and folded into the tree once it
+    reaches ``REBUILD_THRESHOLD``.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[IndexedLocation] = []
+        self._coordinates = array("d")
+        self._points = array("d")
+        self._keys: Set[Tuple[str, str, str]] = set()
+        self._order = array("I")
+        self._pending: List[int] = []
+        # Rows added while a load runs; None when no load is running
+        self._queued: Optional[List[Tuple[IndexedLocation, float, float]]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, locations: Iterable[Tuple[IndexedLocation, float, float]]) -> int:
+        """Index (location, latitude, longitude) rows not already held.
+
+        While ``load`` runs the rows are queued instead, and merged once the
+        loaded tree is swapped in; the count returned is then the queued one.
+        """
+        with self._lock:
+            if self._queued is not None:
+                queued = list(locations)
+                self._queued.extend(queued)
+                return len(queued)
+            return self._add_rows(locations)
+
+    def load(self, locations: Iterable[Tuple[IndexedLocation, float, float]]) -> int:
+        """Build the tree from a full scan, then swap it in.
+
+        The scan is indexed into a fresh tree without holding the lock, so
+        ``add`` and ``nearest`` never wait for it.
+        """
+        with self._lock:
+            self._queued = [
+                (entry, self._coordinates[2 * i], self._coordinates[2 * i + 1])
+                for i, entry in enumerate(self._entries)
+            ]
+        fresh = SpatialIndex()
+        try:
+            loaded = fresh.add(locations)
+            fresh._rebuild()
+        except BaseException:
+            with self._lock:
+                self._queued = None
+            raise
+
+        with self._lock:
+            queued, self._queued = self._queued, None
+            self._entries = fresh._entries
+            self._coordinates = fresh._coordinates
+            self._points = fresh._points
+            self._keys = fresh._keys
+            self._order = fresh._order
+            self._pending = fresh._pending
+            self._add_rows(queued)
+        return loaded
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int
+    ) -> List[NearbyLocation]:
+        """Return up to ``k`` locations closest to the point, nearest first."""
+        target = to_unit_vector(latitude, longitude)
+        # Max-heap of (-squared chord, entry id) holding the best k so far
+        best: List[Tuple[float, int]] = []
+
+        with self._lock:
+            self._search(target, 0, len(self._order), 0, k, best)
+            for entry_id in self._pending:
+                self._offer(target, entry_id, k, best)
+
+            results = []
+            for negative, entry_id in sorted(best, reverse=True):
+                results.append(
+                    NearbyLocation(
+                        location=self._entries[entry_id],
+                        latitude=self._coordinates[2 * entry_id],
+                        longitude=self._coordinates[2 * entry_id + 1],
+                        distance_km=chord_to_km(-negative),
+                    )
+                )
+            return results
+
+    def _add_rows(
+        self, locations: Iterable[Tuple[IndexedLocation, float, float]]
+    ) -> int:
+        added = 0
+        for location, latitude, longitude in locations:
+            key = (location.pincode, location.city, location.area)
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            self._pending.append(len(self._entries))
+            self._entries.append(location)
+            self._coordinates.extend((latitude, longitude))
+            self._points.extend(to_unit_vector(latitude, longitude))
+            added += 1
+
+        if len(self._pending) >= REBUILD_THRESHOLD:
+            self._rebuild()
+        return added
+
+    def _offer(
+        self,
+        target: Tuple[float, float, float],
+        entry_id: int,
+        k: int,
+        best: List[Tuple[float, int]],
+    ) -> None:
+        base = 3 * entry_id
+        points = self._points
+        dx = points[base] - target[0]
+        dy = points[base + 1] - target[1]
+        dz = points[base + 2] - target[2]
+        distance = dx * dx + dy * dy + dz * dz
+        if len(best) < k:
+            heapq.heappush(best, (-distance, entry_id))
+        elif distance < -best[0][0]:
+            heapq.heapreplace(best, (-distance, entry_id))
+
+    def _search(
+        self,
+        target: Tuple[float, float, float],
+        low: int,
+        high: int,
+        depth: int,
+        k: int,
+        best: List[Tuple[float, int]],
+    ) -> None:
+        if low >= high or k <= 0:
+            return
+        middle = (low + high) // 2
+        entry_id = self._order[middle]
+        self._offer(target, entry_id, k, best)
+
+        axis = depth % 3
+        difference = target[axis] - self._points[3 * entry_id + axis]
+        if difference < 0:
+            near, far = (low, middle), (middle + 1, high)
+        else:
+            near, far = (middle + 1, high), (low, middle)
+
+        self._search(target, near[0], near[1], depth + 1, k, best)
+        if len(best) < k or difference * difference < -best[0][0]:
+            self._search(target, far[0], far[1], depth + 1, k, best)
+
+    def _rebuild(self) -> None:
+        """Arrange every point into the implicit KD-tree order."""
+        order = list(range(len(self._entries)))
+        points = self._points
+        stack = [(0, len(order), 0)]
+        while stack:
+            low, high, depth = stack.pop()
+            if high - low <= 1:
+                continue
+            axis = depth % 3
+            order[low:high] = sorted(
+                order[low:high], key=lambda i: points[3 * i + axis]
+            )
+            middle = (low + high) // 2
+            stack.append((low, middle, depth + 1))
+            stack.append((middle + 1, high, depth + 1))
+
+        self._order = array("I", order)
+        self._pending = []
@@ -0,0 +1,40 @@
+"""Canonical forms for place names and location search queries."""
+
+import unicodedata
+from typing import List
+
+# Kept inside names ("St. Thomas Mount", "Sector-15"), trimmed at the edges
+_NAME_PUNCTUATION = ".-'&/"
+
+
+def normalize_name(value: str) -> str:
+    """Case-fold a place name, drop Latin accents and stray punctuation."""
+    decomposed = unicodedata.normalize("NFKD", unicodedata.normalize("NFKC", value))
+    characters: List[str] = []
+    for char in decomposed:
+        if unicodedata.combining(char) and characters and characters[-1].isascii():
+            # "ū" -> "u", while Indic vowel signs stay attached to their letter
+            continue
+        if unicodedata.category(char).startswith("P") and char not in (
+            _NAME_PUNCTUATION
+        ):
+            char = " "
+        characters.append(char)
+
+    text = unicodedata.normalize("NFC", "".join(characters)).casefold()
+    # "St." keeps its period mid-name; a trailing one ("KORAMANGALA.") goes
+    words = (word.strip(_NAME_PUNCTUATION.replace(".", "")) for word in text.split())
+    text = " ".join(word for word in words if word.strip(_NAME_PUNCTUATION))
+    return text.strip(_NAME_PUNCTUATION)
+
+
+def normalize_query(query: str) -> str:
+    """Reduce a free-text location query to its canonical search term.
+
+    Only the first comma-separated part is kept, so a trailing city, state or
+    country ("Koramangala, Bangalore, Karnataka") is dropped. Words inside
+    that part are never dropped: "New Delhi" and "North Goa" are place names
+    in their own right, not a place followed by its state.
+    """
+    parts = (normalize_name(part) for part in query.split(","))
+    return next((part for part in parts if part), "")
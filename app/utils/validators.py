@@ -92,6 +92,10 @@ def has_permission() -> Callable[[Callable[..., Any]], Callable[..., Any]]:
             except jwt.InvalidTokenError:
                 raise UnauthorizedError("Invalid token")
 
+            revocation_cache = current_app.config.get("REVOCATION_CACHE")
+            if revocation_cache is not None and revocation_cache.is_revoked(token):
+                raise UnauthorizedError("Token has been revoked")
+
             return func(*args, **kwargs)
 
         return wrapper
@@ -0,0 +1,37 @@
+"""Add trigram indexes for location substring search
+
+Revision ID: 005_location_trigram_indexes
+Revises: 34186be86db0
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "0000000005"
+down_revision = "34186be86db0"
+branch_labels = None
+depends_on = None
+
+# Every column OR-ed together in LocationRepository.search_locations needs its
+# own trigram index, otherwise the planner cannot build a BitmapOr and falls
+# back to a sequential scan.
+TRIGRAM_COLUMNS = ["city", "area", "district", "pincode"]
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        op.create_index(
+            op.f(f"idx_locations_{column}_trgm"),
+            "locations",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade():
+    for column in reversed(TRIGRAM_COLUMNS):
+        op.drop_index(op.f(f"idx_locations_{column}_trgm"), table_name="locations")
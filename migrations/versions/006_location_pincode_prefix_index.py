@@ -0,0 +1,32 @@
+"""Add covering pattern index for pincode lookups
+
+Revision ID: 006_location_pincode_prefix_index
+Revises: 005_location_trigram_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "0000000006"
+down_revision = "0000000005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # varchar_pattern_ops lets LIKE '560%' use the index regardless of the
+    # database collation; the INCLUDE columns make both the equality and the
+    # prefix lookup index-only scans.
+    op.create_index(
+        op.f("idx_locations_pincode_prefix"),
+        "locations",
+        ["pincode"],
+        postgresql_ops={"pincode": "varchar_pattern_ops"},
+        postgresql_include=["id", "city", "state", "district", "area"],
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("idx_locations_pincode_prefix"), table_name="locations")
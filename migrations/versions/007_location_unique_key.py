@@ -0,0 +1,36 @@
+"""Add unique constraint on location pincode, city and area
+
+Revision ID: 007_location_unique_key
+Revises: 006_location_pincode_prefix_index
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "0000000007"
+down_revision = "0000000006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep one row per (pincode, city, area) before enforcing uniqueness
+    op.execute(
+        """
+        DELETE FROM locations a
+        USING locations b
+        WHERE a.pincode = b.pincode
+          AND a.city = b.city
+          AND a.area = b.area
+          AND a.id > b.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_locations_pincode_city_area", "locations", ["pincode", "city", "area"]
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_locations_pincode_city_area", "locations", type_="unique")
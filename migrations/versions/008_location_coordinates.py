@@ -0,0 +1,26 @@
+"""Add latitude and longitude to locations
+
+Revision ID: 008_location_coordinates
+Revises: 007_location_unique_key
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000000008"
+down_revision = "0000000007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("locations", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("locations", sa.Column("longitude", sa.Float(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("locations", "longitude")
+    op.drop_column("locations", "latitude")
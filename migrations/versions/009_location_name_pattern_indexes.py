@@ -0,0 +1,36 @@
+"""Add lowercase pattern indexes for ranked name search
+
+Revision ID: 009_location_name_pattern_indexes
+Revises: 008_location_coordinates
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000000009"
+down_revision = "0000000008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serve the exact (lower(x) = q) and prefix (lower(x) LIKE 'q%') search
+    # tiers; text_pattern_ops makes the prefix scan independent of collation.
+    op.create_index(
+        "idx_locations_area_lower",
+        "locations",
+        [sa.text("lower(area) text_pattern_ops")],
+    )
+    op.create_index(
+        "idx_locations_city_lower",
+        "locations",
+        [sa.text("lower(city) text_pattern_ops")],
+    )
+
+
+def downgrade():
+    op.drop_index("idx_locations_city_lower", table_name="locations")
+    op.drop_index("idx_locations_area_lower", table_name="locations")
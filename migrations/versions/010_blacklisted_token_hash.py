@@ -0,0 +1,48 @@
+"""Key blacklisted tokens by a SHA-256 hash instead of the full JWT
+
+Revision ID: 010_blacklisted_token_hash
+Revises: 009_location_name_pattern_indexes
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0000000010"
+down_revision = "0000000009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 32 fixed bytes replace a unique index over up to 500 characters of JWT
+    op.add_column(
+        "blacklisted_tokens",
+        sa.Column("token_hash", sa.LargeBinary(length=32), nullable=True),
+    )
+    op.execute(
+        "UPDATE blacklisted_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))"
+    )
+    op.alter_column("blacklisted_tokens", "token_hash", nullable=False)
+    op.create_unique_constraint(
+        "uq_blacklisted_tokens_token_hash", "blacklisted_tokens", ["token_hash"]
+    )
+    op.drop_column("blacklisted_tokens", "token")
+
+
+def downgrade():
+    # Hashes cannot be turned back into tokens; the revocations are dropped
+    op.execute("DELETE FROM blacklisted_tokens")
+    op.add_column(
+        "blacklisted_tokens",
+        sa.Column("token", sa.String(length=500), nullable=False),
+    )
+    op.create_unique_constraint(
+        "blacklisted_tokens_token_key", "blacklisted_tokens", ["token"]
+    )
+    op.drop_constraint(
+        "uq_blacklisted_tokens_token_hash", "blacklisted_tokens", type_="unique"
+    )
+    op.drop_column("blacklisted_tokens", "token_hash")
@@ -0,0 +1,27 @@
+"""Drop the duplicate expires_at index on blacklisted_tokens
+
+Revision ID: 011_drop_duplicate_blacklist_expiry_index
+Revises: 010_blacklisted_token_hash
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "0000000011"
+down_revision = "0000000010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The model declared expires_at with index=True as well as
+    # idx_blacklisted_tokens_expires_at, so tables built from the models carry
+    # a second, identical index that every insert and purge has to maintain.
+    op.execute("DROP INDEX IF EXISTS ix_blacklisted_tokens_expires_at")
+
+
+def downgrade():
+    # Migrations never created the duplicate; nothing to restore
+    pass
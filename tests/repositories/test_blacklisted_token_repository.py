@@ -3,6 +3,7 @@ from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock
 from app.repositories.blacklisted_token_repository import BlacklistedTokenRepository
 from app.models.blacklisted_token import BlacklistedToken
+from app.utils.security import token_hash
 
 
 @pytest.fixture
@@ -21,6 +22,9 @@ def test_is_blacklisted_true(repository, mocker):
 
     result = repository.is_blacklisted("test_token")
     assert result is True
+    mock_query.return_value.filter_by.assert_called_once_with(
+        token_hash=token_hash("test_token")
+    )
 
 
 def test_is_blacklisted_false(repository, mocker):
@@ -43,7 +47,56 @@ def test_blacklist_token(repository, mocker):
 
     token = repository.blacklist("test_token", expires_at)
 
-    assert token.token == "test_token"
+    assert token.token_hash == token_hash("test_token")
+    assert len(token.token_hash) == 32
     assert token.expires_at == expires_at
     mock_session.add.assert_called_once()
     mock_session.commit.assert_called_once()
+
+
+def test_revoked_since_all(repository, mocker):
+    mock_query = mocker.patch(
+        "app.repositories.blacklisted_token_repository.db.session.query"
+    )
+    blacklisted_at = datetime(2026, 1, 1)
+    mock_query.return_value.filter.return_value.all.return_value = [
+        (token_hash("test_token"), blacklisted_at)
+    ]
+
+    rows = repository.revoked_since(None)
+
+    assert rows == [(token_hash("test_token"), blacklisted_at)]
+    assert mock_query.return_value.filter.call_count == 1
+
+
+def test_revoked_since_filters_by_time(repository, mocker):
+    mock_query = mocker.patch(
+        "app.repositories.blacklisted_token_repository.db.session.query"
+    )
+    since_query = mock_query.return_value.filter.return_value.filter
+    since_query.return_value.all.return_value = []
+
+    assert repository.revoked_since(datetime(2026, 1, 1)) == []
+    since_query.assert_called_once()
+
+
+def test_purge_expired_deletes_in_batches(repository, mocker):
+    mock_session = mocker.patch(
+        "app.repositories.blacklisted_token_repository.db.session"
+    )
+    mock_session.query.return_value.filter.return_value.delete.side_effect = [100, 37]
+
+    removed = repository.purge_expired(batch_size=100)
+
+    assert removed == 137
+    assert mock_session.commit.call_count == 2
+
+
+def test_purge_expired_nothing_to_delete(repository, mocker):
+    mock_session = mocker.patch(
+        "app.repositories.blacklisted_token_repository.db.session"
+    )
+    mock_session.query.return_value.filter.return_value.delete.return_value = 0
+
+    assert repository.purge_expired() == 0
+    mock_session.commit.assert_called_once()
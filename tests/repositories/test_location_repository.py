@@ -1,7 +1,12 @@
 import pytest
 from unittest.mock import Mock
+from sqlalchemy.dialects import postgresql
 from app.repositories.location_repository import LocationRepository
 from app.models.location import Location
+from app.utils.location_search_index import IndexedLocation, LocationSearchIndex
+from app.utils.spatial_index import SpatialIndex
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.errors import ValidationError
 
 
 @pytest.fixture
@@ -21,21 +26,139 @@ def mock_location():
     return location
 
 
-def test_search_locations(repository, mock_location, mocker):
+def test_search_tier(repository, mock_location, mocker):
     mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
-    mock_query.return_value.filter.return_value.limit.return_value.all.return_value = [
-        mock_location
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        (mock_location, 0.8)
     ]
 
-    results = repository.search_locations("Bangalore")
-    assert len(results) == 1
-    assert results[0].city == "Bangalore"
+    page = repository.search_tier("substring", "bangalore")
+    assert len(page.locations) == 1
+    assert page.locations[0].city == "Bangalore"
 
 
-def test_bulk_create_new_locations(repository, mocker):
-    mock_session = mocker.patch("app.repositories.location_repository.db.session")
+def test_search_tier_ranked_by_similarity(repository, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+
+    repository.search_tier("substring", "bangalore", limit=5)
+
+    order_by = mock_query.return_value.filter.return_value.order_by
+    order_by.assert_called_once()
+    ranking = str(order_by.call_args.args[0])
+    assert "similarity" in ranking
+    assert "DESC" in ranking
+    # One extra row tells whether there is a next page
+    order_by.return_value.limit.assert_called_once_with(6)
+
+
+@pytest.mark.parametrize(
+    "tier, expected, excluded",
+    [
+        ("exact", "lower(locations.area) = 'mg road'", "LIKE"),
+        ("prefix", "lower(locations.area) LIKE 'mg road%%'", "ILIKE"),
+        ("substring", "locations.area ILIKE '%%mg road%%'", None),
+    ],
+)
+def test_search_tier_filters(repository, mocker, tier, expected, excluded):
     mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
-    mock_query.return_value.filter_by.return_value.first.return_value = None
+
+    repository.search_tier(tier, "mg road")
+
+    predicate = str(
+        mock_query.return_value.filter.call_args.args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert expected in predicate
+    if excluded:
+        assert excluded not in predicate
+    if tier != "exact":
+        # Each tier leaves out the rows an earlier tier returned
+        assert "NOT" in predicate
+
+
+def test_search_tier_unknown(repository, mocker):
+    mocker.patch("app.repositories.location_repository.db")
+    with pytest.raises(ValueError, match="Unknown search tier"):
+        repository.search_tier("nearest", "mg road")
+
+
+def test_search_tier_returns_keyset_cursor(repository, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    rows = [
+        (
+            Location(
+                id=f"id-{i}", pincode="1", city="c", state="s", district="d", area="a"
+            ),
+            0.5,
+        )
+        for i in range(3)
+    ]
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = (
+        rows
+    )
+
+    page = repository.search_tier("substring", "bangalore", limit=2)
+
+    assert [loc.id for loc in page.locations] == ["id-0", "id-1"]
+    assert decode_cursor(page.next_cursor) == ["s", 0.5, "id-1"]
+
+
+def test_search_tier_applies_cursor(repository, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    keyset = mock_query.return_value.filter.return_value.filter
+    keyset.return_value.order_by.return_value.limit.return_value.all.return_value = []
+
+    page = repository.search_tier(
+        "substring", "bangalore", limit=2, cursor=encode_cursor(["s", 0.5, "id-1"])
+    )
+
+    assert page == ([], None)
+    predicate = str(
+        keyset.call_args.args[0].compile(compile_kwargs={"literal_binds": True})
+    )
+    assert "id-1" in predicate
+    assert "<" in predicate
+
+
+def test_search_tier_keyset_compares_scores_as_double(repository, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    keyset = mock_query.return_value.filter.return_value.filter
+    keyset.return_value.order_by.return_value.limit.return_value.all.return_value = []
+
+    repository.search_tier(
+        "substring", "bangalore", limit=2, cursor=encode_cursor(["s", 0.3, "id-1"])
+    )
+
+    selected_score = mock_query.call_args.args[1]
+    predicate = keyset.call_args.args[0]
+    assert "AS DOUBLE PRECISION" in str(
+        selected_score.compile(dialect=postgresql.dialect())
+    )
+    comparisons = predicate.compile(dialect=postgresql.dialect())
+    assert str(comparisons).count("AS DOUBLE PRECISION) <") == 1
+    assert str(comparisons).count("AS DOUBLE PRECISION) =") == 1
+    assert all(
+        isinstance(comparison.left.type, postgresql.DOUBLE_PRECISION)
+        and isinstance(comparison.right.type, postgresql.DOUBLE_PRECISION)
+        for comparison in (predicate.clauses[0], predicate.clauses[1].clauses[0])
+    )
+
+
+def test_search_tier_rejects_garbage_cursor(repository):
+    with pytest.raises(ValidationError, match="Invalid cursor"):
+        repository.search_tier("exact", "bangalore", cursor="not-a-cursor!")
+
+
+def test_search_tier_rejects_malformed_keyset(repository, mocker):
+    mocker.patch("app.repositories.location_repository.db")
+    with pytest.raises(ValidationError, match="Invalid cursor"):
+        repository.search_tier("exact", "bangalore", cursor=encode_cursor(["s"]))
+
+
+def test_bulk_create_new_locations(repository, mock_location, mocker):
+    mock_session = mocker.patch("app.repositories.location_repository.db.session")
+    mock_session.scalars.return_value = [mock_location]
 
     locations_data = [
         {
@@ -48,27 +171,356 @@ def test_bulk_create_new_locations(repository, mocker):
     ]
     results = repository.bulk_create(locations_data)
 
-    assert len(results) == 1
-    mock_session.add.assert_called_once()
+    assert results == [mock_location]
+    mock_session.scalars.assert_called_once()
+    mock_session.query.assert_not_called()
     mock_session.commit.assert_called_once()
 
 
-def test_bulk_create_existing_location(repository, mock_location, mocker):
+def test_bulk_create_single_upsert_statement(repository, mocker):
+    mock_session = mocker.patch("app.repositories.location_repository.db.session")
+    mock_session.scalars.return_value = []
+    row = {
+        "pincode": "560001",
+        "city": "Bangalore",
+        "area": "MG Road",
+        "state": "Karnataka",
+        "district": "Bangalore Urban",
+    }
+    other = {**row, "area": "Brigade Road"}
+
+    results = repository.bulk_create([row, dict(row), other])
+
+    assert results == []
+    statement = mock_session.scalars.call_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_locations_pincode_city_area DO NOTHING" in sql
+    assert "RETURNING" in sql
+    # In-batch duplicates are collapsed before the statement is built
+    assert "area_m1" in sql
+    assert "area_m2" not in sql
+
+
+def test_bulk_create_empty(repository, mocker):
     mock_session = mocker.patch("app.repositories.location_repository.db.session")
+
+    assert repository.bulk_create([]) == []
+    mock_session.scalars.assert_not_called()
+    mock_session.commit.assert_not_called()
+
+
+def test_find_by_pincode(repository, mock_location, mocker):
     mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
-    mock_query.return_value.filter_by.return_value.first.return_value = mock_location
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        mock_location
+    ]
 
-    locations_data = [
-        {
-            "pincode": "560001",
-            "city": "Bangalore",
-            "area": "MG Road",
-            "state": "Karnataka",
-            "district": "Bangalore Urban",
-        }
+    results = repository.find_by_pincode("560001")
+
+    assert results == [mock_location]
+    predicate = mock_query.return_value.filter.call_args.args[0]
+    assert str(predicate) == "locations.pincode = :pincode_1"
+
+
+def test_search_by_pincode_prefix(repository, mock_location, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        mock_location
     ]
-    results = repository.bulk_create(locations_data)
 
-    assert len(results) == 0
-    mock_session.add.assert_not_called()
-    mock_session.commit.assert_not_called()
+    results = repository.search_by_pincode_prefix("5600")
+
+    assert results == [mock_location]
+    predicate = mock_query.return_value.filter.call_args.args[0]
+    assert predicate.right.value == "5600%"
+
+
+@pytest.fixture
+def indexed_repository(mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.yield_per.return_value = [
+        ("560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"),
+        ("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort"),
+    ]
+    return LocationRepository(search_index=LocationSearchIndex()), mock_query
+
+
+def test_search_locations_uses_search_index(indexed_repository):
+    repository, mock_query = indexed_repository
+
+    results = repository.search_tier("exact", "mumbai").locations
+    repository.search_tier("exact", "fort")
+
+    assert [loc.area for loc in results] == ["Fort"]
+    assert isinstance(results[0], Location)
+    mock_query.return_value.yield_per.assert_called_once()
+    mock_query.return_value.filter.assert_not_called()
+
+
+def test_pincode_lookups_use_search_index(indexed_repository):
+    repository, mock_query = indexed_repository
+
+    assert [loc.area for loc in repository.find_by_pincode("560001")] == ["MG Road"]
+    assert len(repository.search_by_pincode_prefix("40")) == 1
+    mock_query.return_value.filter.assert_not_called()
+
+
+def test_bulk_create_updates_loaded_search_index(indexed_repository, mocker):
+    repository, mock_query = indexed_repository
+    mocker.patch("app.repositories.location_repository.db.session.commit")
+    mocker.patch(
+        "app.repositories.location_repository.db.session.scalars",
+        return_value=[
+            Location(
+                pincode="600001",
+                city="Chennai",
+                area="Parrys",
+                state="Tamil Nadu",
+                district="Chennai",
+            )
+        ],
+    )
+    repository.search_tier("exact", "warm up")
+
+    repository.bulk_create(
+        [
+            {
+                "pincode": "600001",
+                "city": "Chennai",
+                "area": "Parrys",
+                "state": "Tamil Nadu",
+                "district": "Chennai",
+            }
+        ]
+    )
+
+    page = repository.search_tier("exact", "parrys")
+    assert [loc.area for loc in page.locations] == ["Parrys"]
+
+
+@pytest.fixture
+def pincode_table():
+    table = Mock()
+    table.find_by_pincode.return_value = [
+        IndexedLocation(
+            "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+        )
+    ]
+    table.search_by_pincode_prefix.return_value = []
+    table.is_valid_pincode.return_value = False
+    return table
+
+
+def test_find_by_pincode_uses_pincode_table(pincode_table, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    repository = LocationRepository(pincode_table=pincode_table)
+
+    results = repository.find_by_pincode("560001")
+
+    assert [loc.area for loc in results] == ["MG Road"]
+    mock_query.assert_not_called()
+
+
+def test_pincode_prefix_falls_back_when_table_misses(
+    pincode_table, mock_location, mocker
+):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        mock_location
+    ]
+    repository = LocationRepository(pincode_table=pincode_table)
+
+    assert repository.search_by_pincode_prefix("000") == [mock_location]
+
+
+def test_is_valid_pincode(pincode_table, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.scalar.return_value = True
+    pincode_table.is_valid_pincode.side_effect = lambda code: code == "560001"
+    repository = LocationRepository(pincode_table=pincode_table)
+
+    assert repository.is_valid_pincode("560001") is True
+    mock_query.assert_not_called()
+    assert repository.is_valid_pincode("000000") is True
+
+
+def test_find_nearest_uses_spatial_index(mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.filter.return_value.yield_per.return_value = [
+        ("560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road", 12.97, 77.6),
+        ("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort", 18.93, 72.83),
+    ]
+    repository = LocationRepository(spatial_index=SpatialIndex())
+
+    results = repository.find_nearest(19.0, 72.8, 1)
+    repository.find_nearest(12.9, 77.5, 1)
+
+    assert [r.location.area for r in results] == ["Fort"]
+    mock_query.return_value.filter.return_value.yield_per.assert_called_once()
+
+
+def test_find_nearest_without_index(repository, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    location = Location(
+        pincode="400001",
+        city="Mumbai",
+        state="Maharashtra",
+        district="Mumbai",
+        area="Fort",
+        latitude=18.93,
+        longitude=72.83,
+    )
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+        location
+    ]
+
+    results = repository.find_nearest(18.93, 72.83, 5)
+
+    assert results[0].location.area == "Fort"
+    assert results[0].distance_km == pytest.approx(0)
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.assert_called_once_with(
+        5
+    )
+
+
+def test_bulk_create_updates_loaded_spatial_index(mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.filter.return_value.yield_per.return_value = []
+    mocker.patch("app.repositories.location_repository.db.session.commit")
+    mocker.patch(
+        "app.repositories.location_repository.db.session.scalars",
+        return_value=[
+            Location(
+                pincode="600001",
+                city="Chennai",
+                area="Parrys",
+                state="Tamil Nadu",
+                district="Chennai",
+                latitude=13.09,
+                longitude=80.29,
+            )
+        ],
+    )
+    repository = LocationRepository(spatial_index=SpatialIndex())
+    assert repository.find_nearest(13.0, 80.2, 1) == []
+
+    repository.bulk_create(
+        [
+            {
+                "pincode": "600001",
+                "city": "Chennai",
+                "area": "Parrys",
+                "state": "Tamil Nadu",
+                "district": "Chennai",
+                "latitude": 13.09,
+                "longitude": 80.29,
+            }
+        ]
+    )
+
+    assert [r.location.area for r in repository.find_nearest(13.0, 80.2, 1)] == [
+        "Parrys"
+    ]
+
+
+def test_get_pincode_centroids(repository, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+        ("560034", 12.93, 77.62)
+    ]
+
+    assert repository.get_pincode_centroids(["560034", "560034", "000000"]) == {
+        "560034": (12.93, 77.62)
+    }
+    assert repository.get_pincode_centroids([]) == {}
+    mock_query.assert_called_once()
+
+
+def test_find_by_pincodes_single_query(repository, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    rows = [
+        Location(pincode="560001", city="B", state="K", district="B", area="A"),
+        Location(pincode="560001", city="B", state="K", district="B", area="B"),
+        Location(pincode="560034", city="B", state="K", district="B", area="C"),
+    ]
+    mock_query.return_value.filter.return_value.order_by.return_value.all.return_value = (
+        rows
+    )
+
+    results = repository.find_by_pincodes(["560001", "560034", "560001", "110001"], 1)
+
+    assert [loc.area for loc in results["560001"]] == ["A"]
+    assert [loc.area for loc in results["560034"]] == ["C"]
+    assert "110001" not in results
+    mock_query.assert_called_once()
+    predicate = mock_query.return_value.filter.call_args.args[0]
+    assert predicate.right.value == ["560001", "560034", "110001"]
+
+
+def test_find_by_pincodes_table_then_sql(pincode_table, mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    pincode_table.find_by_pincode.side_effect = lambda code, limit: (
+        [IndexedLocation(code, "Bangalore", "Karnataka", "Bangalore Urban", "MG Road")]
+        if code == "560001"
+        else []
+    )
+    mock_query.return_value.filter.return_value.order_by.return_value.all.return_value = (
+        []
+    )
+    repository = LocationRepository(pincode_table=pincode_table)
+
+    results = repository.find_by_pincodes(["560001", "000000"])
+
+    assert [loc.area for loc in results["560001"]] == ["MG Road"]
+    predicate = mock_query.return_value.filter.call_args.args[0]
+    assert predicate.right.value == ["000000"]
+
+
+def test_search_tier_pages_through_search_index(indexed_repository):
+    repository, _ = indexed_repository
+
+    first = repository.search_tier("prefix", "m", limit=1)
+    second = repository.search_tier("prefix", "m", limit=1, cursor=first.next_cursor)
+
+    assert first.next_cursor is not None
+    assert second.next_cursor is None
+    assert first.locations[0].area != second.locations[0].area
+
+
+def test_search_index_loads_in_background(mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = (
+        []
+    )
+    loader = Mock()
+    repository = LocationRepository(
+        search_index=LocationSearchIndex(), index_loader=loader
+    )
+
+    repository.search_tier("exact", "mumbai")
+
+    loader.ensure_running.assert_called_once_with(repository._load_search_index)
+    mock_query.return_value.filter.assert_called_once()
+    mock_query.return_value.yield_per.assert_not_called()
+
+
+def test_spatial_index_loads_in_background(mocker):
+    mock_query = mocker.patch("app.repositories.location_repository.db.session.query")
+    mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = (
+        []
+    )
+    loader = Mock()
+    repository = LocationRepository(spatial_index=SpatialIndex(), spatial_loader=loader)
+
+    assert repository.find_nearest(19.0, 72.8, 1) == []
+
+    loader.ensure_running.assert_called_once_with(repository._load_spatial_index)
+    mock_query.return_value.filter.return_value.order_by.assert_called_once()
+    mock_query.return_value.filter.return_value.yield_per.assert_not_called()
+
+    mock_query.return_value.filter.return_value.yield_per.return_value = [
+        ("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort", 18.93, 72.83),
+    ]
+    repository._load_spatial_index()
+
+    assert [r.location.area for r in repository.find_nearest(19.0, 72.8, 1)] == ["Fort"]
@@ -1,6 +1,10 @@
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import Mock
-from app.repositories.partner_profile_repository import PartnerProfileRepository
+from app.repositories.partner_profile_repository import (
+    SYNC_OVERLAP,
+    PartnerProfileRepository,
+)
 from app.models.partner_profile import PartnerProfile
 
 
@@ -119,3 +123,133 @@ def test_update_not_found(repository, mocker):
             service_areas=["Area2"],
             delivery_radius="20",
         )
+
+
+@pytest.fixture
+def location_repository():
+    repository = Mock()
+    location = Mock(area="Koramangala", city="Bangalore", district="Bangalore Urban")
+    repository.find_by_pincode.return_value = [location]
+    repository.get_pincode_centroids.side_effect = lambda codes: {
+        code: (12.93, 77.62) for code in codes if code.startswith("560")
+    }
+    return repository
+
+
+@pytest.fixture
+def discovery_repository(location_repository):
+    clock = Mock(return_value=0.0)
+    repository = PartnerProfileRepository(
+        location_repository=location_repository, refresh_interval=30, clock=clock
+    )
+    return repository, clock
+
+
+def test_find_covering_partners(discovery_repository, mock_profile, mocker):
+    repository, _ = discovery_repository
+    mock_query = mocker.patch(
+        "app.repositories.partner_profile_repository.db.session.query"
+    )
+    mock_query.return_value.all.return_value = [
+        ("partner-id", "560095", ["Koramangala"], "10", None),
+        ("other-id", "400001", ["Fort"], "5", None),
+    ]
+    mock_query.return_value.filter.return_value.all.return_value = [mock_profile]
+
+    results = repository.find_covering_partners("560034")
+
+    assert results == [(mock_profile, pytest.approx(0))]
+    partner_filter = mock_query.return_value.filter.call_args.args[0]
+    assert partner_filter.right.value == ["partner-id"]
+
+
+def test_find_covering_partners_no_match(discovery_repository, mocker):
+    repository, _ = discovery_repository
+    mock_query = mocker.patch(
+        "app.repositories.partner_profile_repository.db.session.query"
+    )
+    mock_query.return_value.all.return_value = []
+
+    assert repository.find_covering_partners("110001") == []
+    mock_query.return_value.filter.assert_not_called()
+
+
+def test_coverage_index_syncs_edits_from_other_workers(discovery_repository, mocker):
+    repository, clock = discovery_repository
+    mock_query = mocker.patch(
+        "app.repositories.partner_profile_repository.db.session.query"
+    )
+    mock_query.return_value.all.return_value = [
+        ("partner-id", "560095", ["Koramangala"], "10", datetime(2026, 1, 1))
+    ]
+    index = repository._get_coverage_index()
+    mock_query.return_value.filter.return_value.all.return_value = [
+        ("partner-id", "400001", ["Fort"], "0", datetime(2026, 1, 2))
+    ]
+
+    repository._get_coverage_index()
+    assert len(index.match("560034", ["Koramangala"], None)) == 1
+
+    clock.return_value = 31.0
+    repository._get_coverage_index()
+    assert index.match("560034", ["Koramangala"], None) == []
+
+
+def test_coverage_sync_looks_behind_the_newest_edit(discovery_repository, mocker):
+    repository, clock = discovery_repository
+    mock_query = mocker.patch(
+        "app.repositories.partner_profile_repository.db.session.query"
+    )
+    newest = datetime(2026, 1, 1, 12, 0, 0)
+    mock_query.return_value.all.return_value = [
+        ("partner-id", "560095", ["Koramangala"], "10", newest)
+    ]
+    repository._get_coverage_index()
+    # Stamped before the newest edit but committed after it was read
+    mock_query.return_value.filter.return_value.all.return_value = [
+        ("late-id", "560095", ["Koramangala"], "10", newest - timedelta(seconds=2))
+    ]
+
+    clock.return_value = 31.0
+    index = repository._get_coverage_index()
+
+    since = mock_query.return_value.filter.call_args.args[0]
+    assert since.right.value == newest - SYNC_OVERLAP
+    assert len(index.match("560034", ["Koramangala"], None)) == 2
+
+
+def test_update_refreshes_loaded_coverage_index(
+    discovery_repository, mock_profile, mocker
+):
+    repository, _ = discovery_repository
+    mock_query = mocker.patch(
+        "app.repositories.partner_profile_repository.db.session.query"
+    )
+    mock_query.return_value.all.return_value = [
+        ("partner-id", "123456", ["Area1"], "0", None)
+    ]
+    repository.find_covering_partners("123456")
+    mocker.patch("app.repositories.partner_profile_repository.db.session.commit")
+    mocker.patch.object(repository, "get_by_partner_id", return_value=mock_profile)
+
+    repository.update(
+        partner_id="partner-id",
+        business_name="Updated Business",
+        owner_name="Jane Doe",
+        email="updated@example.com",
+        phone="0987654321",
+        address="456 New St",
+        city="New City",
+        state="New State",
+        pincode="560034",
+        business_type="Service",
+        years_in_business="10",
+        description="Updated description",
+        categories=["Category2"],
+        service_areas=["Area2"],
+        delivery_radius="20",
+    )
+
+    index = repository.coverage_index
+    assert index.match("123456", ["Area1"], None) == []
+    assert [m[0] for m in index.match("560034", [], None)] == ["partner-id"]
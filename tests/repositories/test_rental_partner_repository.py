@@ -82,3 +82,15 @@ def test_find_by_id_not_exists(repository, mocker):
 
     partner = repository.find_by_id("nonexistent-id")
     assert partner is None
+
+
+def test_update_password_hash(repository, mocker):
+    mock_session = mocker.patch("app.repositories.rental_partner_repository.db.session")
+
+    repository.update_password_hash("test-id", "new_hash")
+
+    mock_session.query.return_value.filter_by.assert_called_once_with(id="test-id")
+    mock_session.query.return_value.filter_by.return_value.update.assert_called_once_with(
+        {"password_hash": "new_hash"}
+    )
+    mock_session.commit.assert_called_once()
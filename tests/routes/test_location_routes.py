@@ -2,7 +2,13 @@ import pytest
 from unittest.mock import Mock
 from flask import Flask
 from app.routes.location_routes import create_location_routes
-from app.contracts.location_contracts import LocationSearchResponse, LocationData
+from app.contracts.location_contracts import (
+    LocationSearchResponse,
+    LocationBatchResponse,
+    LocationData,
+    NearestLocationData,
+    NearestLocationResponse,
+)
 from app.utils.errors import register_error_handlers
 
 
@@ -41,4 +47,119 @@ def test_search_locations_success(location_client):
     data = response.get_json()
     assert len(data["data"]) == 1
     assert data["data"][0]["city"] == "Bangalore"
-    mock_service.search_locations.assert_called_once_with("Bangalore")
+    mock_service.search_locations.assert_called_once_with("Bangalore", 20, None)
+
+
+def test_search_locations_page_params(location_client):
+    client, mock_service = location_client
+    mock_service.search_locations.return_value = LocationSearchResponse(
+        data=[], message="No locations found"
+    )
+
+    client.get("/api/locations/search?q=Bangalore&limit=5&cursor=abc")
+
+    mock_service.search_locations.assert_called_once_with("Bangalore", 5, "abc")
+
+
+def test_search_locations_limit_too_large(location_client):
+    client, mock_service = location_client
+
+    response = client.get("/api/locations/search?q=Bangalore&limit=500")
+
+    assert response.status_code == 400
+    mock_service.search_locations.assert_not_called()
+
+
+def test_find_nearest_locations(location_client):
+    client, mock_service = location_client
+    mock_service.find_nearest.return_value = NearestLocationResponse(
+        message="Locations found",
+        data=[
+            NearestLocationData(
+                pincode="560034",
+                city="Bangalore",
+                state="Karnataka",
+                district="Bangalore Urban",
+                area="Koramangala",
+                latitude=12.9352,
+                longitude=77.6245,
+                distance_km=0.4,
+            )
+        ],
+    )
+
+    response = client.get("/api/locations/nearest?lat=12.93&lon=77.62&k=3")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["data"][0]["pincode"] == "560034"
+    assert data["data"][0]["distance_km"] == 0.4
+    mock_service.find_nearest.assert_called_once_with(12.93, 77.62, 3)
+
+
+def test_find_nearest_locations_default_k(location_client):
+    client, mock_service = location_client
+    mock_service.find_nearest.return_value = NearestLocationResponse(
+        message="No locations found", data=[]
+    )
+
+    client.get("/api/locations/nearest?lat=12.93&lon=77.62")
+
+    mock_service.find_nearest.assert_called_once_with(12.93, 77.62, 10)
+
+
+def test_find_nearest_locations_invalid_coordinates(location_client):
+    client, mock_service = location_client
+
+    response = client.get("/api/locations/nearest?lat=95&lon=77.62")
+
+    assert response.status_code == 400
+    mock_service.find_nearest.assert_not_called()
+
+
+def test_resolve_locations_batch(location_client):
+    client, mock_service = location_client
+    mock_service.resolve_batch.return_value = LocationBatchResponse(
+        message="Resolved 1 of 2 queries",
+        data={
+            "560001": [
+                LocationData(
+                    pincode="560001",
+                    city="Bangalore",
+                    state="Karnataka",
+                    district="Bangalore Urban",
+                    area="MG Road",
+                )
+            ],
+            "999999": [],
+        },
+    )
+
+    response = client.post(
+        "/api/locations/batch", json={"queries": ["560001", "999999"]}
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    assert data["560001"][0]["area"] == "MG Road"
+    assert data["999999"] == []
+    mock_service.resolve_batch.assert_called_once_with(["560001", "999999"])
+
+
+def test_resolve_locations_batch_too_many(location_client):
+    client, mock_service = location_client
+
+    response = client.post(
+        "/api/locations/batch", json={"queries": [str(i) for i in range(201)]}
+    )
+
+    assert response.status_code == 400
+    mock_service.resolve_batch.assert_not_called()
+
+
+def test_resolve_locations_batch_empty(location_client):
+    client, mock_service = location_client
+
+    response = client.post("/api/locations/batch", json={"queries": []})
+
+    assert response.status_code == 400
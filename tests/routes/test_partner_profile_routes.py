@@ -5,6 +5,8 @@ from app.routes.partner_profile_routes import create_partner_profile_routes
 from app.contracts.partner_profile_contracts import (
     PartnerProfileResponse,
     PartnerProfileData,
+    DiscoverPartnersResponse,
+    DiscoveredPartnerData,
 )
 from app.utils.errors import register_error_handlers
 
@@ -118,3 +120,39 @@ def test_update_profile_success(profile_client, mocker):
     assert response.status_code == 200
     data = response.get_json()
     assert data["data"]["businessName"] == "Updated Business"
+
+
+def test_discover_partners_success(profile_client):
+    client, mock_service = profile_client
+    mock_service.discover_partners.return_value = DiscoverPartnersResponse(
+        message="Partners found",
+        data=[
+            DiscoveredPartnerData(
+                partnerId="partner-id",
+                businessName="Test Business",
+                city="Bangalore",
+                state="Karnataka",
+                pincode="560034",
+                businessType="Rental",
+                categories=["Tents"],
+                serviceAreas=["Koramangala"],
+                deliveryRadius="10",
+                distanceKm=1.5,
+            )
+        ],
+    )
+
+    response = client.get("/api/partner/discover?pincode=560034")
+
+    assert response.status_code == 200
+    assert response.get_json()["data"][0]["partnerId"] == "partner-id"
+    mock_service.discover_partners.assert_called_once_with("560034", 20)
+
+
+def test_discover_partners_invalid_pincode(profile_client):
+    client, mock_service = profile_client
+
+    response = client.get("/api/partner/discover?pincode=5600")
+
+    assert response.status_code == 400
+    mock_service.discover_partners.assert_not_called()
@@ -2,7 +2,12 @@ import pytest
 from unittest.mock import Mock
 from app.services.auth_service import AuthService
 from app.models.rental_partner import RentalPartner
-from app.utils.errors import ValidationError, UnauthorizedError, ConflictError
+from app.utils.errors import (
+    ValidationError,
+    UnauthorizedError,
+    ConflictError,
+    ServiceUnavailableError,
+)
 
 
 @pytest.fixture
@@ -21,7 +26,15 @@ def mock_profile_repo():
 
 
 @pytest.fixture
-def auth_service(mock_repository, mock_blacklist_repo, mock_profile_repo):
+def mock_hasher():
+    hasher = Mock()
+    hasher.hash.return_value = "hashed"
+    hasher.needs_rehash.return_value = False
+    return hasher
+
+
+@pytest.fixture
+def auth_service(mock_repository, mock_blacklist_repo, mock_profile_repo, mock_hasher):
     return AuthService(
         repository=mock_repository,
         blacklist_repo=mock_blacklist_repo,
@@ -31,6 +44,7 @@ def auth_service(mock_repository, mock_blacklist_repo, mock_profile_repo):
         refresh_expiration=720,
         min_password_length=8,
         remember_me_multiplier=24,
+        password_hasher=mock_hasher,
     )
 
 
@@ -68,6 +82,7 @@ def test_sign_up_success(
     assert response.data.token is not None
     assert response.data.refreshToken is not None
     mock_profile_repo.create.assert_called_once()
+    assert mock_repository.create.call_args.kwargs["password_hash"] == "hashed"
 
 
 def test_sign_up_terms_not_agreed(auth_service):
@@ -126,7 +141,7 @@ def test_sign_up_email_exists(auth_service, mock_repository, mock_partner):
 
 def test_sign_in_success(auth_service, mock_repository, mock_partner, mocker):
     mock_repository.find_by_email.return_value = mock_partner
-    mocker.patch("app.services.auth_service.verify_password", return_value=True)
+    auth_service.password_hasher.verify.return_value = True
 
     response = auth_service.sign_in(
         email="test@example.com", password="password123", remember_me=False
@@ -147,7 +162,7 @@ def test_sign_in_invalid_email(auth_service, mock_repository):
 
 def test_sign_in_invalid_password(auth_service, mock_repository, mock_partner, mocker):
     mock_repository.find_by_email.return_value = mock_partner
-    mocker.patch("app.services.auth_service.verify_password", return_value=False)
+    auth_service.password_hasher.verify.return_value = False
 
     with pytest.raises(UnauthorizedError, match="Invalid email or password"):
         auth_service.sign_in(
@@ -157,7 +172,7 @@ def test_sign_in_invalid_password(auth_service, mock_repository, mock_partner, m
 
 def test_sign_in_remember_me(auth_service, mock_repository, mock_partner, mocker):
     mock_repository.find_by_email.return_value = mock_partner
-    mocker.patch("app.services.auth_service.verify_password", return_value=True)
+    auth_service.password_hasher.verify.return_value = True
     mock_generate = mocker.patch(
         "app.services.auth_service.generate_token", return_value="token"
     )
@@ -185,6 +200,18 @@ def test_sign_out_success(auth_service, mock_blacklist_repo, mocker):
     mock_blacklist_repo.blacklist.assert_called_once()
 
 
+def test_sign_out_revokes_in_local_cache(auth_service, mocker):
+    mocker.patch(
+        "app.services.auth_service.decode_token",
+        return_value={"partner_id": "test-id", "exp": 1234567890},
+    )
+    auth_service.revocation_cache = Mock()
+
+    auth_service.sign_out("valid.jwt.token")
+
+    auth_service.revocation_cache.add.assert_called_once_with("valid.jwt.token")
+
+
 def test_sign_out_expired_token(auth_service, mocker):
     import jwt as pyjwt
 
@@ -208,3 +235,59 @@ def test_sign_out_invalid_token(auth_service, mocker):
 
     with pytest.raises(UnauthorizedError, match="Invalid token"):
         auth_service.sign_out(token)
+
+
+def test_sign_in_busy_hasher_is_unavailable(
+    auth_service, mock_repository, mock_partner
+):
+    mock_repository.find_by_email.return_value = mock_partner
+    auth_service.password_hasher.verify.side_effect = ServiceUnavailableError()
+
+    with pytest.raises(ServiceUnavailableError):
+        auth_service.sign_in(
+            email="test@example.com", password="password123", remember_me=False
+        )
+
+
+def test_sign_in_rehashes_outdated_password(
+    auth_service, mock_repository, mock_partner
+):
+    mock_repository.find_by_email.return_value = mock_partner
+    auth_service.password_hasher.verify.return_value = True
+    auth_service.password_hasher.needs_rehash.return_value = True
+
+    auth_service.sign_in(
+        email="test@example.com", password="password123", remember_me=False
+    )
+
+    auth_service.password_hasher.hash.assert_called_once_with("password123")
+    mock_repository.update_password_hash.assert_called_once_with("test-id", "hashed")
+
+
+def test_sign_in_current_hash_not_rewritten(
+    auth_service, mock_repository, mock_partner
+):
+    mock_repository.find_by_email.return_value = mock_partner
+    auth_service.password_hasher.verify.return_value = True
+
+    auth_service.sign_in(
+        email="test@example.com", password="password123", remember_me=False
+    )
+
+    mock_repository.update_password_hash.assert_not_called()
+
+
+def test_sign_in_succeeds_when_rehash_is_shed(
+    auth_service, mock_repository, mock_partner
+):
+    mock_repository.find_by_email.return_value = mock_partner
+    auth_service.password_hasher.verify.return_value = True
+    auth_service.password_hasher.needs_rehash.return_value = True
+    auth_service.password_hasher.hash.side_effect = ServiceUnavailableError()
+
+    response = auth_service.sign_in(
+        email="test@example.com", password="password123", remember_me=False
+    )
+
+    assert response.success is True
+    mock_repository.update_password_hash.assert_not_called()
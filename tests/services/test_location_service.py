@@ -1,8 +1,24 @@
+import threading
 import pytest
 from unittest.mock import Mock
-from app.services.location_service import LocationService
+from app.services.location_service import LocationService, SearchPage
+from app.services.nominatim_service import GeocodingUnavailableError
 from app.models.location import Location
+from app.repositories.location_repository import LocationPage
+from app.utils.cursor import decode_cursor, encode_cursor
+from app.utils.location_search_index import SEARCH_TIERS, IndexedLocation
 from app.utils.errors import ValidationError
+from app.utils.ttl_cache import TTLCache
+from app.utils.single_flight import SingleFlight
+from app.utils.fuzzy_index import FuzzyLocationIndex
+from app.utils.spatial_index import NearbyLocation
+
+
+def in_tiers(**tiers):
+    """search_tier side effect serving the given rows per ranking tier."""
+    return lambda tier, query, limit, cursor: LocationPage(
+        tiers.get(tier, [])[:limit], None
+    )
 
 
 @pytest.fixture
@@ -36,8 +52,13 @@ def test_search_locations_query_too_short(location_service):
         location_service.search_locations("a")
 
 
+def test_search_locations_query_only_punctuation(location_service):
+    with pytest.raises(ValidationError, match="at least 2 characters"):
+        location_service.search_locations(" ,, ")
+
+
 def test_search_locations_found_in_db(location_service, mock_repository, mock_location):
-    mock_repository.search_locations.return_value = [mock_location]
+    mock_repository.search_tier.side_effect = in_tiers(exact=[mock_location])
 
     response = location_service.search_locations("Bangalore")
 
@@ -46,10 +67,82 @@ def test_search_locations_found_in_db(location_service, mock_repository, mock_lo
     assert response.message == "Locations found"
 
 
+def test_search_locations_ranks_tiers_in_order(
+    location_service, mock_repository, mock_location
+):
+    prefix_match = Mock(
+        spec=Location,
+        pincode="560001",
+        city="Bangalore",
+        state="Karnataka",
+        district="Bangalore Urban",
+        area="Bangalore GPO",
+    )
+    mock_repository.search_tier.side_effect = in_tiers(
+        exact=[mock_location], prefix=[prefix_match]
+    )
+
+    response = location_service.search_locations("Bangalore")
+
+    assert [loc.area for loc in response.data] == ["MG Road", "Bangalore GPO"]
+    assert response.next_cursor is None
+    assert [c.args[:3] for c in mock_repository.search_tier.call_args_list] == [
+        ("exact", "bangalore", 20),
+        ("prefix", "bangalore", 19),
+        ("substring", "bangalore", 18),
+    ]
+
+
+def test_search_locations_full_page_skips_later_tiers(
+    location_service, mock_repository, mock_location
+):
+    mock_repository.search_tier.side_effect = in_tiers(exact=[mock_location])
+
+    response = location_service.search_locations("Bangalore", 1)
+
+    mock_repository.search_tier.assert_called_once_with("exact", "bangalore", 1, None)
+    assert decode_cursor(response.next_cursor) == ["prefix", None]
+
+
+def test_search_locations_returns_tier_cursor(
+    location_service, mock_repository, mock_location
+):
+    mock_repository.search_tier.return_value = LocationPage([mock_location], "next")
+
+    response = location_service.search_locations("Bangalore", 1)
+
+    assert decode_cursor(response.next_cursor) == ["exact", "next"]
+
+
+def test_search_locations_cursor_skips_cache_and_geocoding(
+    cached_location_service, mock_repository, mock_geocoding_service
+):
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    cursor = encode_cursor(["prefix", "next"])
+
+    response = cached_location_service.search_locations("Bangalore", 10, cursor)
+
+    assert response.message == "No locations found"
+    assert len(cached_location_service.cache) == 0
+    assert [c.args for c in mock_repository.search_tier.call_args_list] == [
+        ("prefix", "bangalore", 10, "next"),
+        ("substring", "bangalore", 10, None),
+    ]
+    mock_geocoding_service.search_places.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "position", [["nearest", None], ["exact"], ["exact", 5], ["exact", None, 1]]
+)
+def test_search_locations_rejects_invalid_cursor(location_service, position):
+    with pytest.raises(ValidationError, match="Invalid cursor"):
+        location_service.search_locations("Bangalore", 10, encode_cursor(position))
+
+
 def test_search_locations_not_in_db_found_in_api(
     location_service, mock_repository, mock_geocoding_service
 ):
-    mock_repository.search_locations.return_value = []
+    mock_repository.search_tier.return_value = LocationPage([], None)
     api_results = [
         {
             "pincode": "560001",
@@ -66,17 +159,543 @@ def test_search_locations_not_in_db_found_in_api(
 
     assert len(response.data) == 1
     assert response.data[0].city == "Bangalore"
-    mock_geocoding_service.search_places.assert_called_once_with("Bangalore")
+    mock_geocoding_service.search_places.assert_called_once_with("bangalore", 20, None)
     mock_repository.bulk_create.assert_called_once_with(api_results)
 
 
 def test_search_locations_not_found(
     location_service, mock_repository, mock_geocoding_service
 ):
-    mock_repository.search_locations.return_value = []
+    mock_repository.search_tier.return_value = LocationPage([], None)
     mock_geocoding_service.search_places.return_value = []
 
     response = location_service.search_locations("Unknown")
 
     assert len(response.data) == 0
     assert response.message == "No locations found"
+
+
+def test_search_locations_full_pincode_uses_exact_lookup(
+    location_service, mock_repository, mock_location
+):
+    mock_repository.find_by_pincode.return_value = [mock_location]
+
+    response = location_service.search_locations("560001")
+
+    assert response.data[0].pincode == "560001"
+    mock_repository.find_by_pincode.assert_called_once_with("560001", 20)
+    mock_repository.search_tier.assert_not_called()
+    mock_repository.search_by_pincode_prefix.assert_not_called()
+
+
+def test_search_locations_partial_pincode_uses_prefix_lookup(
+    location_service, mock_repository, mock_location
+):
+    mock_repository.search_by_pincode_prefix.return_value = [mock_location]
+
+    response = location_service.search_locations("5600")
+
+    assert len(response.data) == 1
+    mock_repository.search_by_pincode_prefix.assert_called_once_with("5600", 20)
+    mock_repository.search_tier.assert_not_called()
+    mock_repository.find_by_pincode.assert_not_called()
+
+
+@pytest.fixture
+def cached_location_service(mock_repository, mock_geocoding_service):
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=10)
+    return LocationService(mock_repository, mock_geocoding_service, cache=cache)
+
+
+def test_search_locations_served_from_cache(
+    cached_location_service, mock_repository, mock_location
+):
+    mock_repository.search_tier.side_effect = in_tiers(exact=[mock_location])
+
+    cached_location_service.search_locations("Bangalore")
+    response = cached_location_service.search_locations(" BANGALORE, Karnataka ")
+
+    assert response.data[0].city == "Bangalore"
+    assert mock_repository.search_tier.call_count == len(SEARCH_TIERS)
+    assert cached_location_service.cache.stats()["hits"] == 1
+
+
+def test_search_locations_caches_misses(
+    cached_location_service, mock_repository, mock_geocoding_service
+):
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.return_value = []
+
+    cached_location_service.search_locations("Unknown")
+    response = cached_location_service.search_locations("Unknown")
+
+    assert response.message == "No locations found"
+    mock_geocoding_service.search_places.assert_called_once()
+
+
+def test_search_locations_new_rows_invalidate_cache(
+    cached_location_service, mock_repository, mock_geocoding_service, mock_location
+):
+    cache = cached_location_service.cache
+    cache.set("stale", SearchPage([]))
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.return_value = [
+        {
+            "pincode": "560001",
+            "city": "Bangalore",
+            "state": "Karnataka",
+            "district": "Bangalore Urban",
+            "area": "MG Road",
+        }
+    ]
+    mock_repository.bulk_create.return_value = [mock_location]
+
+    cached_location_service.search_locations("MG Road")
+
+    assert cache.get("stale") is None
+    assert cache.get("20:mg road") is not None
+
+
+def test_search_locations_coalesced_geocoding_rechecks_database(
+    mock_repository, mock_geocoding_service, mock_location
+):
+    single_flight = Mock()
+    single_flight.do.side_effect = lambda key, fn, timeout: fn(True)
+    service = LocationService(
+        mock_repository, mock_geocoding_service, single_flight=single_flight
+    )
+    # Another worker stored the rows while this one waited for the lock
+    mock_repository.search_tier.side_effect = [
+        LocationPage([], None),
+        LocationPage([], None),
+        LocationPage([], None),
+        LocationPage([mock_location], None),
+        LocationPage([], None),
+        LocationPage([], None),
+    ]
+
+    response = service.search_locations("MG Road")
+
+    assert response.data[0].area == "MG Road"
+    mock_geocoding_service.search_places.assert_not_called()
+
+
+def test_search_locations_coalesced_wait_is_bounded_by_budget(
+    mock_repository, mock_geocoding_service
+):
+    single_flight = Mock()
+    single_flight.do.side_effect = TimeoutError("still in flight")
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=10)
+    service = LocationService(
+        mock_repository,
+        mock_geocoding_service,
+        cache=cache,
+        single_flight=single_flight,
+        fallback_budget=1.5,
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+
+    response = service.search_locations("MG Road")
+
+    assert response.data == []
+    assert single_flight.do.call_args.args[2] == pytest.approx(1.5, abs=0.1)
+    assert len(cache) == 0
+
+
+def test_search_locations_coalesced_geocoding(mock_repository, mock_geocoding_service):
+    service = LocationService(
+        mock_repository, mock_geocoding_service, single_flight=SingleFlight()
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.return_value = [
+        {
+            "pincode": "560001",
+            "city": "Bangalore",
+            "state": "Karnataka",
+            "district": "Bangalore Urban",
+            "area": "MG Road",
+        }
+    ]
+    mock_repository.bulk_create.return_value = []
+
+    response = service.search_locations("MG Road")
+
+    assert response.data[0].area == "MG Road"
+    mock_geocoding_service.search_places.assert_called_once_with("mg road", 20, None)
+    # Nobody held the lock, so the three tier queries are not repeated
+    assert mock_repository.search_tier.call_count == 3
+
+
+def test_search_locations_geocoding_unavailable_is_not_cached(
+    cached_location_service, mock_repository, mock_geocoding_service
+):
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.side_effect = GeocodingUnavailableError(
+        "Geocoding rate limit reached"
+    )
+
+    response = cached_location_service.search_locations("Koramangala")
+
+    assert response.data == []
+    assert response.message == "No locations found"
+    assert cached_location_service.cache.get("20:koramangala") is None
+
+
+def test_search_locations_passes_fallback_budget(
+    mock_repository, mock_geocoding_service
+):
+    clock = Mock(side_effect=[10.0, 10.5])
+    service = LocationService(
+        mock_repository, mock_geocoding_service, fallback_budget=2.0, clock=clock
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.return_value = []
+
+    service.search_locations("Koramangala")
+
+    mock_geocoding_service.search_places.assert_called_once_with("koramangala", 20, 1.5)
+
+
+def test_resolve_batch_shares_one_fallback_budget(
+    mock_repository, mock_geocoding_service
+):
+    clock = Mock(side_effect=[10.0, 10.5, 12.0])
+    service = LocationService(
+        mock_repository, mock_geocoding_service, fallback_budget=2.0, clock=clock
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.side_effect = [
+        [],
+        GeocodingUnavailableError("Geocoding time budget exhausted"),
+    ]
+
+    response = service.resolve_batch(["Koramangala", "Indiranagar"])
+
+    assert response.data == {"Koramangala": [], "Indiranagar": []}
+    timeouts = [
+        c.kwargs["timeout"] for c in mock_geocoding_service.search_places.call_args_list
+    ]
+    assert timeouts == [1.5, 0.0]
+
+
+def test_search_locations_hands_geocoded_rows_to_writer(
+    mock_repository, mock_geocoding_service
+):
+    writer = Mock()
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=10)
+    service = LocationService(
+        mock_repository, mock_geocoding_service, cache=cache, writer=writer
+    )
+    api_results = [
+        {
+            "pincode": "560001",
+            "city": "Bangalore",
+            "state": "Karnataka",
+            "district": "Bangalore Urban",
+            "area": "MG Road",
+        }
+    ]
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.return_value = api_results
+
+    response = service.search_locations("MG Road")
+
+    assert response.data[0].area == "MG Road"
+    writer.submit.assert_called_once_with(api_results)
+    mock_repository.bulk_create.assert_not_called()
+
+    writer.on_persisted(["saved"])
+    assert len(cache) == 0
+
+
+def test_search_locations_fuzzy_match_skips_geocoding(
+    mock_repository, mock_geocoding_service
+):
+    service = LocationService(
+        mock_repository, mock_geocoding_service, fuzzy_index=FuzzyLocationIndex()
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_repository.iter_locations.return_value = iter(
+        [
+            IndexedLocation(
+                "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+            )
+        ]
+    )
+
+    response = service.search_locations("Banglore")
+
+    assert response.data[0].city == "Bangalore"
+    mock_geocoding_service.search_places.assert_not_called()
+    mock_repository.iter_locations.assert_called_once()
+
+
+def test_search_locations_geocoded_rows_join_fuzzy_index(
+    mock_repository, mock_geocoding_service
+):
+    service = LocationService(
+        mock_repository, mock_geocoding_service, fuzzy_index=FuzzyLocationIndex()
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_repository.iter_locations.return_value = iter([])
+    mock_repository.bulk_create.return_value = []
+    mock_geocoding_service.search_places.return_value = [
+        {
+            "pincode": "695001",
+            "city": "Thiruvananthapuram",
+            "state": "Kerala",
+            "district": "Thiruvananthapuram",
+            "area": "Palayam",
+        }
+    ]
+    service.search_locations("Thiruvananthapuram")
+    mock_geocoding_service.search_places.reset_mock()
+
+    response = service.search_locations("Thiruvanantpuram")
+
+    assert response.data[0].pincode == "695001"
+    mock_geocoding_service.search_places.assert_not_called()
+
+
+def test_find_nearest(location_service, mock_repository):
+    mock_repository.find_nearest.return_value = [
+        NearbyLocation(
+            IndexedLocation("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort"),
+            18.93,
+            72.83,
+            1.23456,
+        )
+    ]
+
+    response = location_service.find_nearest(18.94, 72.83, 3)
+
+    mock_repository.find_nearest.assert_called_once_with(18.94, 72.83, 3)
+    assert response.message == "Locations found"
+    assert response.data[0].area == "Fort"
+    assert response.data[0].latitude == 18.93
+    assert response.data[0].distance_km == 1.235
+
+
+def test_find_nearest_no_results(location_service, mock_repository):
+    mock_repository.find_nearest.return_value = []
+
+    response = location_service.find_nearest(0.0, 0.0)
+
+    assert response.message == "No locations found"
+    assert response.data == []
+
+
+def test_resolve_batch_single_pincode_query_keyed_by_input(
+    location_service, mock_repository, mock_geocoding_service, mock_location
+):
+    mock_repository.find_by_pincodes.return_value = {"560001": [mock_location]}
+    mock_repository.search_tier.side_effect = in_tiers(exact=[mock_location])
+
+    response = location_service.resolve_batch(["560001", " 560001 ", "MG Road", "x"])
+
+    mock_repository.find_by_pincodes.assert_called_once_with(["560001"])
+    mock_repository.find_by_pincode.assert_not_called()
+    assert response.data["560001"][0].area == "MG Road"
+    assert response.data[" 560001 "][0].area == "MG Road"
+    assert response.data["MG Road"][0].city == "Bangalore"
+    assert response.data["x"] == []
+    assert response.message == "Resolved 3 of 4 queries"
+    mock_geocoding_service.search_places.assert_not_called()
+
+
+def test_resolve_batch_geocodes_misses_in_one_bounded_pass(
+    mock_repository, mock_geocoding_service
+):
+    service = LocationService(
+        mock_repository, mock_geocoding_service, batch_geocode_limit=2
+    )
+    mock_repository.find_by_pincodes.return_value = {}
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_repository.bulk_create.return_value = []
+    mock_geocoding_service.search_places.side_effect = lambda query, timeout: [
+        {
+            "pincode": "000000",
+            "city": query,
+            "state": "Kerala",
+            "district": query,
+            "area": query,
+        }
+    ]
+
+    response = service.resolve_batch(["Kochi", "Munnar", "Alleppey"])
+
+    assert mock_geocoding_service.search_places.call_count == 2
+    mock_repository.bulk_create.assert_called_once()
+    assert len(mock_repository.bulk_create.call_args.args[0]) == 2
+    assert response.data["Kochi"][0].area == "kochi"
+    assert response.data["Alleppey"] == []
+
+
+def test_resolve_batch_stops_geocoding_when_unavailable(
+    mock_repository, mock_geocoding_service
+):
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=10)
+    service = LocationService(mock_repository, mock_geocoding_service, cache=cache)
+    mock_repository.find_by_pincodes.return_value = {}
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.side_effect = GeocodingUnavailableError(
+        "Geocoding rate limit reached"
+    )
+
+    response = service.resolve_batch(["Kochi", "Munnar", "110001"])
+
+    assert mock_geocoding_service.search_places.call_count == 1
+    assert response.data == {"Kochi": [], "Munnar": [], "110001": []}
+    assert len(cache) == 0
+
+
+def test_resolve_batch_uses_cache(
+    mock_repository, mock_geocoding_service, mock_location
+):
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=10)
+    service = LocationService(mock_repository, mock_geocoding_service, cache=cache)
+    mock_repository.find_by_pincodes.return_value = {"560001": [mock_location]}
+
+    service.resolve_batch(["560001"])
+    response = service.resolve_batch(["560001"])
+
+    mock_repository.find_by_pincodes.assert_called_once()
+    assert response.data["560001"][0].pincode == "560001"
+
+
+def test_resolve_batch_keeps_search_cursor_in_cache(
+    mock_repository, mock_geocoding_service, mock_location
+):
+    cache = TTLCache(max_size=10, ttl=60, negative_ttl=10)
+    service = LocationService(mock_repository, mock_geocoding_service, cache=cache)
+    mock_repository.search_tier.return_value = LocationPage([mock_location], "next")
+
+    service.resolve_batch(["MG Road"])
+    response = service.search_locations("MG Road")
+
+    assert mock_repository.search_tier.call_count == 1
+    assert decode_cursor(response.next_cursor) == ["exact", "next"]
+
+
+def test_search_locations_skips_fuzzy_until_background_load_finishes(
+    mock_repository, mock_geocoding_service
+):
+    loader = Mock()
+    service = LocationService(
+        mock_repository,
+        mock_geocoding_service,
+        fuzzy_index=FuzzyLocationIndex(),
+        fuzzy_loader=loader,
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_repository.bulk_create.return_value = []
+    mock_geocoding_service.search_places.return_value = []
+
+    service.search_locations("Banglore")
+
+    loader.ensure_running.assert_called_once_with(service._load_fuzzy_index)
+    mock_geocoding_service.search_places.assert_called_once()
+    mock_repository.iter_locations.assert_not_called()
+
+    mock_repository.iter_locations.return_value = iter(
+        [
+            IndexedLocation(
+                "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+            )
+        ]
+    )
+    service._load_fuzzy_index()
+    mock_geocoding_service.search_places.reset_mock()
+
+    response = service.search_locations("Banglore")
+
+    assert response.data[0].city == "Bangalore"
+    mock_geocoding_service.search_places.assert_not_called()
+
+
+def test_worker_queued_behind_lock_sees_rows_despite_write_behind(tmp_path):
+    saved = []
+    repository = Mock()
+    repository.search_tier.side_effect = lambda tier, query, limit, cursor: (
+        LocationPage(list(saved) if tier == "exact" else [], None)
+    )
+
+    def bulk_create(rows):
+        locations = [Location(**row) for row in rows]
+        saved.extend(locations)
+        return locations
+
+    repository.bulk_create.side_effect = bulk_create
+    row = {
+        "pincode": "560001",
+        "city": "Bangalore",
+        "state": "Karnataka",
+        "district": "Bangalore Urban",
+        "area": "MG Road",
+    }
+    geocoding_started = threading.Event()
+    release = threading.Event()
+    leader_geocoder = Mock()
+
+    def slow_geocode(*args):
+        geocoding_started.set()
+        release.wait(timeout=5)
+        return [row]
+
+    leader_geocoder.search_places.side_effect = slow_geocode
+    follower_geocoder = Mock()
+    lock_dir = str(tmp_path / "locks")
+    # Two workers: separate services and locks, one database, and writers
+    # that never flush on their own
+    leader = LocationService(
+        repository,
+        leader_geocoder,
+        single_flight=SingleFlight(lock_dir=lock_dir),
+        writer=Mock(),
+    )
+    follower = LocationService(
+        repository,
+        follower_geocoder,
+        single_flight=SingleFlight(lock_dir=lock_dir),
+        writer=Mock(),
+    )
+
+    thread = threading.Thread(target=leader.search_locations, args=("MG Road",))
+    thread.start()
+    assert geocoding_started.wait(timeout=5)
+    timer = threading.Timer(0.1, release.set)
+    timer.start()
+
+    response = follower.search_locations("MG Road")
+    thread.join(timeout=5)
+
+    assert response.data[0].area == "MG Road"
+    follower_geocoder.search_places.assert_not_called()
+    leader.writer.submit.assert_not_called()
+
+
+def test_geocoded_rows_use_write_behind_without_cross_worker_lock(
+    mock_repository, mock_geocoding_service
+):
+    writer = Mock()
+    service = LocationService(
+        mock_repository,
+        mock_geocoding_service,
+        single_flight=SingleFlight(),
+        writer=writer,
+    )
+    mock_repository.search_tier.return_value = LocationPage([], None)
+    mock_geocoding_service.search_places.return_value = [
+        {
+            "pincode": "560001",
+            "city": "Bangalore",
+            "state": "Karnataka",
+            "district": "Bangalore Urban",
+            "area": "MG Road",
+        }
+    ]
+
+    service.search_locations("MG Road")
+
+    writer.submit.assert_called_once()
+    mock_repository.bulk_create.assert_not_called()
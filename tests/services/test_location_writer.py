@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+from app.services.location_writer import LocationWriter
+
+
+@pytest.fixture
+def mock_repository():
+    repository = Mock()
+    repository.bulk_create.side_effect = lambda rows: list(rows)
+    return repository
+
+
+@pytest.fixture
+def writer(mock_repository):
+    writer = LocationWriter(
+        Flask(__name__), mock_repository, max_queue=5, batch_size=3, flush_interval=0.05
+    )
+    yield writer
+    writer.shutdown()
+
+
+def make_rows(count):
+    return [
+        {
+            "pincode": f"56000{i}",
+            "city": "Bangalore",
+            "state": "Karnataka",
+            "district": "Bangalore Urban",
+            "area": f"Area {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_submit_flushes_in_batches(writer, mock_repository):
+    assert writer.submit(make_rows(4)) == 4
+    writer.shutdown()
+
+    batch_sizes = [len(c.args[0]) for c in mock_repository.bulk_create.call_args_list]
+    assert sum(batch_sizes) == 4
+    assert max(batch_sizes) <= 3
+    assert writer.stats()["flushed"] == 4
+
+
+def test_submit_drops_rows_when_queue_full(mock_repository):
+    writer = LocationWriter(Flask(__name__), mock_repository, max_queue=2)
+    writer._ensure_started = Mock()
+
+    assert writer.submit(make_rows(3)) == 2
+    assert writer.stats()["dropped"] == 1
+    assert writer.stats()["queue_depth"] == 2
+
+
+def test_failed_flush_is_counted(writer, mock_repository, mocker):
+    mock_db = mocker.patch("app.services.location_writer.db")
+    mock_repository.bulk_create.side_effect = Exception("DB down")
+
+    writer.submit(make_rows(2))
+    writer.shutdown()
+
+    assert writer.stats()["failed"] == 2
+    mock_db.session.rollback.assert_called()
+
+
+def test_on_persisted_called_with_saved_rows(writer):
+    on_persisted = Mock()
+    writer.on_persisted = on_persisted
+
+    writer.submit(make_rows(1))
+    writer.shutdown()
+
+    on_persisted.assert_called_once()
+    assert on_persisted.call_args.args[0][0]["area"] == "Area 0"
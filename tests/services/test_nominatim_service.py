@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import Mock
-from app.services.nominatim_service import NominatimService
+from app.services.nominatim_service import NominatimService, GeocodingUnavailableError
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.response_cache import SQLiteResponseCache
 
 
 @pytest.fixture
@@ -22,7 +24,7 @@ def test_search_places_success(nominatim_service, mocker):
         }
     ]
     mock_response.raise_for_status = Mock()
-    mocker.patch("requests.get", return_value=mock_response)
+    mocker.patch("requests.Session.get", return_value=mock_response)
 
     results = nominatim_service.search_places("Bangalore")
 
@@ -33,15 +35,31 @@ def test_search_places_success(nominatim_service, mocker):
 def test_search_places_request_exception(nominatim_service, mocker):
     import requests
 
-    mocker.patch("requests.get", side_effect=requests.RequestException("API error"))
+    mocker.patch(
+        "requests.Session.get", side_effect=requests.RequestException("API error")
+    )
 
-    results = nominatim_service.search_places("Bangalore")
+    with pytest.raises(GeocodingUnavailableError, match="API error"):
+        nominatim_service.search_places("Bangalore")
 
-    assert results == []
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_search_places_upstream_errors_are_unavailable(status, mocker):
+    import requests
+
+    service = NominatimService(max_retries=0)
+    mock_response = Mock(status_code=status)
+    mock_response.raise_for_status.side_effect = requests.HTTPError(
+        response=mock_response
+    )
+    mocker.patch.object(service.session, "get", return_value=mock_response)
+
+    with pytest.raises(GeocodingUnavailableError):
+        service.search_places("Bangalore")
 
 
 def test_search_places_general_exception(nominatim_service, mocker):
-    mocker.patch("requests.get", side_effect=Exception("Unexpected error"))
+    mocker.patch("requests.Session.get", side_effect=Exception("Unexpected error"))
 
     results = nominatim_service.search_places("Bangalore")
 
@@ -65,6 +83,28 @@ def test_parse_result_valid(nominatim_service):
     assert parsed["pincode"] == "560001"
 
 
+def test_parse_result_coordinates(nominatim_service):
+    result = {
+        "lat": "12.9716",
+        "lon": "77.5946",
+        "address": {"city": "Bangalore", "state": "Karnataka"},
+    }
+
+    parsed = nominatim_service._parse_result(result)
+
+    assert parsed["latitude"] == 12.9716
+    assert parsed["longitude"] == 77.5946
+
+
+def test_parse_result_without_coordinates(nominatim_service):
+    result = {"lat": "n/a", "address": {"city": "Bangalore", "state": "Karnataka"}}
+
+    parsed = nominatim_service._parse_result(result)
+
+    assert parsed["latitude"] is None
+    assert parsed["longitude"] is None
+
+
 def test_parse_result_missing_state(nominatim_service):
     result = {"address": {"city": "Bangalore"}}
 
@@ -130,3 +170,328 @@ def test_parse_result_with_municipality(nominatim_service):
 
     assert parsed["area"] == "Test Municipality"
     assert parsed["city"] == "Test Municipality"
+
+
+def test_search_places_uses_response_cache(mocker, tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), 60, 100)
+    service = NominatimService(response_cache=cache)
+    mock_response = Mock()
+    mock_response.json.return_value = [
+        {"address": {"city": "Bangalore", "state": "Karnataka"}}
+    ]
+    mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+    first = service.search_places("Bangalore")
+    second = service.search_places("Bangalore")
+
+    assert first == second
+    assert second[0]["city"] == "Bangalore"
+    mock_get.assert_called_once()
+
+
+def test_search_places_caches_empty_response_briefly(mocker, tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), 604800, 100)
+    set_entry = mocker.spy(cache, "set")
+    service = NominatimService(response_cache=cache, empty_response_ttl=300)
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mocker.patch("requests.Session.get", return_value=mock_response)
+
+    service.search_places("Unknown Place")
+
+    assert set_entry.call_args.args[2] == 300
+
+
+def test_search_places_does_not_cache_failures(mocker, tmp_path):
+    import requests
+
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), 60, 100)
+    service = NominatimService(response_cache=cache)
+    mock_get = mocker.patch(
+        "requests.Session.get", side_effect=requests.RequestException("API error")
+    )
+
+    for _ in range(2):
+        with pytest.raises(GeocodingUnavailableError):
+            service.search_places("Bangalore")
+
+    assert mock_get.call_count == 2
+
+
+def test_search_places_rate_limited(mocker):
+    limiter = Mock()
+    limiter.acquire.return_value = False
+    service = NominatimService(rate_limiter=limiter, rate_limit_wait=0.5)
+    mock_get = mocker.patch("requests.Session.get")
+
+    with pytest.raises(GeocodingUnavailableError):
+        service.search_places("Bangalore")
+
+    limiter.acquire.assert_called_once_with(0.5)
+    mock_get.assert_not_called()
+
+
+def test_search_places_uses_pooled_session_with_split_timeouts(mocker):
+    service = NominatimService(connect_timeout=1.5, read_timeout=4.0)
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mock_get = mocker.patch.object(service.session, "get", return_value=mock_response)
+
+    service.search_places("Bangalore")
+
+    assert mock_get.call_args.kwargs["timeout"] == (1.5, 4.0)
+
+
+def test_search_places_limit_is_capped_by_result_limit(mocker):
+    service = NominatimService(result_limit=10)
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mock_get = mocker.patch.object(service.session, "get", return_value=mock_response)
+
+    service.search_places("Bangalore", 3)
+    service.search_places("Mysore", 50)
+
+    assert [c.kwargs["params"]["limit"] for c in mock_get.call_args_list] == [3, 10]
+
+
+def test_search_places_open_circuit_skips_request(mocker):
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure()
+    limiter = Mock()
+    service = NominatimService(circuit_breaker=breaker, rate_limiter=limiter)
+    mock_get = mocker.patch.object(service.session, "get")
+
+    with pytest.raises(GeocodingUnavailableError, match="circuit open"):
+        service.search_places("Bangalore")
+
+    mock_get.assert_not_called()
+    limiter.acquire.assert_not_called()
+
+
+def test_search_places_failures_open_circuit(mocker):
+    import requests
+
+    service = NominatimService(
+        circuit_breaker=CircuitBreaker(failure_threshold=2), sleep=Mock()
+    )
+    mock_get = mocker.patch.object(
+        service.session, "get", side_effect=requests.ConnectionError("down")
+    )
+
+    for _ in range(2):
+        with pytest.raises(GeocodingUnavailableError, match="down"):
+            service.search_places("Bangalore")
+    with pytest.raises(GeocodingUnavailableError, match="circuit open"):
+        service.search_places("Bangalore")
+
+    # Each call's retries count as one failure
+    assert mock_get.call_count == 6
+
+
+def test_search_places_client_errors_do_not_open_circuit(mocker):
+    import requests
+
+    breaker = CircuitBreaker(failure_threshold=1)
+    service = NominatimService(circuit_breaker=breaker)
+    mock_response = Mock(status_code=400)
+    mock_response.raise_for_status.side_effect = requests.HTTPError(
+        response=mock_response
+    )
+    mocker.patch.object(service.session, "get", return_value=mock_response)
+
+    assert service.search_places("Bangalore") == []
+    assert breaker.state == "closed"
+
+
+def test_search_places_slow_response_counts_as_failure(mocker):
+    clock = Mock(side_effect=[0.0, 3.0])
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_seconds=2.0)
+    service = NominatimService(circuit_breaker=breaker, clock=clock)
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mocker.patch.object(service.session, "get", return_value=mock_response)
+
+    service.search_places("Bangalore")
+
+    assert breaker.state == "open"
+
+
+def test_search_places_timeout_shortens_waits(mocker):
+    limiter = Mock()
+    limiter.acquire.return_value = True
+    service = NominatimService(
+        rate_limiter=limiter,
+        rate_limit_wait=2.0,
+        connect_timeout=2.0,
+        read_timeout=3.0,
+        clock=Mock(return_value=100.0),
+    )
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mock_get = mocker.patch.object(service.session, "get", return_value=mock_response)
+
+    service.search_places("Bangalore", timeout=0.5)
+
+    limiter.acquire.assert_called_once_with(0.5)
+    assert mock_get.call_args.kwargs["timeout"] == (0.5, 0.5)
+
+
+def test_search_places_spent_budget_skips_request(mocker):
+    breaker = CircuitBreaker()
+    service = NominatimService(circuit_breaker=breaker)
+    mock_get = mocker.patch.object(service.session, "get")
+
+    with pytest.raises(GeocodingUnavailableError, match="budget"):
+        service.search_places("Bangalore", timeout=0)
+
+    mock_get.assert_not_called()
+    assert breaker.allow() is True
+
+
+def test_session_pool_configuration():
+    service = NominatimService(pool_size=8, max_retries=3, retry_backoff=0.5)
+
+    adapter = service.session.get_adapter("https://nominatim.openstreetmap.org")
+    assert adapter._pool_maxsize == 8
+    # Retries are ours, so they stay within the caller's deadline
+    assert adapter.max_retries.total == 0
+    assert service.session.headers["User-Agent"] == "CeremoServices/1.0"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_search_places_retries_transient_failures_with_backoff(mocker):
+    import requests
+
+    clock = FakeClock()
+    service = NominatimService(
+        max_retries=2, retry_backoff=0.3, clock=clock, sleep=clock.sleep
+    )
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mock_get = mocker.patch.object(
+        service.session,
+        "get",
+        side_effect=[
+            requests.Timeout("slow"),
+            requests.ConnectionError("reset"),
+            mock_response,
+        ],
+    )
+
+    assert service.search_places("Bangalore") == []
+    assert mock_get.call_count == 3
+    assert clock.now == pytest.approx(100.9)
+
+
+def test_search_places_client_errors_are_not_retried(mocker):
+    import requests
+
+    service = NominatimService(max_retries=2, sleep=Mock())
+    mock_response = Mock(status_code=404)
+    mock_response.raise_for_status.side_effect = requests.HTTPError(
+        response=mock_response
+    )
+    mock_get = mocker.patch.object(service.session, "get", return_value=mock_response)
+
+    assert service.search_places("Bangalore") == []
+    assert mock_get.call_count == 1
+
+
+def test_search_places_retries_stay_within_timeout(mocker):
+    import requests
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1)
+    service = NominatimService(
+        read_timeout=0.5,
+        max_retries=2,
+        retry_backoff=0.3,
+        circuit_breaker=breaker,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    def time_out(*args, **kwargs):
+        clock.now += kwargs["timeout"][1]
+        raise requests.Timeout("slow")
+
+    mock_get = mocker.patch.object(service.session, "get", side_effect=time_out)
+
+    with pytest.raises(GeocodingUnavailableError, match="slow"):
+        service.search_places("Bangalore", timeout=1.0)
+
+    # 0.5s attempt, 0.3s backoff, a 0.2s attempt; no time left for 0.6s more
+    assert mock_get.call_count == 2
+    assert clock.now <= 101.0
+    assert breaker.state == "open"
+
+
+def test_search_places_pool_wait_is_bounded_by_timeout(mocker):
+    service = NominatimService(pool_size=1)
+    mock_get = mocker.patch.object(service.session, "get")
+    service._connections.acquire()
+
+    with pytest.raises(GeocodingUnavailableError, match="connection"):
+        service.search_places("Bangalore", timeout=0.05)
+
+    mock_get.assert_not_called()
+
+
+def test_search_places_retries_take_a_rate_limit_slot_each(mocker):
+    import requests
+
+    clock = FakeClock()
+    limiter = Mock()
+    limiter.acquire.return_value = True
+    service = NominatimService(
+        rate_limiter=limiter,
+        rate_limit_wait=2.0,
+        max_retries=2,
+        retry_backoff=0.3,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mocker.patch.object(
+        service.session,
+        "get",
+        side_effect=[requests.ConnectionError("reset"), mock_response],
+    )
+
+    service.search_places("Bangalore", timeout=1.0)
+
+    # The first slot before the call, one more before the retry
+    assert limiter.acquire.call_count == 2
+    assert limiter.acquire.call_args.args[0] == pytest.approx(0.7)
+
+
+def test_search_places_gives_up_when_no_slot_for_retry(mocker):
+    import requests
+
+    limiter = Mock()
+    limiter.acquire.side_effect = [True, False]
+    breaker = CircuitBreaker(failure_threshold=1)
+    service = NominatimService(
+        rate_limiter=limiter, circuit_breaker=breaker, max_retries=2, sleep=Mock()
+    )
+    mock_get = mocker.patch.object(
+        service.session, "get", side_effect=requests.ConnectionError("reset")
+    )
+
+    with pytest.raises(GeocodingUnavailableError, match="rate limit"):
+        service.search_places("Bangalore")
+
+    assert mock_get.call_count == 1
+    # The failed attempt still counts against Nominatim
+    assert breaker.state == "open"
@@ -3,7 +3,7 @@ from unittest.mock import Mock
 from app.services.partner_profile_service import PartnerProfileService
 from app.models.partner_profile import PartnerProfile
 from app.models.rental_partner import RentalPartner
-from app.utils.errors import NotFoundError
+from app.utils.errors import NotFoundError, ValidationError
 
 
 @pytest.fixture
@@ -156,3 +156,85 @@ def test_update_profile_partner_not_exists(profile_service, mock_partner_reposit
 
     with pytest.raises(NotFoundError):
         profile_service.update_profile("partner-id", {})
+
+
+def profile_data(pincode):
+    return {
+        "businessName": "New Business",
+        "ownerName": "John Doe",
+        "email": "test@example.com",
+        "phone": "1234567890",
+        "address": "123 Test St",
+        "city": "Test City",
+        "state": "Test State",
+        "pincode": pincode,
+        "businessType": "Rental",
+        "yearsInBusiness": "5",
+        "description": "",
+        "categories": [],
+        "serviceAreas": [],
+        "deliveryRadius": "10",
+    }
+
+
+@pytest.fixture
+def validating_service(mock_repository, mock_partner_repository, mock_partner):
+    mock_partner_repository.find_by_id.return_value = mock_partner
+    location_repository = Mock()
+    location_repository.is_valid_pincode.side_effect = lambda code: code == "560001"
+    return PartnerProfileService(
+        mock_repository, mock_partner_repository, location_repository
+    )
+
+
+def test_update_profile_rejects_unknown_pincode(validating_service, mock_repository):
+    mock_repository.get_by_partner_id.return_value = None
+
+    with pytest.raises(ValidationError, match="Unknown pincode"):
+        validating_service.update_profile("partner-id", profile_data("999999"))
+
+    mock_repository.create.assert_not_called()
+
+
+def test_update_profile_accepts_known_pincode(
+    validating_service, mock_repository, mock_profile
+):
+    mock_repository.get_by_partner_id.return_value = None
+    mock_repository.create.return_value = mock_profile
+
+    validating_service.update_profile("partner-id", profile_data("560001"))
+
+    mock_repository.create.assert_called_once()
+
+
+def test_update_profile_keeps_unchanged_pincode(
+    validating_service, mock_repository, mock_profile
+):
+    mock_repository.get_by_partner_id.return_value = mock_profile
+    mock_repository.update.return_value = mock_profile
+
+    validating_service.update_profile("partner-id", profile_data("123456"))
+
+    validating_service.location_repository.is_valid_pincode.assert_not_called()
+    mock_repository.update.assert_called_once()
+
+
+def test_discover_partners(profile_service, mock_repository, mock_profile):
+    mock_profile.partner_id = "partner-id"
+    mock_repository.find_covering_partners.return_value = [(mock_profile, 2.34567)]
+
+    response = profile_service.discover_partners("123456", 5)
+
+    mock_repository.find_covering_partners.assert_called_once_with("123456", 5)
+    assert response.message == "Partners found"
+    assert response.data[0].partnerId == "partner-id"
+    assert response.data[0].distanceKm == 2.346
+
+
+def test_discover_partners_none(profile_service, mock_repository):
+    mock_repository.find_covering_partners.return_value = []
+
+    response = profile_service.discover_partners("123456")
+
+    assert response.message == "No partners found"
+    assert response.data == []
@@ -28,3 +28,20 @@ def test_health_check_route(client):
     assert data["status"] == "healthy"
     assert data["environment"] == "test"
     assert data["database"] == "ceremo_db"
+
+
+def test_health_check_reports_component_stats(client):
+    data = client.get("/health").get_json()
+
+    assert set(data["stats"]) == {
+        "geocoding_rate_limiter",
+        "geocoding_circuit_breaker",
+        "location_cache",
+        "location_writer",
+        "password_hasher",
+        "revocation_cache",
+    }
+    assert data["stats"]["geocoding_rate_limiter"]["rejected"] == 0
+    assert data["stats"]["geocoding_circuit_breaker"]["state"] == "closed"
+    assert data["stats"]["password_hasher"]["pending"] == 0
+    assert isinstance(data["pid"], int)
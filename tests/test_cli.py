@@ -0,0 +1,66 @@
+from unittest.mock import Mock
+from app.utils.location_search_index import IndexedLocation
+from app.utils.pincode_table import PincodeTable
+
+
+def test_load_pincodes_command(app, tmp_path, mocker):
+    source = tmp_path / "pincodes.csv"
+    source.write_text("Pincode\n")
+    mock_engine = mocker.patch("app.cli.db")
+    mock_loader = mocker.patch("app.cli.PincodeLoader")
+    mock_loader.return_value.load.return_value = 42
+
+    result = app.test_cli_runner().invoke(
+        args=["load-pincodes", str(source), "--batch-size", "500"]
+    )
+
+    assert result.exit_code == 0
+    assert "Loaded 42 new locations" in result.output
+    assert mock_loader.call_args.kwargs["batch_size"] == 500
+    mock_engine.engine.raw_connection.return_value.close.assert_called_once()
+
+
+def test_build_pincode_table_command(app, tmp_path, mocker):
+    mocker.patch(
+        "app.cli.LocationRepository.iter_locations",
+        return_value=iter(
+            [
+                IndexedLocation(
+                    "560001", "Bangalore", "Karnataka", "Bangalore", "MG Road"
+                )
+            ]
+        ),
+    )
+    output = tmp_path / "pincodes.bin"
+
+    result = app.test_cli_runner().invoke(args=["build-pincode-table", str(output)])
+
+    assert result.exit_code == 0
+    assert "Wrote 1 pincode records" in result.output
+    assert PincodeTable.open(str(output)).is_valid_pincode("560001")
+
+
+def test_purge_blacklisted_tokens_command(app, mocker):
+    mock_purge = mocker.patch(
+        "app.cli.BlacklistedTokenRepository.purge_expired", return_value=12
+    )
+
+    result = app.test_cli_runner().invoke(
+        args=["purge-blacklisted-tokens", "--batch-size", "500"]
+    )
+
+    assert result.exit_code == 0
+    assert "Purged 12 expired blacklisted tokens" in result.output
+    mock_purge.assert_called_once_with(500)
+
+
+def test_calibrate_bcrypt_command(app, mocker):
+    mock_calibrate = mocker.patch("app.cli.calibrate_rounds", return_value=13)
+
+    result = app.test_cli_runner().invoke(
+        args=["calibrate-bcrypt", "--target-ms", "400"]
+    )
+
+    assert result.exit_code == 0
+    assert "BCRYPT_ROUNDS=13" in result.output
+    mock_calibrate.assert_called_once_with(400)
@@ -16,6 +16,9 @@ def test_config_defaults():
     assert config.GEOCODING_COUNTRY == "India"
     assert config.GEOCODING_COUNTRY_CODE == "in"
     assert config.GEOCODING_RESULT_LIMIT == 10
+    assert config.LOCATION_SEARCH_BACKEND == "sql"
+    assert config.LOCATION_CACHE_SIZE == 10000
+    assert config.LOCATION_FUZZY_ENABLED is True
 
 
 def test_config_database_url():
@@ -0,0 +1,72 @@
+import threading
+from flask import Flask, current_app
+from app.utils.background_loader import BackgroundLoader
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_runs_load_in_app_context():
+    app = Flask(__name__)
+    loader = BackgroundLoader(app, "test index")
+    seen = []
+
+    loader.ensure_running(lambda: seen.append(current_app.name))
+
+    assert loader.wait(5) is True
+    assert seen == [app.name]
+
+
+def test_does_not_run_again_once_done():
+    loader = BackgroundLoader(Flask(__name__), "test index")
+    calls = []
+
+    loader.ensure_running(lambda: calls.append(1))
+    loader.wait(5)
+    loader.ensure_running(lambda: calls.append(1))
+
+    assert calls == [1]
+    assert loader.attempts == 1
+
+
+def test_does_not_start_twice_while_running():
+    loader = BackgroundLoader(Flask(__name__), "test index")
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+
+    loader.ensure_running(load)
+    loader.ensure_running(load)
+    release.set()
+    loader.wait(5)
+
+    assert calls == [1]
+
+
+def test_failed_load_is_retried_after_interval():
+    clock = FakeClock()
+    loader = BackgroundLoader(
+        Flask(__name__), "test index", retry_interval=60.0, clock=clock
+    )
+
+    def fail():
+        raise RuntimeError("database down")
+
+    loader.ensure_running(fail)
+    assert loader.wait(5) is False
+
+    loader.ensure_running(lambda: None)
+    assert loader.attempts == 1
+
+    clock.now += 60
+    loader.ensure_running(lambda: None)
+    assert loader.wait(5) is True
+    assert loader.attempts == 2
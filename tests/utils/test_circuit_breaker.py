@@ -0,0 +1,102 @@
+import pytest
+from app.utils.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        failure_threshold=2, slow_call_seconds=1.0, cooldown=30.0, clock=clock
+    )
+
+
+def test_closed_allows_calls(breaker):
+    assert breaker.allow() is True
+    assert breaker.state == "closed"
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    assert breaker.allow() is True
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+    assert breaker.stats()["rejected"] == 1
+    assert breaker.stats()["opened"] == 1
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_as_failures(breaker):
+    breaker.record_success(1.5)
+    breaker.record_success(2.0)
+
+    assert breaker.state == "open"
+
+
+def test_half_open_allows_a_single_probe(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+
+    assert breaker.allow() is True
+    assert breaker.state == "half_open"
+    assert breaker.allow() is False
+
+
+def test_successful_probe_closes(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+
+    breaker.record_success(0.2)
+
+    assert breaker.state == "closed"
+    assert breaker.allow() is True
+
+
+def test_failed_probe_reopens_for_another_cooldown(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+
+    breaker.record_success(5.0)
+
+    assert breaker.state == "open"
+    clock.now += 29
+    assert breaker.allow() is False
+    clock.now += 1
+    assert breaker.allow() is True
+
+
+def test_released_probe_can_be_retried(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+
+    breaker.release()
+
+    assert breaker.allow() is True
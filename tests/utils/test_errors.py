@@ -7,6 +7,7 @@ from app.utils.errors import (
     ConflictError,
     UnauthorizedError,
     ForbiddenError,
+    ServiceUnavailableError,
     register_error_handlers,
     handle_controller_errors,
 )
@@ -38,6 +39,10 @@ def error_app():
     def forbidden_error():
         raise ForbiddenError()
 
+    @app.route("/unavailable")
+    def unavailable_error():
+        raise ServiceUnavailableError()
+
     @app.route("/server-error")
     def server_error():
         raise Exception("Internal error")
@@ -87,6 +92,14 @@ def test_forbidden_error(error_app):
     assert data["success"] is False
 
 
+def test_service_unavailable_error(error_app):
+    client = error_app.test_client()
+    response = client.get("/unavailable")
+    assert response.status_code == 503
+    data = response.get_json()
+    assert data["error"]["code"] == "ServiceUnavailableError"
+
+
 def test_404_handler(error_app):
     client = error_app.test_client()
     response = client.get("/nonexistent")
@@ -0,0 +1,124 @@
+import threading
+import pytest
+from app.utils.fuzzy_index import FuzzyLocationIndex, edit_distance
+from app.utils.location_search_index import IndexedLocation
+
+
+@pytest.fixture
+def index():
+    fuzzy_index = FuzzyLocationIndex()
+    fuzzy_index.add(
+        [
+            IndexedLocation(
+                "560034", "Bangalore", "Karnataka", "Bangalore Urban", "Koramangala"
+            ),
+            IndexedLocation(
+                "695001",
+                "Thiruvananthapuram",
+                "Kerala",
+                "Thiruvananthapuram",
+                "Palayam",
+            ),
+            IndexedLocation("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort"),
+        ]
+    )
+    return fuzzy_index
+
+
+def test_edit_distance():
+    assert edit_distance("banglore", "bangalore", 2) == 1
+    assert edit_distance("mubmai", "mumbai", 2) == 1
+    assert edit_distance("kolkata", "mumbai", 2) is None
+
+
+def test_search_single_typo(index):
+    results = index.search("Banglore")
+    assert [r.area for r in results] == ["Koramangala"]
+
+
+def test_search_two_typos_in_long_name(index):
+    results = index.search("Thiruvanantpuram")
+    assert [r.pincode for r in results] == ["695001"]
+
+
+def test_search_matches_words_within_names(index):
+    results = index.search("Koramangla")
+    assert [r.pincode for r in results] == ["560034"]
+
+
+def test_search_ranks_by_distance():
+    fuzzy_index = FuzzyLocationIndex()
+    fuzzy_index.add(
+        [
+            IndexedLocation("1", "Patna", "Bihar", "Patna", "Patna City"),
+            IndexedLocation("2", "Panna", "Madhya Pradesh", "Panna", "Panna"),
+        ]
+    )
+    # "pattna" is one edit from "patna" and two from "panna"
+    results = fuzzy_index.search("pattna")
+    assert [r.pincode for r in results] == ["1"]
+
+
+def test_search_short_queries_need_exact_match(index):
+    assert index.search("Frt") == []
+
+
+def test_search_too_far(index):
+    assert index.search("Chennai") == []
+
+
+def test_search_respects_limit(index):
+    index.add(
+        [
+            IndexedLocation(
+                "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+            )
+        ]
+    )
+    assert len(index.search("Banglore", limit=1)) == 1
+
+
+def test_add_skips_duplicates(index):
+    added = index.add(
+        [IndexedLocation("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort")]
+    )
+    assert added == 0
+    assert len(index) == 3
+
+
+def test_add_does_not_wait_for_load():
+    fuzzy_index = FuzzyLocationIndex()
+    fuzzy_index.add(
+        [IndexedLocation("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort")]
+    )
+    scanning = threading.Event()
+    release = threading.Event()
+
+    def scan():
+        yield IndexedLocation(
+            "560034", "Bangalore", "Karnataka", "Bangalore Urban", "Koramangala"
+        )
+        scanning.set()
+        release.wait(timeout=5)
+
+    loader = threading.Thread(target=fuzzy_index.load, args=(scan(),))
+    loader.start()
+    assert scanning.wait(timeout=5)
+
+    adder = threading.Thread(
+        target=fuzzy_index.add,
+        args=([IndexedLocation("695001", "Kochi", "Kerala", "Ernakulam", "Palayam")],),
+    )
+    adder.start()
+    adder.join(timeout=1)
+    assert not adder.is_alive()
+    # Searches keep using the entries held before the load
+    assert [r.area for r in fuzzy_index.search("Mumbai")] == ["Fort"]
+
+    release.set()
+    loader.join(timeout=5)
+
+    assert len(fuzzy_index) == 3
+    assert [r.area for r in fuzzy_index.search("Banglore")] == ["Koramangala"]
+    assert [r.area for r in fuzzy_index.search("Palayam")] == ["Palayam"]
+    assert [r.area for r in fuzzy_index.search("Fort")] == ["Fort"]
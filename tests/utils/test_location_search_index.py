@@ -0,0 +1,171 @@
+import threading
+import pytest
+from app.utils.location_search_index import (
+    IndexedLocation,
+    LocationSearchIndex,
+    normalize_name,
+)
+
+
+@pytest.fixture
+def index():
+    search_index = LocationSearchIndex()
+    search_index.add(
+        [
+            IndexedLocation(
+                "560034", "Bangalore", "Karnataka", "Bangalore Urban", "Koramangala"
+            ),
+            IndexedLocation(
+                "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+            ),
+            IndexedLocation("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort"),
+            IndexedLocation(
+                "560035", "Bangalore", "Karnataka", "Bangalore Urban", "Bellandur"
+            ),
+        ]
+    )
+    return search_index
+
+
+def test_normalize_name():
+    assert normalize_name("  MG   Road ") == "mg road"
+
+
+def test_search_exact_match_first(index):
+    results = index.search("mumbai")
+    assert results[0].area == "Fort"
+
+
+def test_search_prefix(index):
+    results = index.search("Kora")
+    assert [r.area for r in results] == ["Koramangala"]
+
+
+def test_search_word_prefix(index):
+    results = index.search("road")
+    assert [r.area for r in results] == ["MG Road"]
+
+
+def test_search_substring(index):
+    results = index.search("mangal")
+    assert [r.area for r in results] == ["Koramangala"]
+
+
+def test_search_no_match(index):
+    assert index.search("chennai") == []
+    assert index.search("   ") == []
+
+
+def test_search_respects_limit(index):
+    assert len(index.search("bangalore", limit=2)) == 2
+
+
+def test_search_tiers_are_disjoint(index):
+    index.add([IndexedLocation("560095", "Bangalore", "Karnataka", "", "Kora")])
+
+    assert [r.area for r in index.search_tier("exact", "kora")] == ["Kora"]
+    assert [r.area for r in index.search_tier("prefix", "kora")] == ["Koramangala"]
+    assert index.search_tier("substring", "kora") == []
+    assert [r.area for r in index.search_tier("substring", "ram")] == ["Koramangala"]
+
+
+def test_search_tier_offset(index):
+    first = index.search_tier("exact", "bangalore", limit=2)
+    rest = index.search_tier("exact", "bangalore", limit=2, offset=2)
+
+    assert len(first) == 2
+    assert len(rest) == 1
+    assert rest[0] not in first
+
+
+def test_search_tier_unknown(index):
+    with pytest.raises(ValueError, match="Unknown search tier"):
+        index.search_tier("nearest", "kora")
+
+
+def test_find_by_pincode(index):
+    assert [r.area for r in index.find_by_pincode("560001")] == ["MG Road"]
+    assert index.find_by_pincode("999999") == []
+
+
+def test_search_by_pincode_prefix(index):
+    results = index.search_by_pincode_prefix("5600")
+    assert [r.pincode for r in results] == ["560001", "560034", "560035"]
+
+
+def test_add_skips_duplicates(index):
+    added = index.add(
+        [
+            IndexedLocation(
+                "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+            ),
+            IndexedLocation("600001", "Chennai", "Tamil Nadu", "Chennai", "Parrys"),
+        ]
+    )
+    assert added == 1
+    assert len(index) == 5
+    assert [r.area for r in index.search("chennai")] == ["Parrys"]
+
+
+def test_bulk_add_sorts_terms_once():
+    index = LocationSearchIndex()
+    index.add(
+        IndexedLocation(f"{500000 + i}", f"City {i}", "State", "District", f"Area {i}")
+        for i in range(200, 0, -1)
+    )
+
+    assert index._terms == sorted(index._terms)
+    assert index._pincodes == sorted(index._pincodes)
+    assert [r.area for r in index.search_by_pincode_prefix("50000", 3)] == [
+        "Area 1",
+        "Area 2",
+        "Area 3",
+    ]
+
+
+def test_incremental_add_keeps_terms_sorted(index):
+    index.add([IndexedLocation("110001", "Delhi", "Delhi", "New Delhi", "Connaught")])
+
+    assert index._terms == sorted(index._terms)
+    assert [r.area for r in index.search("conn")] == ["Connaught"]
+
+
+def test_add_does_not_wait_for_load():
+    search_index = LocationSearchIndex()
+    search_index.add(
+        [IndexedLocation("400001", "Mumbai", "Maharashtra", "Mumbai", "Fort")]
+    )
+    scanning = threading.Event()
+    release = threading.Event()
+
+    def scan():
+        yield IndexedLocation(
+            "560034", "Bangalore", "Karnataka", "Bangalore Urban", "Koramangala"
+        )
+        scanning.set()
+        release.wait(timeout=5)
+
+    loader = threading.Thread(target=search_index.load, args=(scan(),))
+    loader.start()
+    assert scanning.wait(timeout=5)
+
+    adder = threading.Thread(
+        target=search_index.add,
+        args=(
+            [IndexedLocation("682001", "Kochi", "Kerala", "Ernakulam", "Fort Kochi")],
+        ),
+    )
+    adder.start()
+    adder.join(timeout=1)
+    assert not adder.is_alive()
+    assert [r.area for r in search_index.search("Fort")] == ["Fort"]
+
+    release.set()
+    loader.join(timeout=5)
+
+    assert len(search_index) == 3
+    assert [r.area for r in search_index.search("Koramangala")] == ["Koramangala"]
+    assert [r.area for r in search_index.search("Fort")] == ["Fort", "Fort Kochi"]
+    assert [r.pincode for r in search_index.search_by_pincode_prefix("6820")] == [
+        "682001"
+    ]
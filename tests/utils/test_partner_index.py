@@ -0,0 +1,75 @@
+import pytest
+from app.utils.partner_index import PartnerCoverageIndex, parse_radius_km
+
+KORAMANGALA = (12.9352, 77.6245)
+INDIRANAGAR = (12.9719, 77.6412)
+MUMBAI = (18.9322, 72.8351)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("10", 10.0),
+        ("10 km", 10.0),
+        ("7.5km", 7.5),
+        ("", 0.0),
+        (None, 0.0),
+        ("NA", 0.0),
+    ],
+)
+def test_parse_radius_km(value, expected):
+    assert parse_radius_km(value) == expected
+
+
+def test_match_by_service_area_pincode_and_name():
+    index = PartnerCoverageIndex()
+    index.upsert("p1", "560001", ["560034", "Whitefield"], None, 0)
+    index.upsert("p2", "560002", ["KORAMANGALA "], None, 0)
+    index.upsert("p3", "400001", ["Fort"], None, 0)
+
+    matches = index.match("560034", ["Koramangala"], None)
+
+    assert [partner_id for partner_id, _ in matches] == ["p1", "p2"]
+
+
+def test_match_own_pincode():
+    index = PartnerCoverageIndex()
+    index.upsert("p1", "560034", [], None, 0)
+
+    assert index.match("560034", [], None) == [("p1", None)]
+
+
+def test_match_by_radius_nearest_first():
+    index = PartnerCoverageIndex()
+    index.upsert("near", "560038", [], INDIRANAGAR, 10)
+    index.upsert("short", "560038", [], INDIRANAGAR, 1)
+    index.upsert("far", "400001", [], MUMBAI, 50)
+    index.upsert("here", "560034", [], KORAMANGALA, 5)
+
+    matches = index.match("560034", [], KORAMANGALA)
+
+    # "here" is explicit (own pincode) and listed first
+    assert [partner_id for partner_id, _ in matches] == ["here", "near"]
+    assert matches[0][1] == pytest.approx(0)
+    assert matches[1][1] == pytest.approx(4.4, abs=0.2)
+
+
+def test_upsert_replaces_previous_coverage():
+    index = PartnerCoverageIndex()
+    index.upsert("p1", "560001", ["Koramangala"], INDIRANAGAR, 10)
+
+    index.upsert("p1", "400001", ["Fort"], MUMBAI, 5)
+
+    assert index.match("560034", ["Koramangala"], KORAMANGALA) == []
+    assert [m[0] for m in index.match("400001", ["Fort"], MUMBAI)] == ["p1"]
+    assert len(index) == 1
+
+
+def test_remove_frees_radius_slot():
+    index = PartnerCoverageIndex()
+    index.upsert("p1", "560001", [], INDIRANAGAR, 10)
+    index.remove("p1")
+    index.upsert("p2", "560002", [], INDIRANAGAR, 10)
+
+    assert [m[0] for m in index.match("560034", [], KORAMANGALA)] == ["p2"]
+    assert len(index) == 1
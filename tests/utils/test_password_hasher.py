@@ -0,0 +1,83 @@
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import pytest
+from app.utils.errors import ServiceUnavailableError
+from app.utils.password_hasher import PasswordHasher
+
+
+def test_inline_hash_and_verify():
+    hasher = PasswordHasher(workers=0, rounds=4)
+
+    hashed = hasher.hash("password123")
+
+    assert hasher.verify("password123", hashed) is True
+    assert hasher.verify("wrong_password", hashed) is False
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["max_hash_seconds"] > 0
+    assert stats["pending"] == 0
+
+
+def test_needs_rehash_on_cost_change():
+    old_hash = PasswordHasher(workers=0, rounds=4).hash("password123")
+
+    assert PasswordHasher(workers=0, rounds=4).needs_rehash(old_hash) is False
+    assert PasswordHasher(workers=0, rounds=5).needs_rehash(old_hash) is True
+
+
+def test_needs_rehash_never_lowers_cost():
+    strong_hash = PasswordHasher(workers=0, rounds=5).hash("password123")
+
+    assert PasswordHasher(workers=0, rounds=4).needs_rehash(strong_hash) is False
+    assert PasswordHasher(workers=0, rounds=4).needs_rehash("not-a-hash") is True
+
+
+def test_process_pool_hash_and_verify():
+    hasher = PasswordHasher(workers=1, rounds=4)
+    try:
+        hashed = hasher.hash("password123")
+
+        assert hasher.verify("password123", hashed) is True
+        assert hasher.stats()["total_hash_seconds"] > 0
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_when_pending_limit_reached(mocker):
+    hasher = PasswordHasher(workers=0, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash(password, rounds):
+        started.set()
+        release.wait(5)
+        return "hashed"
+
+    mocker.patch("app.utils.password_hasher.hash_password", slow_hash)
+    worker = threading.Thread(target=hasher.hash, args=("password123",))
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(ServiceUnavailableError):
+            hasher.hash("password123")
+    finally:
+        release.set()
+        worker.join()
+
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.hash("password123") == "hashed"
+
+
+def test_timeout_is_unavailable(mocker):
+    hasher = PasswordHasher(workers=1, timeout=0.01)
+    future = mocker.Mock()
+    future.result.side_effect = FutureTimeoutError()
+    mocker.patch.object(
+        hasher, "_get_executor"
+    ).return_value.submit.return_value = future
+
+    with pytest.raises(ServiceUnavailableError):
+        hasher.verify("password123", "hash")
+
+    future.cancel.assert_called_once()
+    assert hasher.stats()["timed_out"] == 1
+    assert hasher.stats()["pending"] == 0
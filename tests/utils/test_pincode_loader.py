@@ -0,0 +1,181 @@
+import gzip
+import json
+import pytest
+from app.utils.pincode_loader import PincodeLoader, parse_row
+
+HEADER = "CircleName,RegionName,DivisionName,OfficeName,Pincode,OfficeType,Delivery,District,StateName\n"
+
+
+def directory_row(office, pincode, district="Bangalore", state="Karnataka"):
+    return f"Karnataka Circle,Bangalore HQ,Bangalore East,{office},{pincode},SO,Delivery,{district},{state}\n"
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql):
+        self.connection.statements.append(sql)
+        if sql.startswith("INSERT INTO locations"):
+            self.rowcount = sum(len(c) for c in self.connection.copies)
+
+    def fetchone(self):
+        return (self.connection.populated,)
+
+    def fetchall(self):
+        return self.connection.indexes
+
+    def copy_expert(self, sql, buffer):
+        self.connection.copies.append(buffer.read().splitlines())
+
+
+class FakeConnection:
+    def __init__(self, indexes=(), populated=False):
+        self.populated = populated
+        self.statements = []
+        self.copies = []
+        self.commits = 0
+        self.indexes = list(indexes)
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "pincodes.csv"
+    path.write_text(
+        HEADER
+        + directory_row("Koramangala VI Bk S.O", "560095")
+        + directory_row("Invalid", "56AB")
+        + directory_row("MG Road S.O", "560001")
+        + directory_row("Fort H.O", "400001", "Mumbai", "Maharashtra")
+    )
+    return path
+
+
+def test_parse_row_strips_office_suffix():
+    row = {
+        "OfficeName": "Koramangala VI Bk S.O",
+        "Pincode": "560095",
+        "District": "Bangalore",
+        "StateName": "Karnataka",
+    }
+    assert parse_row(row) == (
+        "560095",
+        "Bangalore",
+        "Karnataka",
+        "Bangalore",
+        "Koramangala VI Bk",
+        "",
+        "",
+    )
+
+
+def test_parse_row_coordinates():
+    row = {
+        "OfficeName": "Koramangala VI Bk S.O",
+        "Pincode": "560095",
+        "District": "Bangalore",
+        "StateName": "Karnataka",
+        "Latitude": "12.9352",
+        "Longitude": "77.6245",
+    }
+    assert parse_row(row)[5:] == ("12.9352", "77.6245")
+
+    row["Longitude"] = "NA"
+    assert parse_row(row)[5:] == ("", "")
+
+    row["Longitude"] = "277.6"
+    assert parse_row(row)[5:] == ("", "")
+
+
+def test_parse_row_rejects_invalid_pincode():
+    row = {"OfficeName": "X", "Pincode": "12", "District": "D", "StateName": "S"}
+    assert parse_row(row) is None
+
+
+def test_load_copies_in_batches_and_rebuilds_indexes(source):
+    connection = FakeConnection(
+        indexes=[("idx_locations_city", "CREATE INDEX idx_locations_city ON ...")]
+    )
+    loader = PincodeLoader(connection, batch_size=2)
+
+    inserted = loader.load(str(source))
+
+    assert inserted == 3
+    assert [len(c) for c in connection.copies] == [1, 2]
+    statements = connection.statements
+    drop = statements.index('DROP INDEX IF EXISTS "idx_locations_city"')
+    insert = next(i for i, s in enumerate(statements) if s.startswith("INSERT"))
+    rebuild = statements.index("CREATE INDEX idx_locations_city ON ...")
+    assert drop < insert < rebuild
+    assert "WHERE locations.latitude IS NULL" in statements[insert]
+
+
+def test_refresh_of_populated_table_keeps_indexes(source):
+    connection = FakeConnection(
+        indexes=[("idx_locations_city", "CREATE INDEX idx_locations_city ON ...")],
+        populated=True,
+    )
+
+    PincodeLoader(connection, batch_size=2).load(str(source))
+
+    assert not any("pg_indexes" in s for s in connection.statements)
+    assert not any(s.startswith("DROP INDEX") for s in connection.statements)
+    assert any(s.startswith("INSERT INTO locations") for s in connection.statements)
+
+
+def test_load_resumes_from_checkpoint(source, tmp_path):
+    checkpoint_path = tmp_path / "state" / "checkpoint.json"
+    first = FakeConnection()
+    loader = PincodeLoader(first, batch_size=2, checkpoint_path=str(checkpoint_path))
+    batches = loader._batches(str(source), skip=0)
+    consumed, batch = next(batches)
+    loader._ensure_staging()
+    loader._copy(batch)
+    checkpoint = loader._new_checkpoint(str(source))
+    checkpoint["rows"] = consumed
+    loader._write_checkpoint(checkpoint)
+
+    resumed = FakeConnection()
+    PincodeLoader(resumed, batch_size=2, checkpoint_path=str(checkpoint_path)).load(
+        str(source)
+    )
+
+    assert not any(s.startswith("TRUNCATE") for s in resumed.statements)
+    assert [line.split(",")[0] for line in resumed.copies[0]] == [
+        "560001",
+        "400001",
+    ]
+    assert not checkpoint_path.exists()
+
+
+def test_stale_checkpoint_is_ignored(source, tmp_path):
+    checkpoint_path = tmp_path / "checkpoint.json"
+    checkpoint_path.write_text(json.dumps({"source": "other.csv", "rows": 3}))
+    connection = FakeConnection()
+
+    PincodeLoader(connection, checkpoint_path=str(checkpoint_path)).load(str(source))
+
+    assert any(s.startswith("TRUNCATE") for s in connection.statements)
+    assert sum(len(c) for c in connection.copies) == 3
+
+
+def test_load_gzipped_source(source, tmp_path):
+    gz_path = tmp_path / "pincodes.csv.gz"
+    with gzip.open(gz_path, "wt") as f:
+        f.write(source.read_text())
+    connection = FakeConnection()
+
+    assert PincodeLoader(connection).load(str(gz_path)) == 3
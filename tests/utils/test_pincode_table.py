@@ -0,0 +1,75 @@
+import pytest
+from app.utils.location_search_index import IndexedLocation
+from app.utils.pincode_table import PincodeTable
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    path = str(tmp_path / "pincodes.bin")
+    PincodeTable.build(
+        path,
+        [
+            IndexedLocation(
+                "560034", "Bangalore", "Karnataka", "Bangalore Urban", "Koramangala"
+            ),
+            IndexedLocation(
+                "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+            ),
+            IndexedLocation(
+                "560001", "Bangalore", "Karnataka", "Bangalore Urban", "Shivajinagar"
+            ),
+            IndexedLocation("110001", "New Delhi", "Delhi", "New Delhi", "Connaught"),
+            IndexedLocation("000000", "Nowhere", "Nowhere", "Nowhere", "Placeholder"),
+            IndexedLocation("ABC", "Bad", "Bad", "Bad", "Bad"),
+        ],
+    )
+    return path
+
+
+@pytest.fixture
+def table(table_path):
+    return PincodeTable.open(table_path)
+
+
+def test_build_skips_invalid_pincodes(table):
+    assert len(table) == 5
+
+
+def test_find_by_pincode(table):
+    results = table.find_by_pincode("560001")
+    assert [r.area for r in results] == ["MG Road", "Shivajinagar"]
+    assert results[0] == IndexedLocation(
+        "560001", "Bangalore", "Karnataka", "Bangalore Urban", "MG Road"
+    )
+
+
+def test_find_by_pincode_keeps_leading_zeros(table):
+    assert table.find_by_pincode("000000")[0].pincode == "000000"
+
+
+def test_find_by_pincode_missing(table):
+    assert table.find_by_pincode("999999") == []
+    assert table.find_by_pincode("5600") == []
+
+
+def test_find_by_pincode_limit(table):
+    assert len(table.find_by_pincode("560001", limit=1)) == 1
+
+
+def test_search_by_pincode_prefix(table):
+    results = table.search_by_pincode_prefix("560")
+    assert [r.pincode for r in results] == ["560001", "560001", "560034"]
+    assert table.search_by_pincode_prefix("abc") == []
+
+
+def test_is_valid_pincode(table):
+    assert table.is_valid_pincode("110001") is True
+    assert table.is_valid_pincode("110002") is False
+    assert table.is_valid_pincode("1100") is False
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError, match="Not a pincode table"):
+        PincodeTable.open(str(path))
@@ -0,0 +1,74 @@
+import pytest
+from app.utils.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_limiter(clock, **kwargs):
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_first_call_does_not_wait(clock):
+    limiter = make_limiter(clock, rate=1.0)
+    assert limiter.acquire(timeout=0) is True
+    assert clock.sleeps == []
+
+
+def test_second_call_waits_for_next_slot(clock):
+    limiter = make_limiter(clock, rate=2.0)
+    limiter.acquire(timeout=1)
+    assert limiter.acquire(timeout=1) is True
+    assert clock.sleeps == [pytest.approx(0.5)]
+    assert limiter.stats()["max_wait_seconds"] == pytest.approx(0.5)
+
+
+def test_rejects_when_wait_exceeds_deadline(clock):
+    limiter = make_limiter(clock, rate=1.0)
+    limiter.acquire(timeout=0)
+    assert limiter.acquire(timeout=0.5) is False
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_burst_allows_back_to_back_calls(clock):
+    limiter = make_limiter(clock, rate=1.0, burst=3)
+    assert all(limiter.acquire(timeout=0) for _ in range(3))
+    assert limiter.acquire(timeout=0) is False
+
+
+def test_slots_refill_over_time(clock):
+    limiter = make_limiter(clock, rate=1.0)
+    limiter.acquire(timeout=0)
+    clock.now += 1
+    assert limiter.acquire(timeout=0) is True
+
+
+def test_rejects_when_queue_full(clock):
+    limiter = make_limiter(clock, rate=1.0, max_queue=0)
+    assert limiter.acquire(timeout=10) is False
+    assert limiter.stats()["queue_depth"] == 0
+
+
+def test_state_file_is_shared_between_limiters(clock, tmp_path):
+    path = str(tmp_path / "limits" / "nominatim")
+    first = make_limiter(clock, rate=1.0, state_path=path)
+    second = make_limiter(clock, rate=1.0, state_path=path)
+
+    assert first.acquire(timeout=0) is True
+    assert second.acquire(timeout=0) is False
+    clock.now += 1
+    assert second.acquire(timeout=0) is True
@@ -0,0 +1,74 @@
+import sqlite3
+import pytest
+from app.utils.response_cache import SQLiteResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "responses.sqlite3")
+
+
+@pytest.fixture
+def cache(cache_path, clock):
+    return SQLiteResponseCache(cache_path, ttl=60, max_entries=2, clock=clock)
+
+
+def test_get_missing(cache):
+    assert cache.get("missing") is None
+
+
+def test_set_and_get(cache):
+    cache.set("key", '[{"a": 1}]')
+    assert cache.get("key") == '[{"a": 1}]'
+
+
+def test_entries_expire(cache, clock):
+    cache.set("key", "[]")
+    clock.now += 61
+    assert cache.get("key") is None
+
+
+def test_entry_ttl_override(cache, clock):
+    cache.set("short", "[]", ttl=5)
+    cache.set("long", "[1]")
+    clock.now += 6
+
+    assert cache.get("short") is None
+    assert cache.get("long") == "[1]"
+
+
+def test_evicts_oldest_beyond_max_entries(cache, clock):
+    cache.set("first", "1")
+    clock.now += 1
+    cache.set("second", "2")
+    clock.now += 1
+    cache.set("third", "3")
+
+    assert cache.get("first") is None
+    assert cache.get("second") == "2"
+    assert cache.get("third") == "3"
+
+
+def test_shared_between_instances(cache, cache_path, clock):
+    cache.set("key", "value")
+    other = SQLiteResponseCache(cache_path, ttl=60, max_entries=2, clock=clock)
+    assert other.get("key") == "value"
+
+
+def test_storage_errors_are_misses(cache, mocker):
+    mocker.patch.object(cache, "_connection", side_effect=sqlite3.Error("locked"))
+    cache.set("key", "value")
+    assert cache.get("key") is None
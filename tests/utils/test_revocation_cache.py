@@ -0,0 +1,145 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from app.utils.revocation_cache import SYNC_OVERLAP, BloomFilter, RevocationCache
+from app.utils.security import token_hash
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def repository():
+    repo = Mock()
+    repo.revoked_since.return_value = [(token_hash("revoked-token"), T0)]
+    repo.is_blacklisted.side_effect = lambda token: token == "revoked-token"
+    return repo
+
+
+@pytest.fixture
+def cache(repository, clock):
+    return RevocationCache(
+        repository, refresh_interval=5.0, capacity=100, error_rate=0.01, clock=clock
+    )
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+
+    assert bloom.add(token_hash("a")) is True
+    assert bloom.add(token_hash("a")) is False
+    assert token_hash("a") in bloom
+    assert bloom.count == 1
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(token_hash(f"revoked-{i}"))
+
+    hits = sum(token_hash(f"other-{i}") in bloom for i in range(10000))
+
+    assert hits < 300
+
+
+def test_unrevoked_token_skips_database(cache, repository):
+    assert cache.is_revoked("valid-token") is False
+    assert cache.is_revoked("valid-token") is False
+
+    repository.revoked_since.assert_called_once_with(None)
+    repository.is_blacklisted.assert_not_called()
+
+
+def test_revoked_token_is_confirmed_once(cache, repository):
+    assert cache.is_revoked("revoked-token") is True
+    assert cache.is_revoked("revoked-token") is True
+
+    repository.is_blacklisted.assert_called_once_with("revoked-token")
+    assert cache.stats()["database_checks"] == 1
+
+
+def test_false_positive_is_remembered(repository, clock):
+    cache = RevocationCache(repository, clock=clock)
+    cache.is_revoked("valid-token")
+    cache._filter.add(token_hash("valid-token"))
+
+    assert cache.is_revoked("valid-token") is False
+    assert cache.is_revoked("valid-token") is False
+
+    repository.is_blacklisted.assert_called_once_with("valid-token")
+    assert cache.stats()["false_positives"] == 1
+
+
+def test_polls_for_new_revocations_after_interval(cache, repository, clock):
+    cache.is_revoked("valid-token")
+    repository.revoked_since.return_value = [
+        (token_hash("later-token"), T0 + timedelta(1))
+    ]
+    repository.is_blacklisted.side_effect = lambda token: token == "later-token"
+
+    clock.now += 4
+    assert cache.is_revoked("later-token") is False
+
+    clock.now += 1
+    assert cache.is_revoked("later-token") is True
+    repository.revoked_since.assert_called_with(T0 - SYNC_OVERLAP)
+
+
+def test_poll_overrides_remembered_false_positive(cache, repository, clock):
+    cache.is_revoked("valid-token")
+    cache._filter.add(token_hash("valid-token"))
+    assert cache.is_revoked("valid-token") is False
+
+    repository.revoked_since.return_value = [
+        (token_hash("valid-token"), T0 + timedelta(1))
+    ]
+    clock.now += 5
+
+    assert cache.is_revoked("valid-token") is True
+
+
+def test_add_revokes_immediately(cache, repository):
+    cache.is_revoked("valid-token")
+
+    cache.add("valid-token")
+
+    assert cache.is_revoked("valid-token") is True
+    repository.is_blacklisted.assert_not_called()
+
+
+def test_rebuilds_when_over_capacity(repository, clock):
+    cache = RevocationCache(repository, capacity=2, clock=clock)
+    cache.is_revoked("x")
+    for i in range(3):
+        cache.add(f"local-{i}")
+    repository.revoked_since.return_value = [
+        (token_hash(f"t{i}"), T0) for i in range(3)
+    ]
+
+    clock.now += 5
+    cache.is_revoked("x")
+
+    repository.revoked_since.assert_called_with(None)
+    assert cache.stats()["rebuilds"] == 1
+    assert cache.stats()["entries"] == 3
+    assert cache.stats()["capacity"] == 6
+
+
+def test_confirmed_map_is_bounded(repository, clock):
+    cache = RevocationCache(repository, max_confirmed=2, clock=clock)
+    for i in range(3):
+        cache.add(f"local-{i}")
+
+    assert cache.stats()["confirmed"] == 2
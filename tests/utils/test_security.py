@@ -4,8 +4,11 @@ from datetime import datetime, timedelta
 from app.utils.security import (
     hash_password,
     verify_password,
+    password_rounds,
+    calibrate_rounds,
     generate_token,
     decode_token,
+    token_hash,
 )
 
 
@@ -28,6 +31,38 @@ def test_verify_password_incorrect():
     assert verify_password("wrong_password", hashed) is False
 
 
+def test_hash_password_rounds():
+    hashed = hash_password("test_password", rounds=4)
+    assert hashed.startswith("$2b$04$")
+    assert password_rounds(hashed) == 4
+    assert verify_password("test_password", hashed) is True
+
+
+def test_password_rounds_unreadable():
+    assert password_rounds("not-a-bcrypt-hash") is None
+
+
+def test_calibrate_rounds(mocker):
+    mocker.patch("app.utils.security.hash_password")
+    # 50 ms per hash at cost 10
+    mocker.patch(
+        "app.utils.security.time.perf_counter",
+        side_effect=[0.0, 0.05, 1.0, 1.05, 2.0, 2.05],
+    )
+
+    assert calibrate_rounds(target_ms=250) == 12
+
+
+def test_calibrate_rounds_keeps_minimum(mocker):
+    mocker.patch("app.utils.security.hash_password")
+    mocker.patch(
+        "app.utils.security.time.perf_counter",
+        side_effect=[0.0, 0.5, 1.0, 1.5, 2.0, 2.5],
+    )
+
+    assert calibrate_rounds(target_ms=100, min_rounds=11) == 11
+
+
 def test_generate_token():
     partner_id = "test-partner-id"
     secret = "test-secret-key-at-least-32-chars-long-for-security"
@@ -41,6 +76,22 @@ def test_generate_token():
     assert decoded["partner_id"] == partner_id
     assert "exp" in decoded
     assert "iat" in decoded
+    assert "jti" in decoded
+
+
+def test_generate_token_unique_jti():
+    secret = "test-secret-key-at-least-32-chars-long-for-security"
+
+    first = generate_token("test-partner-id", secret, 24)
+    second = generate_token("test-partner-id", secret, 24)
+
+    assert first != second
+
+
+def test_token_hash():
+    assert token_hash("a.b.c") == token_hash("a.b.c")
+    assert token_hash("a.b.c") != token_hash("a.b.d")
+    assert len(token_hash("a.b.c")) == 32
 
 
 def test_generate_token_expiration():
@@ -0,0 +1,156 @@
+import threading
+import pytest
+from app.utils.single_flight import SingleFlight
+
+
+class CountingEvent(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self.waiters = 0
+        self.changed = threading.Condition()
+
+    def wait(self, timeout=None):
+        with self.changed:
+            self.waiters += 1
+            self.changed.notify_all()
+        return super().wait(timeout)
+
+    def wait_for_waiters(self, count, timeout):
+        with self.changed:
+            return self.changed.wait_for(lambda: self.waiters >= count, timeout)
+
+
+@pytest.fixture(params=[False, True], ids=["threads", "flock"])
+def single_flight(request, tmp_path):
+    return SingleFlight(lock_dir=str(tmp_path / "locks") if request.param else None)
+
+
+def test_do_returns_result(single_flight):
+    assert single_flight.do("key", lambda waited: [1, 2]) == [1, 2]
+
+
+def test_do_propagates_exception(single_flight):
+    def fail(waited):
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        single_flight.do("key", fail)
+
+
+def test_concurrent_callers_share_one_call(single_flight):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_call(waited):
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["result"]
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(single_flight.do("key", slow_call))
+    )
+    leader.start()
+    started.wait(timeout=5)
+    # Release the leader only once every waiter is parked on its call
+    done = CountingEvent()
+    single_flight._calls["key"].done = done
+
+    waiters = [
+        threading.Thread(
+            target=lambda: results.append(single_flight.do("key", slow_call))
+        )
+        for _ in range(5)
+    ]
+    for waiter in waiters:
+        waiter.start()
+    assert done.wait_for_waiters(5, timeout=5)
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == [["result"]] * 6
+
+
+def test_key_is_released_after_call(single_flight):
+    single_flight.do("key", lambda waited: 1)
+    assert single_flight.do("key", lambda waited: 2) == 2
+
+
+def test_uncontended_call_did_not_wait(single_flight):
+    assert single_flight.do("key", lambda waited: waited) is False
+
+
+def test_call_queued_behind_another_process_waited(tmp_path):
+    lock_dir = str(tmp_path / "locks")
+    holder, follower = SingleFlight(lock_dir=lock_dir), SingleFlight(lock_dir=lock_dir)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold(waited):
+        started.set()
+        release.wait(timeout=5)
+        return waited
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(holder.do("key", hold)))
+    thread.start()
+    started.wait(timeout=5)
+    timer = threading.Timer(0.1, release.set)
+    timer.start()
+
+    assert follower.do("key", lambda waited: waited) is True
+    thread.join(timeout=5)
+    assert results == [False]
+
+
+def test_waiting_for_another_process_times_out(tmp_path):
+    lock_dir = str(tmp_path / "locks")
+    holder, follower = SingleFlight(lock_dir=lock_dir), SingleFlight(lock_dir=lock_dir)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold(waited):
+        started.set()
+        release.wait(timeout=5)
+
+    thread = threading.Thread(target=lambda: holder.do("key", hold))
+    thread.start()
+    started.wait(timeout=5)
+    calls = []
+
+    with pytest.raises(TimeoutError):
+        follower.do("key", calls.append, timeout=0.05)
+
+    release.set()
+    thread.join(timeout=5)
+    assert calls == []
+    # The key was released for the next caller
+    assert follower.do("key", lambda waited: waited, timeout=1) is False
+
+
+def test_waiting_for_in_flight_call_times_out(single_flight):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_call(waited):
+        started.set()
+        release.wait(timeout=5)
+        return ["result"]
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(single_flight.do("key", slow_call))
+    )
+    leader.start()
+    started.wait(timeout=5)
+
+    with pytest.raises(TimeoutError):
+        single_flight.do("key", slow_call, timeout=0.05)
+
+    release.set()
+    leader.join(timeout=5)
+    assert results == [["result"]]
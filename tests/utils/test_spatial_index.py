@@ -0,0 +1,117 @@
+import random
+import threading
+import pytest
+from app.utils.location_search_index import IndexedLocation
+from app.utils.spatial_index import (
+    REBUILD_THRESHOLD,
+    SpatialIndex,
+    distance_km,
+)
+
+
+def location(pincode, area="Area"):
+    return IndexedLocation(pincode, "City", "State", "District", area)
+
+
+def test_distance_km():
+    # Bangalore to Mumbai
+    assert distance_km(12.9716, 77.5946, 19.0760, 72.8777) == pytest.approx(845, abs=5)
+    assert distance_km(10.0, 20.0, 10.0, 20.0) == 0
+
+
+def test_nearest_small_index():
+    index = SpatialIndex()
+    index.add(
+        [
+            (location("560001", "MG Road"), 12.9756, 77.6066),
+            (location("400001", "Fort"), 18.9322, 72.8351),
+            (location("560034", "Koramangala"), 12.9352, 77.6245),
+        ]
+    )
+
+    results = index.nearest(12.9352, 77.6245, 2)
+
+    assert [r.location.area for r in results] == ["Koramangala", "MG Road"]
+    assert results[0].distance_km == pytest.approx(0, abs=1e-6)
+    assert results[1].latitude == 12.9756
+
+
+def test_nearest_matches_brute_force_after_rebuild():
+    rng = random.Random(7)
+    rows = [
+        (location(str(i)), rng.uniform(8, 35), rng.uniform(68, 97))
+        for i in range(REBUILD_THRESHOLD * 3)
+    ]
+    index = SpatialIndex()
+    index.add(rows)
+    # A few rows land in the unsorted tail after the build
+    extra = [
+        (location(f"x{i}"), rng.uniform(8, 35), rng.uniform(68, 97)) for i in range(5)
+    ]
+    index.add(extra)
+
+    for _ in range(20):
+        lat, lon = rng.uniform(8, 35), rng.uniform(68, 97)
+        expected = sorted(
+            rows + extra, key=lambda row: distance_km(lat, lon, row[1], row[2])
+        )[:5]
+        results = index.nearest(lat, lon, 5)
+        assert [r.location.pincode for r in results] == [
+            row[0].pincode for row in expected
+        ]
+
+
+def test_nearest_across_antimeridian():
+    index = SpatialIndex()
+    index.add(
+        [
+            (location("east"), 0.0, 179.9),
+            (location("far"), 0.0, 170.0),
+        ]
+    )
+
+    assert index.nearest(0.0, -179.9, 1)[0].location.pincode == "east"
+
+
+def test_add_skips_duplicates():
+    index = SpatialIndex()
+    row = (location("560001"), 12.97, 77.59)
+
+    assert index.add([row]) == 1
+    assert index.add([row]) == 0
+    assert len(index) == 1
+
+
+def test_nearest_empty_index():
+    assert SpatialIndex().nearest(12.97, 77.59, 3) == []
+
+
+def test_add_does_not_wait_for_load():
+    index = SpatialIndex()
+    index.add([(location("400001", "Fort"), 18.9322, 72.8351)])
+    scanning = threading.Event()
+    release = threading.Event()
+
+    def scan():
+        yield (location("560034", "Koramangala"), 12.9352, 77.6245)
+        scanning.set()
+        release.wait(timeout=5)
+
+    loader = threading.Thread(target=index.load, args=(scan(),))
+    loader.start()
+    assert scanning.wait(timeout=5)
+
+    adder = threading.Thread(
+        target=index.add, args=([(location("560001", "MG Road"), 12.9756, 77.6066)],)
+    )
+    adder.start()
+    adder.join(timeout=1)
+    assert not adder.is_alive()
+    assert [r.location.area for r in index.nearest(12.9, 77.6, 1)] == ["Fort"]
+
+    release.set()
+    loader.join(timeout=5)
+
+    assert len(index) == 3
+    results = index.nearest(12.9352, 77.6245, 3)
+    assert [r.location.area for r in results] == ["Koramangala", "MG Road", "Fort"]
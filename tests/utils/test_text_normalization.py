@@ -0,0 +1,66 @@
+import pytest
+from app.utils.text_normalization import normalize_name, normalize_query
+
+
+def test_normalize_name_case_and_whitespace():
+    assert normalize_name("  MG   Road ") == "mg road"
+
+
+def test_normalize_name_strips_latin_accents():
+    assert normalize_name("Bengalūru") == "bengaluru"
+
+
+def test_normalize_name_keeps_indic_vowel_signs():
+    assert normalize_name("बेंगलुरु") == "बेंगलुरु"
+
+
+def test_normalize_name_compatibility_forms():
+    assert normalize_name("５６００３４") == "560034"
+
+
+def test_normalize_name_punctuation():
+    assert normalize_name("St. Thomas Mount") == "st. thomas mount"
+    assert normalize_name("Sector-15 (Noida)!") == "sector-15 noida"
+    assert normalize_name("KORAMANGALA.") == "koramangala"
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "Koramangala",
+        " koramangala ",
+        "KORAMANGALA,",
+        "Koramangala, Bangalore",
+        "Koramangala, Karnataka, India",
+        ", Koramangala",
+    ],
+)
+def test_normalize_query_canonical_form(query):
+    assert normalize_query(query) == "koramangala"
+
+
+def test_normalize_query_multi_word_state():
+    assert normalize_query("Adyar, Tamil Nadu") == "adyar"
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("New Delhi", "new delhi"),
+        ("North Goa", "north goa"),
+        ("Old Goa", "old goa"),
+        ("East Delhi, Delhi", "east delhi"),
+        ("West Bengal", "west bengal"),
+    ],
+)
+def test_normalize_query_keeps_region_names_inside_place_names(query, expected):
+    assert normalize_query(query) == expected
+
+
+def test_normalize_query_keeps_lone_region_name():
+    assert normalize_query("Kerala, India") == "kerala"
+    assert normalize_query("Goa") == "goa"
+
+
+def test_normalize_query_empty():
+    assert normalize_query(" , ") == ""
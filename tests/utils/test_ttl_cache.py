@@ -0,0 +1,66 @@
+import pytest
+from app.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return TTLCache(max_size=2, ttl=60, negative_ttl=10, clock=clock)
+
+
+def test_get_missing_counts_miss(cache):
+    assert cache.get("missing") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_set_and_get_counts_hit(cache):
+    cache.set("bangalore", ["MG Road"])
+    assert cache.get("bangalore") == ["MG Road"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_negative_entry_uses_shorter_ttl(cache, clock):
+    cache.set("junk", [])
+    cache.set("bangalore", ["MG Road"])
+
+    clock.now = 11
+    assert cache.get("junk") is None
+    assert cache.get("bangalore") == ["MG Road"]
+    assert cache.stats()["expirations"] == 1
+
+
+def test_positive_entry_expires(cache, clock):
+    cache.set("bangalore", ["MG Road"])
+    clock.now = 61
+    assert cache.get("bangalore") is None
+
+
+def test_evicts_least_recently_used(cache):
+    cache.set("a", [1])
+    cache.set("b", [2])
+    cache.get("a")
+    cache.set("c", [3])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_clear(cache):
+    cache.set("a", [1])
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
@@ -1,5 +1,6 @@
 import pytest
 import json
+from unittest.mock import Mock
 import jwt
 from flask import Flask, g
 from pydantic import BaseModel
@@ -156,6 +157,22 @@ def test_has_permission_expired_token(auth_app):
     assert response.status_code == 401
 
 
+def test_has_permission_revoked_token(auth_app):
+    revocation_cache = Mock()
+    revocation_cache.is_revoked.return_value = True
+    auth_app.config["REVOCATION_CACHE"] = revocation_cache
+    client = auth_app.test_client()
+    payload = {"partner_id": "test-partner-id", "exp": 9999999999, "iat": 1234567890}
+    token = jwt.encode(
+        payload, "test-secret-key-at-least-32-chars-long", algorithm="HS256"
+    )
+
+    response = client.get("/protected", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+    revocation_cache.is_revoked.assert_called_once_with(token)
+
+
 def test_has_permission_invalid_token(auth_app):
     client = auth_app.test_client()
     response = client.get(